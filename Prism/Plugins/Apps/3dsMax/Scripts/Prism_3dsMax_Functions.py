@@ -247,7 +247,7 @@ class Prism_3dsMax_Functions(object):
 				origin.nodes.append(handle)
 
 		origin.updateUi()
-		origin.stateManager.saveStatesToScene()
+		origin.stateManager.saveStatesToScene(state=origin)
 
 
 	@err_decorator
@@ -1152,6 +1152,7 @@ animationrange = interval tmpanimrange.x tmpanimrange.y
 
 	@err_decorator
 	def sm_saveStates(self, origin, buf):
+		buf = buf.replace("\\", "\\\\").replace("\"", "\\\"")
 		self.executeScript(origin, "fileProperties.addProperty #custom \"PrismStates\" \"%s\"" % buf)
 
 
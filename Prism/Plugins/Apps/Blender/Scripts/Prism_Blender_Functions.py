@@ -289,7 +289,7 @@ class Prism_Blender_Functions(object):
 			self.getGroups()[origin.l_taskName.text()].objects.link(i)
 
 		origin.updateUi()
-		origin.stateManager.saveStatesToScene()
+		origin.stateManager.saveStatesToScene(state=origin)
 
 
 	@err_decorator
@@ -854,7 +854,7 @@ class Prism_Blender_Functions(object):
 
 			origin.l_pathLast.setText(rSettings["outputName"])
 			origin.l_pathLast.setToolTip(rSettings["outputName"])
-			origin.stateManager.saveStatesToScene()
+			origin.stateManager.saveStatesToScene(state=origin)
 
 
 	@err_decorator
@@ -37,6 +37,8 @@ import os, sys
 import traceback, time, platform
 from functools import wraps
 
+import Prism_Houdini_NodeIndex as HoudiniNodeIndex
+
 try:
 	from PySide2.QtCore import *
 	from PySide2.QtGui import *
@@ -52,6 +54,7 @@ class Prism_Houdini_Functions(object):
 	def __init__(self, core, plugin):
 		self.core = core
 		self.plugin = plugin
+		self.nodeIndex = None
 
 
 	def err_decorator(func):
@@ -100,9 +103,78 @@ class Prism_Houdini_Functions(object):
 				qApp = QApplication(sys.argv)
 			origin.messageParent = QWidget()
 
+		if self.hipFileEvent not in hou.hipFile.eventCallbacks():
+			hou.hipFile.addEventCallback(self.hipFileEvent)
+
 		origin.timer.stop()
 
 
+	# the State Manager writes its states delayed, so they are flushed before every save of the scene. Otherwise
+	# saves, which don't go through core.saveScene, would miss the latest changes.
+	@err_decorator
+	def hipFileEvent(self, event_type):
+		if event_type == hou.hipFileEventType.BeforeSave and hasattr(self.core, "sm"):
+			self.core.sm.flushStates()
+
+
+	def getNodeIndex(self):
+		if self.nodeIndex is None:
+			self.nodeIndex = HoudiniNodeIndex.NodeIndex()
+
+		return self.nodeIndex
+
+
+	# returns the node, which was connected to a state and was renamed or moved since the state was saved
+	@err_decorator
+	def findNode(self, path):
+		node = self.getNodeIndex().findByPrismPath(path)
+		if node is not None:
+			self.setPrismPath(node, node.path())
+
+		return node
+
+
+	def setPrismPath(self, node, path):
+		self.getNodeIndex().setPrismPath(node, path)
+
+
+	@err_decorator
+	def getNodesByType(self, typeNames):
+		return self.getNodeIndex().getNodesByType(typeNames)
+
+
+	# writes a scaled copy of an exported geometry cache. The cache is read from disk, so the network of the
+	# export node doesn't need to cook a second time.
+	@err_decorator
+	def convertExportUnit(self, srcPath, dstPath, startFrame, endFrame, scale):
+		convertObj = hou.node("/obj").createNode("geo", "PrismUnitConvert", run_init_scripts=False)
+		try:
+			if srcPath.endswith(".abc"):
+				readNode = convertObj.createNode("alembic")
+				readNode.parm("fileName").set(srcPath)
+			else:
+				readNode = convertObj.createNode("file")
+				readNode.parm("file").set(srcPath)
+
+			xformNode = readNode.createOutputNode("xform")
+			xformNode.parm("scale").set(scale)
+
+			if dstPath.endswith(".abc"):
+				ropNode = xformNode.createOutputNode("rop_alembic")
+				ropNode.parm("filename").set(dstPath)
+				if ropNode.parm("build_from_path") is not None:
+					ropNode.parm("build_from_path").set(True)
+			else:
+				ropNode = xformNode.createOutputNode("rop_geometry")
+				ropNode.parm("sopoutput").set(dstPath)
+
+			ropNode.render(frame_range=(startFrame, endFrame))
+		finally:
+			convertObj.destroy()
+
+		return len(os.listdir(os.path.dirname(dstPath))) > 0
+
+
 	@err_decorator
 	def autosaveEnabled(self, origin):
 		return hou.hscript("autosave")[0] == "autosave on\n"
@@ -616,10 +688,11 @@ class Prism_Houdini_Functions(object):
 			if x[1] in whitelist:
 				continue
 
-			if not os.path.isabs(hou.expandString(x[1])):
+			expPath = hou.expandString(x[1])
+			if not os.path.isabs(expPath):
 				continue
 
-			if os.path.splitext(hou.expandString(x[1]))[1] == "":
+			if os.path.splitext(expPath)[1] == "":
 				continue
 
 			if x[0] is not None and x[0].name() in ["RS_outputFileNamePrefix", "vm_picture"]:
@@ -631,7 +704,7 @@ class Prism_Houdini_Functions(object):
 			if x[0] is not None and x[0].name() in ["filename", "sopoutput"] and x[0].node().type().category().name() == "Driver" and x[0].node().type().name() in ["geometry", "alembic"]:
 				continue
 
-			extFiles.append(hou.expandString(x[1]).replace("\\", "/"))
+			extFiles.append(expPath.replace("\\", "/"))
 			extFilesSource.append(x[0])
 
 		return [extFiles, extFilesSource]
@@ -714,10 +787,7 @@ class Prism_Houdini_Functions(object):
 
 		renderMenu = QMenu("ImageRender")
 
-		renderNodes = []
-		for node in hou.node("/").allSubChildren():
-			if node.type().name() in ["ifd", "Redshift_ROP"]:
-				renderNodes.append(node)
+		renderNodes = self.getNodesByType(["ifd", "Redshift_ROP"])
 
 		for i in origin.states:
 			if i.ui.className == "ImageRender" and i.ui.node is not None and i.ui.node in renderNodes:
@@ -733,13 +803,8 @@ class Prism_Houdini_Functions(object):
 
 		ropMenu = QMenu("Export")
 
-		ropNodes = []
-		for node in hou.node("/").allSubChildren():
-			if node.type().name() in ["rop_dop", "rop_comp", "rop_geometry", "rop_alembic", "filecache", "pixar::usdrop", "Redshift_Proxy_Output"]:
-				ropNodes.append(node)
-
-			if node.type().category().name() == "Driver" and node.type().name() in ["geometry", "alembic"]:
-				ropNodes.append(node)
+		ropNodes = self.getNodesByType(["rop_dop", "rop_comp", "rop_geometry", "rop_alembic", "filecache", "pixar::usdrop", "Redshift_Proxy_Output"])
+		ropNodes += [x for x in self.getNodesByType(["geometry", "alembic"]) if x.type().category().name() == "Driver"]
 
 		for i in origin.states:
 			if i.ui.className == "Export" and i.ui.node is not None:
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import hou
+
+
+# Index of the nodes in the scene, which is built in one traversal and shared by all states. It maps the
+# "PrismPath" userdata and the node type names to the session ids of the nodes. New nodes are added through
+# ChildCreated callbacks on the networks, deleted nodes are dropped, when a session id can't be resolved anymore.
+class NodeIndex(object):
+	def __init__(self):
+		self.prismPaths = None
+		self.typeNodes = None
+		self.indexedNodes = set()
+		self.watchedNetworks = set()
+		hou.hipFile.addEventCallback(self.sceneEvent)
+
+
+	def sceneEvent(self, event_type):
+		if event_type in [hou.hipFileEventType.BeforeClear, hou.hipFileEventType.BeforeLoad]:
+			self.prismPaths = None
+			self.typeNodes = None
+			self.indexedNodes = set()
+			self.watchedNetworks = set()
+		elif event_type == hou.hipFileEventType.AfterMerge:
+			self.prismPaths = None
+			self.typeNodes = None
+			self.indexedNodes = set()
+
+
+	def build(self):
+		if self.prismPaths is not None:
+			return
+
+		self.prismPaths = {}
+		self.typeNodes = {}
+		self.watchNetwork(hou.node("/"))
+		self.addNodes(hou.node("/").allSubChildren())
+
+
+	def addNodes(self, nodes):
+		for node in nodes:
+			sessionId = node.sessionId()
+			if sessionId in self.indexedNodes:
+				continue
+
+			self.indexedNodes.add(sessionId)
+			typeName = node.type().name()
+			if typeName not in self.typeNodes:
+				self.typeNodes[typeName] = []
+
+			self.typeNodes[typeName].append(sessionId)
+
+			prismPath = node.userData("PrismPath")
+			if prismPath is not None:
+				self.addPrismPath(prismPath, sessionId)
+
+			self.watchNetwork(node)
+
+
+	def addPrismPath(self, prismPath, sessionId):
+		if prismPath not in self.prismPaths:
+			self.prismPaths[prismPath] = []
+
+		if sessionId not in self.prismPaths[prismPath]:
+			self.prismPaths[prismPath].append(sessionId)
+
+
+	def watchNetwork(self, node):
+		sessionId = node.sessionId()
+		if sessionId in self.watchedNetworks or not node.isNetwork() or node.isInsideLockedHDA():
+			return
+
+		node.addEventCallback((hou.nodeEventType.ChildCreated,), self.childCreated)
+		self.watchedNetworks.add(sessionId)
+
+
+	def childCreated(self, **kwargs):
+		if self.prismPaths is None:
+			return
+
+		child = kwargs["child_node"]
+		self.addNodes([child] + list(child.allSubChildren()))
+
+
+	def getNodes(self, sessionIds):
+		nodes = []
+		for sessionId in list(sessionIds):
+			node = hou.nodeBySessionId(sessionId)
+			if node is None:
+				sessionIds.remove(sessionId)
+				self.indexedNodes.discard(sessionId)
+			else:
+				nodes.append(node)
+
+		return nodes
+
+
+	# returns the first node, which has the path in its "PrismPath" userdata
+	def findByPrismPath(self, path):
+		self.build()
+		for node in self.getNodes(self.prismPaths.get(path, [])):
+			if node.userData("PrismPath") == path:
+				return node
+
+		return None
+
+
+	# the userdata is only written, when it changed, so that saving the states doesn't modify the scene
+	def setPrismPath(self, node, path):
+		if node.userData("PrismPath") != path:
+			node.setUserData("PrismPath", path)
+
+		if self.prismPaths is not None:
+			self.addPrismPath(path, node.sessionId())
+
+
+	def getNodesByType(self, typeNames):
+		self.build()
+		nodes = []
+		for typeName in typeNames:
+			nodes += self.getNodes(self.typeNodes.get(typeName, []))
+
+		return nodes
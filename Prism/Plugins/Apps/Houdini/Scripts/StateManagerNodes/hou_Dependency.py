@@ -121,27 +121,22 @@ class DependencyClass(object):
 
 	@err_decorator
 	def findNode(self, path):
-		for node in hou.node("/").allSubChildren():
-			if node.userData("PrismPath") is not None and node.userData("PrismPath") == path:
-				node.setUserData("PrismPath", node.path())
-				return node
-
-		return None
+		return self.core.appPlugin.findNode(path)
 
 
 	@err_decorator
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.cb_manager.activated.connect(self.managerChanged)
 		self.b_connect.clicked.connect(self.connectNode)
-		self.sp_offset.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.sp_offset.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 
 
 	@err_decorator
 	def managerChanged(self, text=None):
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -164,7 +159,7 @@ class DependencyClass(object):
 		if len(hou.selectedNodes()) > 0 and (hou.selectedNodes()[0].type().name() == "file"):
 			self.node = hou.selectedNodes()[0]
 			self.updateUi()
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -221,7 +216,7 @@ class DependencyClass(object):
 	def getStateProps(self):
 		try:
 			curNode = self.node.path()
-			self.node.setUserData("PrismPath", curNode)
+			self.core.appPlugin.setPrismPath(self.node, curNode)
 		except:
 			curNode = None
 
@@ -245,12 +245,7 @@ class ExportClass(object):
 
 	@err_decorator
 	def findNode(self, path):
-		for node in hou.node("/").allSubChildren():
-			if node.userData("PrismPath") is not None and node.userData("PrismPath") == path:
-				node.setUserData("PrismPath", node.path())
-				return node
-
-		return None
+		return self.core.appPlugin.findNode(path)
 
 
 	@err_decorator
@@ -345,38 +340,38 @@ class ExportClass(object):
 	@err_decorator
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_changeTask.clicked.connect(self.changeTask)
 		self.chb_globalRange.stateChanged.connect(self.rangeTypeChanged)
 		self.sp_rangeStart.editingFinished.connect(self.startChanged)
 		self.sp_rangeEnd.editingFinished.connect(self.endChanged)
 		self.cb_outType.activated[str].connect(self.typeChanged)
 		self.chb_useTake.stateChanged.connect(self.useTakeChanged)
-		self.cb_take.activated.connect(self.stateManager.saveStatesToScene)
+		self.cb_take.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_goTo.clicked.connect(self.goToNode)
 		self.b_connect.clicked.connect(self.connectNode)
-		self.chb_saveToExistingHDA.stateChanged.connect(self.stateManager.saveStatesToScene)
+		self.chb_saveToExistingHDA.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.chb_saveToExistingHDA.stateChanged.connect(lambda x: self.f_localOutput.setEnabled(not x))
 		self.chb_saveToExistingHDA.stateChanged.connect(lambda x: self.w_projectHDA.setEnabled(not x or not self.w_saveToExistingHDA.isEnabled()))
 		self.chb_projectHDA.stateChanged.connect(lambda x: self.f_localOutput.setEnabled(not x))
-		self.chb_projectHDA.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_blackboxHDA.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_localOutput.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_convertExport.stateChanged.connect(self.stateManager.saveStatesToScene)
+		self.chb_projectHDA.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_blackboxHDA.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_localOutput.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_convertExport.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.gb_submit.toggled.connect(self.rjToggled)
 		self.cb_manager.activated.connect(self.managerChanged)
-		self.sp_rjPrio.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_rjFramesPerTask.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_rjTimeout.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.chb_rjSuspended.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_osDependencies.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_osUpload.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_osPAssets.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.e_osSlaves.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.sp_rjPrio.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_rjFramesPerTask.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_rjTimeout.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_rjSuspended.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_osDependencies.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_osUpload.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_osPAssets.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.e_osSlaves.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_osSlaves.clicked.connect(self.openSlaves)
-		self.cb_dlGroup.activated.connect(self.stateManager.saveStatesToScene)
+		self.cb_dlGroup.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.cb_cam.activated.connect(self.setCam)
-		self.cb_sCamShot.activated.connect(self.stateManager.saveStatesToScene)
+		self.cb_sCamShot.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_openLast.clicked.connect(lambda: self.core.openFolder(os.path.dirname(self.l_pathLast.text())))
 		self.b_copyLast.clicked.connect(lambda: self.core.copyToClipboard(self.l_pathLast.text()))
 
@@ -388,7 +383,7 @@ class ExportClass(object):
 		self.sp_rangeStart.setEnabled(not state)
 		self.sp_rangeEnd.setEnabled(not state)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -423,7 +418,7 @@ class ExportClass(object):
 
 			self.b_changeTask.setStyleSheet("")
 
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -431,7 +426,7 @@ class ExportClass(object):
 		self.curCam = self.camlist[index]
 		self.nameChanged(self.e_name.text())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -451,11 +446,7 @@ class ExportClass(object):
 		if idx != -1:
 			self.cb_take.setCurrentIndex(idx)
 
-		self.camlist = []
-		for node in hou.node("/").allSubChildren():
-
-			if node.type().name() == "cam" and node.name() != "ipr_camera":
-				self.camlist.append(node)
+		self.camlist = [x for x in self.core.appPlugin.getNodesByType(["cam"]) if x.name() != "ipr_camera"]
 
 		self.cb_cam.clear()
 		self.cb_cam.addItems([str(i) for i in self.camlist])
@@ -473,7 +464,7 @@ class ExportClass(object):
 				self.curCam = self.camlist[0]
 			else:
 				self.curCam = None
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 		curShot = self.cb_sCamShot.currentText()
 		self.cb_sCamShot.clear()
@@ -496,7 +487,7 @@ class ExportClass(object):
 			self.cb_sCamShot.setCurrentIndex(shotNames.index(curShot))
 		else:
 			self.cb_sCamShot.setCurrentIndex(0)
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 		if self.cb_outType.currentText() == ".hda":
 			if self.isNodeValid() and (self.node.canCreateDigitalAsset() or self.node.type().definition() is not None):
@@ -645,7 +636,7 @@ class ExportClass(object):
 
 		self.rjToggled()
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -715,7 +706,7 @@ class ExportClass(object):
 
 			self.nameChanged(self.e_name.text())
 			self.updateUi()
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 			return True
 
 		return False			
@@ -726,7 +717,7 @@ class ExportClass(object):
 		if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
 			self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -734,13 +725,13 @@ class ExportClass(object):
 		if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
 			self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def useTakeChanged(self, state):
 		self.cb_take.setEnabled(state)
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -748,7 +739,7 @@ class ExportClass(object):
 		if checked is None:
 			checked = self.gb_submit.isChecked()
 		self.checkLocalOutput()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -756,7 +747,7 @@ class ExportClass(object):
 		self.checkLocalOutput()
 		if self.cb_manager.currentText() in self.core.rfManagers:
 			self.core.rfManagers[self.cb_manager.currentText()].sm_houExport_activated(self)
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -804,7 +795,7 @@ class ExportClass(object):
 					selSlaves = selSlaves[:-2]
 
 			self.e_osSlaves.setText(selSlaves)
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -1022,7 +1013,7 @@ class ExportClass(object):
 
 			self.core.callHook("postExport", args={"prismCore":self.core, "scenefile":fileName, "startFrame":startFrame, "endFrame":endFrame, "outputName":outputName})
 
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 			if os.path.exists(outputName + ".abc") and os.path.exists(outputName + ".fbx"):
 				return [self.state.text(0) + " - success"]
@@ -1095,25 +1086,32 @@ class ExportClass(object):
 			self.core.saveVersionInfo(location=os.path.dirname(outputPath), version=hVersion, origin=fileName, fps=startFrame!=endFrame)
 
 			outputNames = [outputName]
+			convertOutput = None
 			if not self.chb_convertExport.isHidden() and self.chb_convertExport.isChecked():
-				inputCons = self.node.inputConnections()
-				if len(inputCons) > 0 and inputCons[0].inputNode().type().name() == "xform" and inputCons[0].inputNode().name() == "SCALEOVERRIDE":
-					transformNode = inputCons[0].inputNode()
+				cmOutputName = os.path.join(os.path.dirname(os.path.dirname(outputName)), "centimeter", os.path.basename(outputName))
+				if not os.path.exists(os.path.dirname(cmOutputName)):
+					os.makedirs(os.path.dirname(cmOutputName))
+
+				# local geometry exports are cooked once and the centimeter cache is created from the written files
+				if self.cb_outType.currentText() in [".bgeo", ".bgeo.sc", ".abc", ".obj"] and (self.gb_submit.isHidden() or not self.gb_submit.isChecked()):
+					convertOutput = cmOutputName.replace("\\", "/")
 				else:
-					transformNode = self.node.createInputNode(0, "xform", "SCALEOVERRIDE")
-					for i in inputCons:
-						transformNode.setInput(0, i.inputNode(), i.inputIndex())
+					inputCons = self.node.inputConnections()
+					if len(inputCons) > 0 and inputCons[0].inputNode().type().name() == "xform" and inputCons[0].inputNode().name() == "SCALEOVERRIDE":
+						transformNode = inputCons[0].inputNode()
+					else:
+						transformNode = self.node.createInputNode(0, "xform", "SCALEOVERRIDE")
+						for i in inputCons:
+							transformNode.setInput(0, i.inputNode(), i.inputIndex())
 
-				outputNames.append(os.path.join(os.path.dirname(os.path.dirname(outputName)), "centimeter", os.path.basename(outputName)))
-				if not os.path.exists(os.path.dirname(outputNames[1])):
-					os.makedirs(os.path.dirname(outputNames[1]))
+					outputNames.append(cmOutputName)
 
 			self.l_pathLast.setText(outputNames[0])
 			self.l_pathLast.setToolTip(outputNames[0])
 			self.b_openLast.setEnabled(True)
 			self.b_copyLast.setEnabled(True)
 
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 			for idx, outputName in enumerate(outputNames):
 				outputName = outputName.replace("\\", "/")
@@ -1143,103 +1141,112 @@ class ExportClass(object):
 					if not self.core.appPlugin.setNodeParm(self.node, parmName, val=outputName):
 						return [self.state.text(0) + ": error - Publish canceled"]
 
-				hou.hipFile.save()
-
 				if idx == 1:
-					if not self.core.appPlugin.setNodeParm(transformNode, scale, val=100):
+					if not self.core.appPlugin.setNodeParm(transformNode, "scale", val=100):
 						return [self.state.text(0) + ": error - Publish canceled"]
 
-				if not self.gb_submit.isHidden() and self.gb_submit.isChecked():
-					result = self.core.rfManagers[self.cb_manager.currentText()].sm_houExport_submitJob(self, outputName, parent)
-				else:
-					try:
-						result = ""
-						if self.cb_outType.currentText() == ".hda":
-							HDAoutputName = outputName.replace(".$F4", "")
-							bb = self.chb_blackboxHDA.isChecked()
-							noBackup = hou.applicationVersion()[0] <= 16 and hou.applicationVersion()[1] <= 5 and hou.applicationVersion()[2] <= 185
-							if self.node.canCreateDigitalAsset():
-								typeName = "prism_" + self.l_taskName.text()
-								hda = self.node.createDigitalAsset(typeName , hda_file_name=HDAoutputName, description=self.l_taskName.text(), change_node_type=(not bb))
-								if bb:
-									hou.hda.installFile(HDAoutputName, force_use_assets=True)
-									aInst = self.node.parent().createNode(typeName)
-									if noBackup:
-										aInst.type().definition().save(file_name=HDAoutputName, template_node=aInst, compile_contents=bb, black_box=bb)
-									else:
-										aInst.type().definition().save(file_name=HDAoutputName, template_node=aInst, create_backup=False, compile_contents=bb, black_box=bb)
-									aInst.destroy()
-								else:
-									self.connectNode(hda)
-							else:
-								if self.chb_saveToExistingHDA.isChecked():
-									defs = hou.hda.definitionsInFile(HDAoutputName)
-									highestVersion = 0
-									basename = self.node.type().name()
-									basedescr = self.node.type().description()
-									for i in defs:
-										name = i.nodeTypeName()
-										v = name.split("_")[-1]
-										if sys.version[0] == "2":
-											v = unicode(v)
-
-										if v.isnumeric():
-											if int(v) > highestVersion:
-												highestVersion = int(v)
-												basename = name.rsplit("_", 1)[0]
-												basedescr = i.description().rsplit("_", 1)[0]
-
-									aname = basename + "_" + str(highestVersion + 1)
-									adescr = basedescr + "_" + str(highestVersion + 1)
-
-									tmpPath = HDAoutputName + "tmp"
-									if noBackup:
-										self.node.type().definition().save(file_name=tmpPath, template_node=self.node, compile_contents=bb, black_box=bb)
+				# the farm managers copy the scene on submission, so the scene can be saved again with the original scale afterwards
+				try:
+					hou.hipFile.save()
+
+					if not self.gb_submit.isHidden() and self.gb_submit.isChecked():
+						result = self.core.rfManagers[self.cb_manager.currentText()].sm_houExport_submitJob(self, outputName, parent)
+					else:
+						try:
+							result = ""
+							if self.cb_outType.currentText() == ".hda":
+								HDAoutputName = outputName.replace(".$F4", "")
+								bb = self.chb_blackboxHDA.isChecked()
+								noBackup = hou.applicationVersion()[0] <= 16 and hou.applicationVersion()[1] <= 5 and hou.applicationVersion()[2] <= 185
+								if self.node.canCreateDigitalAsset():
+									typeName = "prism_" + self.l_taskName.text()
+									hda = self.node.createDigitalAsset(typeName , hda_file_name=HDAoutputName, description=self.l_taskName.text(), change_node_type=(not bb))
+									if bb:
+										hou.hda.installFile(HDAoutputName, force_use_assets=True)
+										aInst = self.node.parent().createNode(typeName)
+										if noBackup:
+											aInst.type().definition().save(file_name=HDAoutputName, template_node=aInst, compile_contents=bb, black_box=bb)
+										else:
+											aInst.type().definition().save(file_name=HDAoutputName, template_node=aInst, create_backup=False, compile_contents=bb, black_box=bb)
+										aInst.destroy()
 									else:
-										self.node.type().definition().save(file_name=tmpPath, template_node=self.node, create_backup=False, compile_contents=bb, black_box=bb)
-									defs = hou.hda.definitionsInFile(tmpPath)
-									defs[0].copyToHDAFile(HDAoutputName, new_name=aname, new_menu_name=adescr)
-									os.remove(tmpPath)
-									node = self.node.changeNodeType(aname)
-									self.connectNode(node)
+										self.connectNode(hda)
 								else:
-									if noBackup:
-										self.node.type().definition().save(file_name=HDAoutputName, template_node=self.node, compile_contents=bb, black_box=bb)
+									if self.chb_saveToExistingHDA.isChecked():
+										defs = hou.hda.definitionsInFile(HDAoutputName)
+										highestVersion = 0
+										basename = self.node.type().name()
+										basedescr = self.node.type().description()
+										for i in defs:
+											name = i.nodeTypeName()
+											v = name.split("_")[-1]
+											if sys.version[0] == "2":
+												v = unicode(v)
+
+											if v.isnumeric():
+												if int(v) > highestVersion:
+													highestVersion = int(v)
+													basename = name.rsplit("_", 1)[0]
+													basedescr = i.description().rsplit("_", 1)[0]
+
+										aname = basename + "_" + str(highestVersion + 1)
+										adescr = basedescr + "_" + str(highestVersion + 1)
+
+										tmpPath = HDAoutputName + "tmp"
+										if noBackup:
+											self.node.type().definition().save(file_name=tmpPath, template_node=self.node, compile_contents=bb, black_box=bb)
+										else:
+											self.node.type().definition().save(file_name=tmpPath, template_node=self.node, create_backup=False, compile_contents=bb, black_box=bb)
+										defs = hou.hda.definitionsInFile(tmpPath)
+										defs[0].copyToHDAFile(HDAoutputName, new_name=aname, new_menu_name=adescr)
+										os.remove(tmpPath)
+										node = self.node.changeNodeType(aname)
+										self.connectNode(node)
 									else:
-										self.node.type().definition().save(file_name=HDAoutputName, template_node=self.node, create_backup=False, compile_contents=bb, black_box=bb)
+										if noBackup:
+											self.node.type().definition().save(file_name=HDAoutputName, template_node=self.node, compile_contents=bb, black_box=bb)
+										else:
+											self.node.type().definition().save(file_name=HDAoutputName, template_node=self.node, create_backup=False, compile_contents=bb, black_box=bb)
 								
-									if self.chb_projectHDA.isChecked():
-										oplib = os.path.join(os.path.dirname(HDAoutputName), "ProjectHDAs.oplib").replace("\\", "/")
-										hou.hda.installFile(HDAoutputName, oplib, force_use_assets=True)
-									else:
-										hou.hda.installFile(HDAoutputName, force_use_assets=True)
+										if self.chb_projectHDA.isChecked():
+											oplib = os.path.join(os.path.dirname(HDAoutputName), "ProjectHDAs.oplib").replace("\\", "/")
+											hou.hda.installFile(HDAoutputName, oplib, force_use_assets=True)
+										else:
+											hou.hda.installFile(HDAoutputName, force_use_assets=True)
 
-							self.updateUi()
-						else:
-							self.node.parm("execute").pressButton()
-							errs = self.node.errors()
-							if len(errs) > 0:
-								errs = "\n" + "\n\n".join(errs)
-								erStr = ("%s ERROR - houExportnode %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, errs))
-					#			self.core.writeErrorLog(erStr)
-								result = "Execute failed: " + errs
-
-						if result == "":
-							if len(os.listdir(outputPath)) > 0:
-								result = "Result=Success"
+								self.updateUi()
 							else:
-								result = "unknown error (files do not exist)"
+								self.node.parm("execute").pressButton()
+								errs = self.node.errors()
+								if len(errs) > 0:
+									errs = "\n" + "\n\n".join(errs)
+									erStr = ("%s ERROR - houExportnode %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, errs))
+						#			self.core.writeErrorLog(erStr)
+									result = "Execute failed: " + errs
+
+							if result == "":
+								if len(os.listdir(outputPath)) > 0:
+									result = "Result=Success"
+								else:
+									result = "unknown error (files do not exist)"
 
-					except Exception as e:
-						exc_type, exc_obj, exc_tb = sys.exc_info()
-						erStr = ("%s ERROR - houExport %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, traceback.format_exc()))
-						self.core.writeErrorLog(erStr)
+						except Exception as e:
+							exc_type, exc_obj, exc_tb = sys.exc_info()
+							erStr = ("%s ERROR - houExport %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, traceback.format_exc()))
+							self.core.writeErrorLog(erStr)
 
-						return [self.state.text(0) + " - unknown error (view console for more information)"]
+							return [self.state.text(0) + " - unknown error (view console for more information)"]
+				finally:
+					if idx == 1:
+						scaleReset = self.core.appPlugin.setNodeParm(transformNode, "scale", val=1)
+						hou.hipFile.save()
 
-				if idx == 1:
-					if not self.core.appPlugin.setNodeParm(transformNode, scale, val=1):
-						return [self.state.text(0) + ": error - Publish canceled"]
+				if idx == 1 and not scaleReset:
+					return [self.state.text(0) + ": error - Publish canceled"]
+
+			if convertOutput is not None and "Result=Success" in result:
+				if not self.core.appPlugin.convertExportUnit(outputNames[0].replace("\\", "/"), convertOutput, startFrame, endFrame, 100):
+					result = "unit conversion failed (view console for more information)"
 
 			self.core.callHook("postExport", args={"prismCore":self.core, "scenefile":fileName, "startFrame":startFrame, "endFrame":endFrame, "outputName":outputName})
 
@@ -1262,7 +1269,7 @@ class ExportClass(object):
 
 		try:
 			curNode = self.node.path()
-			self.node.setUserData("PrismPath", curNode)
+			self.core.appPlugin.setPrismPath(self.node, curNode)
 		except:
 			curNode = None
 
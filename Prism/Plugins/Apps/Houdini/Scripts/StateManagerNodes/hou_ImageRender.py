@@ -176,7 +176,7 @@ class ImageRenderClass(object):
 				if self.chb_camOverride.isChecked():
 					self.curCam = self.camlist[idx]
 				self.cb_cams.setCurrentIndex(idx)
-				self.stateManager.saveStatesToScene()
+				self.stateManager.saveStatesToScene(state=self)
 		if "resoverride" in data:
 			res = eval(data["resoverride"])
 			self.chb_resOverride.setChecked(res[0])
@@ -244,18 +244,13 @@ class ImageRenderClass(object):
 
 	@err_decorator
 	def findNode(self, path):
-		for node in hou.node("/").allSubChildren():
-			if node.userData("PrismPath") is not None and node.userData("PrismPath") == path:
-				node.setUserData("PrismPath", node.path())
-				return node
-
-		return None
+		return self.core.appPlugin.findNode(path)
 
 
 	@err_decorator
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_changeTask.clicked.connect(self.changeTask)
 		self.chb_globalRange.stateChanged.connect(self.rangeTypeChanged)
 		self.sp_rangeStart.editingFinished.connect(self.startChanged)
@@ -263,28 +258,28 @@ class ImageRenderClass(object):
 		self.chb_camOverride.stateChanged.connect(self.camOverrideChanged)
 		self.cb_cams.activated.connect(self.setCam)
 		self.chb_resOverride.stateChanged.connect(self.resOverrideChanged)
-		self.sp_resWidth.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_resHeight.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.sp_resWidth.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_resHeight.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_resPresets.clicked.connect(self.showResPresets)
 		self.chb_useTake.stateChanged.connect(self.useTakeChanged)
-		self.cb_take.activated.connect(self.stateManager.saveStatesToScene)
-		self.chb_localOutput.stateChanged.connect(self.stateManager.saveStatesToScene)
+		self.cb_take.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_localOutput.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.cb_renderer.currentIndexChanged[str].connect(self.rendererChanged)
 		self.b_goTo.clicked.connect(self.goToNode)
 		self.b_connect.clicked.connect(self.connectNode)
 		self.gb_submit.toggled.connect(self.rjToggled)
 		self.cb_manager.activated.connect(self.managerChanged)
-		self.sp_rjPrio.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_rjFramesPerTask.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_rjTimeout.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.chb_rjSuspended.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_osDependencies.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_osUpload.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_osPAssets.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.e_osSlaves.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.sp_rjPrio.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_rjFramesPerTask.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_rjTimeout.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_rjSuspended.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_osDependencies.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_osUpload.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_osPAssets.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.e_osSlaves.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_osSlaves.clicked.connect(self.openSlaves)
-		self.cb_dlGroup.activated.connect(self.stateManager.saveStatesToScene)
-		self.sp_dlConcurrentTasks.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.cb_dlGroup.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_dlConcurrentTasks.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.sp_dlGPUpt.editingFinished.connect(self.gpuPtChanged)
 		self.le_dlGPUdevices.editingFinished.connect(self.gpuDevicesChanged)
 		self.tw_passes.itemChanged.connect(self.setPassData)
@@ -303,7 +298,7 @@ class ImageRenderClass(object):
 		self.sp_rangeStart.setEnabled(not state)
 		self.sp_rangeEnd.setEnabled(not state)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -311,7 +306,7 @@ class ImageRenderClass(object):
 		if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
 			self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -319,19 +314,19 @@ class ImageRenderClass(object):
 		if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
 			self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def useTakeChanged(self, state):
 		self.cb_take.setEnabled(state)
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def setCam(self, index):
 		self.curCam = self.camlist[index]
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -347,7 +342,7 @@ class ImageRenderClass(object):
 
 		self.nameChanged(self.e_name.text())
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -400,7 +395,7 @@ class ImageRenderClass(object):
 
 			self.b_changeTask.setStyleSheet("")
 
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -408,7 +403,7 @@ class ImageRenderClass(object):
 		self.cb_cams.setEnabled(checked)
 		self.updateCams()
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -417,7 +412,7 @@ class ImageRenderClass(object):
 		self.sp_resHeight.setEnabled(checked)
 		self.b_resPresets.setEnabled(checked)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -430,7 +425,7 @@ class ImageRenderClass(object):
 			pheight = int(i.split("x")[1])
 			pAct.triggered.connect(lambda x=None, v=pwidth: self.sp_resWidth.setValue(v))
 			pAct.triggered.connect(lambda x=None, v=pheight: self.sp_resHeight.setValue(v))
-			pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene())
+			pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene(state=self))
 			pmenu.addAction(pAct)
 
 		pmenu.setStyleSheet(self.stateManager.parent().styleSheet())
@@ -471,13 +466,8 @@ class ImageRenderClass(object):
 	def updateCams(self):
 		if self.chb_camOverride.isChecked():
 			self.cb_cams.clear()
-			self.camlist = []
-
-			for node in hou.node("/").allSubChildren():
+			self.camlist = [x for x in self.core.appPlugin.getNodesByType(["cam", "vrcam"]) if x.type().name() == "vrcam" or x.name() != "ipr_camera"]
 
-				if (node.type().name() == "cam" and node.name() != "ipr_camera") or node.type().name() == "vrcam":
-					self.camlist.append(node)
-		
 			self.cb_cams.addItems([i.name() for i in self.camlist])
 
 			try:
@@ -493,7 +483,7 @@ class ImageRenderClass(object):
 					self.curCam = self.camlist[0]
 				else:
 					self.curCam = None
-				self.stateManager.saveStatesToScene()
+				self.stateManager.saveStatesToScene(state=self)
 		elif self.node is not None:
 			self.curCam = self.curRenderer.getCam(self.node)
 
@@ -532,7 +522,7 @@ class ImageRenderClass(object):
 	@err_decorator
 	def rjToggled(self,checked):
 		self.f_localOutput.setEnabled(self.gb_submit.isHidden() or not checked or (checked and self.core.rfManagers[self.cb_manager.currentText()].canOutputLocal))
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -542,7 +532,7 @@ class ImageRenderClass(object):
 		if self.cb_manager.currentText() in self.core.rfManagers:
 			self.core.rfManagers[self.cb_manager.currentText()].sm_houRender_managerChanged(self)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -579,19 +569,19 @@ class ImageRenderClass(object):
 					selSlaves = selSlaves[:-2]
 
 			self.e_osSlaves.setText(selSlaves)
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def gpuPtChanged(self):
 		self.w_dlGPUdevices.setEnabled(self.sp_dlGPUpt.value() == 0)
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def gpuDevicesChanged(self):
 		self.w_dlGPUpt.setEnabled(self.le_dlGPUdevices.text() == "")
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -823,7 +813,7 @@ class ImageRenderClass(object):
 		self.l_pathLast.setToolTip(outputName)
 		self.b_openLast.setEnabled(True)
 		self.b_copyLast.setEnabled(True)
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 		if self.chb_resOverride.isChecked():				
 			result = self.curRenderer.setResolution(self)
@@ -904,13 +894,13 @@ class ImageRenderClass(object):
 	def getStateProps(self):
 		try:
 			curNode = self.node.path()
-			self.node.setUserData("PrismPath", curNode)
+			self.core.appPlugin.setPrismPath(self.node, curNode)
 		except:
 			curNode = None
 
 		try:
 			curNode2 = self.node2.path()
-			self.node2.setUserData("PrismPath", curNode2)
+			self.core.appPlugin.setPrismPath(self.node2, curNode2)
 		except:
 			curNode2 = None
 
@@ -146,18 +146,13 @@ class ImportFileClass(object):
 
 	@err_decorator
 	def findNode(self, path):
-		for node in hou.node("/").allSubChildren():
-			if node.userData("PrismPath") is not None and node.userData("PrismPath") == path:
-				node.setUserData("PrismPath", node.path())
-				return node
-
-		return None
+		return self.core.appPlugin.findNode(path)
 
 
 	@err_decorator
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.e_file.editingFinished.connect(self.pathChanged)
 		self.b_browse.clicked.connect(self.browse)
 		self.b_browse.customContextMenuRequested.connect(self.openFolder)
@@ -167,7 +162,7 @@ class ImportFileClass(object):
 		self.b_importLatest.clicked.connect(self.importLatest)
 		self.b_nameSpaces.clicked.connect(self.removeNameSpaces)
 		self.b_unitConversion.clicked.connect(self.unitConvert)
-		self.chb_updateOnly.stateChanged.connect(self.stateManager.saveStatesToScene)
+		self.chb_updateOnly.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.chb_autoNameSpaces.stateChanged.connect(self.autoNameSpaceChanged)
 		self.chb_preferUnit.stateChanged.connect(lambda x: self.updatePrefUnits())
 
@@ -188,7 +183,7 @@ class ImportFileClass(object):
 	def pathChanged(self):
 		self.stateManager.saveImports()
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -241,7 +236,7 @@ class ImportFileClass(object):
 		self.b_nameSpaces.setEnabled(not checked)
 		if checked:
 			self.removeNameSpaces()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -351,7 +346,7 @@ class ImportFileClass(object):
 							if self.core.uiAvailable:
 								QMessageBox.warning(self.core.messageParent, "ImportFile", "Import failed")
 							self.updateUi()
-							self.stateManager.saveStatesToScene()
+							self.stateManager.saveStatesToScene(state=self)
 							return
 
 						setGobalFrangeExpr = "tset `(%d-1)/$FPS` `%d/$FPS`" % (tlSettings[1], tlSettings[2])
@@ -464,7 +459,7 @@ class ImportFileClass(object):
 
 		self.stateManager.saveImports()
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 		return True
 
@@ -592,27 +587,13 @@ class ImportFileClass(object):
 				self.l_status.setStyleSheet("QLabel { background-color : rgb(150,0,0); }")
 				self.b_objMerge.setEnabled(False)
 
-		parDir = os.path.dirname(self.e_file.text())
-		if os.path.basename(parDir) in ["centimeter", "meter"]:
-			versionData = os.path.basename(os.path.dirname(parDir)).split(self.core.filenameSeperator)
-			taskPath = os.path.dirname(os.path.dirname(parDir))
-		else:
-			versionData = os.path.basename(parDir).split(self.core.filenameSeperator)
-			taskPath = os.path.dirname(parDir)
-
-		if len(versionData) == 3 and self.core.getConfig('paths', "scenes", configPath=self.core.prismIni) in self.e_file.text():
-			self.l_curVersion.setText(versionData[0] + self.core.filenameSeperator + versionData[1] + self.core.filenameSeperator + versionData[2])
-			self.l_latestVersion.setText("-")
-			for i in os.walk(taskPath):
-				folders = i[1]
-				folders.sort()
-				for k in reversed(folders):
-					meterDir = os.path.join(i[0], k, "meter")
-					cmeterDir = os.path.join(i[0], k, "centimeter")
-					if len(k.split(self.core.filenameSeperator)) == 3 and k[0] == "v" and len(k.split(self.core.filenameSeperator)[0]) == 5 and ((os.path.exists(meterDir) and len(os.listdir(meterDir)) > 0) or (os.path.exists(cmeterDir) and len(os.listdir(cmeterDir)) > 0)):
-						self.l_latestVersion.setText(k)
-						break
-				break
+		versions = self.stateManager.getImportVersion(self.e_file.text())
+		if versions[0] is not None:
+			self.l_curVersion.setText(versions[0])
+			if versions[1] is None:
+				self.l_latestVersion.setText("-")
+			else:
+				self.l_latestVersion.setText(versions[1])
 		else:
 			self.l_curVersion.setText("-")
 			self.l_latestVersion.setText("-")
@@ -632,26 +613,12 @@ class ImportFileClass(object):
 
 	@err_decorator
 	def getLatestVersion(self):
-		parDir = os.path.dirname(self.e_file.text())
-		if os.path.basename(parDir) in ["centimeter", "meter"]:
-			versionData = os.path.basename(os.path.dirname(parDir)).split(self.core.filenameSeperator)
-			taskPath = os.path.dirname(os.path.dirname(parDir))
-		else:
-			versionData = os.path.basename(parDir).split(self.core.filenameSeperator)
-			taskPath = os.path.dirname(parDir)
-
-		if len(versionData) == 3 and self.core.getConfig('paths', "scenes", configPath=self.core.prismIni) in self.e_file.text():
-			self.l_curVersion.setText(versionData[0] + self.core.filenameSeperator + versionData[1] + self.core.filenameSeperator + versionData[2])
+		versions = self.stateManager.getImportVersion(self.e_file.text())
+		if versions[0] is not None:
+			self.l_curVersion.setText(versions[0])
 			self.l_latestVersion.setText("-")
-			for i in os.walk(taskPath):
-				folders = i[1]
-				folders.sort()
-				for k in reversed(folders):
-					meterDir = os.path.join(i[0], k, "meter")
-					cmeterDir = os.path.join(i[0], k, "centimeter")
-					if len(k.split(self.core.filenameSeperator)) == 3 and k[0] == "v" and len(k.split(self.core.filenameSeperator)[0]) == 5 and ((os.path.exists(meterDir) and len(os.listdir(meterDir)) > 0) or (os.path.exists(cmeterDir) and len(os.listdir(cmeterDir)) > 0)):
-						return os.path.join(i[0], k).replace("\\", "/")
-				break
+			if versions[2] is not None:
+				return versions[2]
 
 		return ""
 
@@ -753,13 +720,13 @@ class ImportFileClass(object):
 	def getStateProps(self):
 		try:
 			curNode = self.node.path()
-			self.node.setUserData("PrismPath", curNode)
+			self.core.appPlugin.setPrismPath(self.node, curNode)
 		except:
 			curNode = None
 
 		try:
 			fNode = self.fileNode.path()
-			self.fileNode.setUserData("PrismPath", fNode)
+			self.core.appPlugin.setPrismPath(self.fileNode, fNode)
 		except:
 			fNode = None
 
@@ -42,7 +42,7 @@ except:
 	from PySide.QtGui import *
 	psVersion = 1
 	
-import sys, os, shutil, time, traceback, platform
+import sys, os, shutil, time, traceback, platform, tempfile
 from functools import wraps
 
 try:
@@ -123,7 +123,7 @@ class PlayblastClass(object):
 			if idx > 0:
 				self.curCam = self.camlist[idx-1]
 				self.cb_cams.setCurrentIndex(idx)
-				self.stateManager.saveStatesToScene()
+				self.stateManager.saveStatesToScene(state=self)
 		if "resoverride" in data:
 			res = eval(data["resoverride"])
 			self.chb_resOverride.setChecked(res[0])
@@ -154,18 +154,18 @@ class PlayblastClass(object):
 	@err_decorator
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_changeTask.clicked.connect(self.changeTask)
 		self.chb_globalRange.stateChanged.connect(self.rangeTypeChanged)
 		self.sp_rangeStart.editingFinished.connect(self.startChanged)
 		self.sp_rangeEnd.editingFinished.connect(self.endChanged)
 		self.cb_cams.activated.connect(self.setCam)
 		self.chb_resOverride.stateChanged.connect(self.resOverrideChanged)
-		self.sp_resWidth.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_resHeight.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.sp_resWidth.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_resHeight.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_resPresets.clicked.connect(self.showResPresets)
-		self.chb_localOutput.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.cb_formats.activated.connect(self.stateManager.saveStatesToScene)
+		self.chb_localOutput.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.cb_formats.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_openLast.clicked.connect(lambda: self.core.openFolder(os.path.dirname(self.l_pathLast.text())))
 		self.b_copyLast.clicked.connect(lambda: self.core.copyToClipboard(self.l_pathLast.text()))
 
@@ -176,7 +176,7 @@ class PlayblastClass(object):
 		self.sp_rangeStart.setEnabled(not state)
 		self.sp_rangeEnd.setEnabled(not state)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -184,7 +184,7 @@ class PlayblastClass(object):
 		if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
 			self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -192,7 +192,7 @@ class PlayblastClass(object):
 		if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
 			self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -202,7 +202,7 @@ class PlayblastClass(object):
 		else:
 			self.curCam = self.camlist[index-1]
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -234,7 +234,7 @@ class PlayblastClass(object):
 
 			self.b_changeTask.setStyleSheet("")
 
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -243,7 +243,7 @@ class PlayblastClass(object):
 		self.sp_resHeight.setEnabled(checked)
 		self.b_resPresets.setEnabled(checked)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -261,7 +261,7 @@ class PlayblastClass(object):
 
 				pAct.triggered.connect(lambda x=None, v=pwidth: self.sp_resWidth.setValue(v))
 				pAct.triggered.connect(lambda x=None, v=pheight: self.sp_resHeight.setValue(v))
-				pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene())
+				pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene(state=self))
 			
 			pmenu.addAction(pAct)
 
@@ -287,7 +287,7 @@ class PlayblastClass(object):
 		self.sp_resWidth.setValue(pbCam.parm("resx").eval())
 		self.sp_resHeight.setValue(pbCam.parm("resy").eval())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -295,13 +295,8 @@ class PlayblastClass(object):
 		#update Cams
 		self.cb_cams.clear()
 		self.cb_cams.addItem("Don't override")
-		self.camlist = []
-
-		for node in hou.node("/").allSubChildren():
+		self.camlist = [x for x in self.core.appPlugin.getNodesByType(["cam", "vrcam"]) if x.type().name() == "vrcam" or x.name() != "ipr_camera"]
 
-			if (node.type().name() == "cam" and node.name() != "ipr_camera") or node.type().name() == "vrcam":
-				self.camlist.append(node)
-	
 		self.cb_cams.addItems([i.name() for i in self.camlist])
 
 		if self.curCam in self.camlist:
@@ -309,7 +304,7 @@ class PlayblastClass(object):
 		else:
 			self.cb_cams.setCurrentIndex(0)
 			self.curCam = None
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 		self.nameChanged(self.e_name.text())
 
@@ -460,14 +455,22 @@ class PlayblastClass(object):
 
 		self.core.saveVersionInfo(location=outputPath, version=hVersion, origin=fileName)
 
-		psettings.output(outputName)
+		# mp4 playblasts are rendered to a local scratch folder, so that only the video gets written to the project
+		if self.cb_formats.currentText() == "mp4":
+			scratchPath = tempfile.mkdtemp(prefix="PrismPlayblast_")
+			renderName = os.path.join(scratchPath, os.path.basename(outputName))
+		else:
+			scratchPath = None
+			renderName = outputName
+
+		psettings.output(renderName)
 			
 		self.l_pathLast.setText(outputName)
 		self.l_pathLast.setToolTip(outputName)
 		self.b_openLast.setEnabled(True)
 		self.b_copyLast.setEnabled(True)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 		hou.hipFile.save()
 
@@ -485,37 +488,52 @@ class PlayblastClass(object):
 			if "panel" in locals():
 				panel.close()
 
-			if self.cb_formats.currentText() == "mp4":
-				mediaBaseName = os.path.splitext(outputName)[0][:-3]
-				videoOutput = mediaBaseName + "mp4"
-				inputpath = os.path.splitext(outputName)[0][:-3] + "%04d" + os.path.splitext(outputName)[1]
-				result = self.core.convertMedia(inputpath, jobFrames[0], videoOutput)
+			def finishPlayblast(error):
+				if error is not None:
+					return [self.state.text(0) + " - " + error]
 
-				if not os.path.exists(videoOutput):
-					return [self.state.text(0) + (" - error occurred during conversion of jpg files to mp4\n\n%s" % str(result))]
+				self.core.callHook("postPlayblast", args={"prismCore":self.core, "scenefile":fileName, "startFrame":jobFrames[0], "endFrame":jobFrames[0], "outputName":outputName})
 
-				delFiles = []
-				for i in os.listdir(os.path.dirname(outputName)):
-					if i.startswith(os.path.basename(mediaBaseName)) and i.endswith(".jpg"):
-						delFiles.append(os.path.join(os.path.dirname(outputName), i))
-
-				for i in delFiles:
-					try:
-						os.remove(i)
-					except:
-						pass
-
-			self.core.callHook("postPlayblast", args={"prismCore":self.core, "scenefile":fileName, "startFrame":jobFrames[0], "endFrame":jobFrames[0], "outputName":outputName})
-
-			if len(os.listdir(outputPath)) > 0:
-				return [self.state.text(0) + " - success"]
-			else:
-				return [self.state.text(0) + " - unknown error (files do not exist)"]
+				if len(os.listdir(outputPath)) > 0:
+					return [self.state.text(0) + " - success"]
+				else:
+					return [self.state.text(0) + " - unknown error (files do not exist)"]
+
+			if scratchPath is None:
+				return finishPlayblast(None)
+
+			# the conversion continues in the background while the next states of the publish are executed
+			videoOutput = os.path.splitext(outputName)[0][:-3] + "mp4"
+			inputpath = os.path.splitext(renderName)[0][:-3] + "%04d" + os.path.splitext(renderName)[1]
+			jobId = self.core.convertMedia(inputpath, jobFrames[0], videoOutput, background=True, priority=1, frameCount=jobFrames[1] - jobFrames[0] + 1)
+			if jobId is None:
+				return [self.state.text(0) + " - error occurred during conversion of jpg files to mp4"]
+
+			tmpPath = scratchPath
+
+			def convertPlayblast():
+				try:
+					result = self.core.getTranscodeQueue().wait([jobId])
+					if not os.path.exists(videoOutput):
+						return "error occurred during conversion of jpg files to mp4\n\n%s" % (str(result[0]) if result[0] is not None else "")
+				finally:
+					shutil.rmtree(tmpPath, ignore_errors=True)
+
+			result = self.stateManager.addPublishTask(self, convertPlayblast, onDone=finishPlayblast)
+			# the task removes the scratch folder from now on
+			scratchPath = None
+			if result is not None:
+				return result
+
+			return [self.state.text(0) + " - success"]
 		except Exception as e:
 			exc_type, exc_obj, exc_tb = sys.exc_info()
 			erStr = ("%s ERROR - houPlayblast %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, traceback.format_exc()))
 			self.core.writeErrorLog(erStr)
 			return [self.state.text(0) + " - unknown error (view console for more information)"]
+		finally:
+			if scratchPath is not None:
+				shutil.rmtree(scratchPath, ignore_errors=True)
 
 	
 	@err_decorator
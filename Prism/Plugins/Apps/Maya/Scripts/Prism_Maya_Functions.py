@@ -41,7 +41,7 @@ try:
 except:
 	pass
 
-import os, sys
+import os, sys, base64
 import traceback, time, shutil, platform
 from functools import wraps
 
@@ -368,7 +368,7 @@ class Prism_Maya_Functions(object):
 				cmds.sets(i, include=origin.l_taskName.text())
 
 		origin.updateUi()
-		origin.stateManager.saveStatesToScene()
+		origin.stateManager.saveStatesToScene(state=origin)
 
 
 	@err_decorator
@@ -502,12 +502,12 @@ class Prism_Maya_Functions(object):
 		origin.gb_export.layout().insertWidget(13, origin.w_deleteUnknownNodes)
 		origin.gb_export.layout().insertWidget(14, origin.w_deleteDisplayLayers)
 
-		origin.chb_exportNamespaces.stateChanged.connect(origin.stateManager.saveStatesToScene)
+		origin.chb_exportNamespaces.stateChanged.connect(lambda x=None: origin.stateManager.saveStatesToScene(state=origin))
 		origin.chb_importReferences.stateChanged.connect(lambda x: origin.w_preserveReferences.setEnabled(not x))
-		origin.chb_importReferences.stateChanged.connect(origin.stateManager.saveStatesToScene)
-		origin.chb_deleteUnknownNodes.stateChanged.connect(origin.stateManager.saveStatesToScene)
-		origin.chb_deleteDisplayLayers.stateChanged.connect(origin.stateManager.saveStatesToScene)
-		origin.chb_preserveReferences.stateChanged.connect(origin.stateManager.saveStatesToScene)
+		origin.chb_importReferences.stateChanged.connect(lambda x=None: origin.stateManager.saveStatesToScene(state=origin))
+		origin.chb_deleteUnknownNodes.stateChanged.connect(lambda x=None: origin.stateManager.saveStatesToScene(state=origin))
+		origin.chb_deleteDisplayLayers.stateChanged.connect(lambda x=None: origin.stateManager.saveStatesToScene(state=origin))
+		origin.chb_preserveReferences.stateChanged.connect(lambda x=None: origin.stateManager.saveStatesToScene(state=origin))
 
 
 	@err_decorator
@@ -1778,9 +1778,10 @@ class Prism_Maya_Functions(object):
 			self.core.sceneUnload)
 
 
+	# fileInfo escapes the string, which would break the escapes of the json data. base64 doesn't need to be escaped.
 	@err_decorator
 	def sm_saveStates(self, origin, buf):
-		cmds.fileInfo('PrismStates',  buf)
+		cmds.fileInfo('PrismStates', "base64:" + base64.b64encode(buf.encode("utf-8")).decode("ascii"))
 		cmds.file(modified=True)
 
 
@@ -1794,6 +1795,9 @@ class Prism_Maya_Functions(object):
 	def sm_readStates(self, origin):
 		val = cmds.fileInfo('PrismStates', query=True)
 		if len(val) != 0:
+			if val[0].startswith("base64:"):
+				return base64.b64decode(val[0][len("base64:"):].encode("ascii")).decode("utf-8")
+
 			return eval("\"%s\"" % val[0].replace("\\\\", "\\"))
 
 
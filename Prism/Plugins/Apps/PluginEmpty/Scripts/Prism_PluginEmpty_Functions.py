@@ -244,7 +244,7 @@ class Prism_PluginEmpty_Functions(object):
 				origin.nodes.append(i)
 
 		origin.updateUi()
-		origin.stateManager.saveStatesToScene()
+		origin.stateManager.saveStatesToScene(state=origin)
 
 
 	@err_decorator
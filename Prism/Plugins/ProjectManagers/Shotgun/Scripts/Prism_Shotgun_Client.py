@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+
+import os, json, time, copy, random, threading
+
+
+# Shotgun sessions are shared between the plugin instances and projects. Creating a session requests the server
+# info, so a new session is only created for a site or login, which wasn't used before.
+sessions = {}
+
+
+def getSession(site, **auth):
+	import shotgun_api3
+
+	key = (site, tuple(sorted(auth.items())))
+	if key not in sessions:
+		sessions[key] = shotgun_api3.Shotgun(site, **auth)
+
+	return sessions[key]
+
+
+def removeSession(sg):
+	for key in list(sessions.keys()):
+		if sessions[key] is sg:
+			del sessions[key]
+
+
+# Caches the results of Shotgun queries on disk. Every entity type has its own lifetime in seconds. Entity types,
+# which are not listed in ttls, are not cached.
+class QueryCache(object):
+	cacheVersion = 1
+	defaultTTLs = {"Project": 86400, "HumanUser": 86400, "Step": 86400, "Sequence": 600, "Shot": 300, "Asset": 300}
+
+	def __init__(self, cachePath, ttls=None):
+		self.cachePath = cachePath
+		self.ttls = dict(self.defaultTTLs)
+		if ttls is not None:
+			self.ttls.update(ttls)
+
+		self.entries = None
+		self.lock = threading.Lock()
+
+
+	def load(self):
+		if self.entries is not None:
+			return
+
+		self.entries = {}
+		if not os.path.exists(self.cachePath):
+			return
+
+		try:
+			with open(self.cachePath, "r") as f:
+				data = json.load(f)
+		except (OSError, IOError, ValueError):
+			return
+
+		if data.get("version") == self.cacheVersion:
+			self.entries = data.get("queries", {})
+
+
+	def save(self):
+		with self.lock:
+			data = {"version": self.cacheVersion, "queries": dict(self.entries)}
+
+		tmpPath = self.cachePath + ".tmp%s" % random.randint(0, 1000000)
+		try:
+			if not os.path.exists(os.path.dirname(self.cachePath)):
+				os.makedirs(os.path.dirname(self.cachePath))
+
+			with open(tmpPath, "w") as f:
+				json.dump(data, f, default=str)
+
+			if hasattr(os, "replace"):
+				os.replace(tmpPath, self.cachePath)
+			else:
+				if os.path.exists(self.cachePath):
+					os.remove(self.cachePath)
+				os.rename(tmpPath, self.cachePath)
+		except (OSError, IOError, TypeError, ValueError):
+			if os.path.exists(tmpPath):
+				try:
+					os.remove(tmpPath)
+				except OSError:
+					pass
+
+
+	def getKey(self, site, entityType, filters, fields, limit):
+		return json.dumps([site, entityType, filters, sorted(fields or []), limit], sort_keys=True, default=str)
+
+
+	def get(self, site, entityType, filters, fields=None, limit=0):
+		if entityType not in self.ttls:
+			return None
+
+		self.load()
+		entry = self.entries.get(self.getKey(site, entityType, filters, fields, limit))
+		if entry is None or (time.time() - entry["time"]) > self.ttls[entityType]:
+			return None
+
+		return copy.deepcopy(entry["result"])
+
+
+	def set(self, site, entityType, filters, fields, limit, result):
+		if entityType not in self.ttls:
+			return
+
+		self.load()
+		with self.lock:
+			self.entries[self.getKey(site, entityType, filters, fields, limit)] = {"time": time.time(), "type": entityType, "site": site, "result": copy.deepcopy(result)}
+
+		self.save()
+
+
+	# removes the cached queries of an entity type or all queries of a site. Has to be called after writing to Shotgun.
+	def invalidate(self, site=None, entityType=None):
+		self.load()
+		with self.lock:
+			keys = [x for x in self.entries if (site is None or self.entries[x]["site"] == site) and (entityType is None or self.entries[x]["type"] == entityType)]
+			for key in keys:
+				del self.entries[key]
+
+		if len(keys) > 0:
+			self.save()
+
+
+	# runs sg.find and caches the result. Empty results are not cached, so that new entities are found immediately.
+	def find(self, sg, entityType, filters, fields=None, limit=0, refresh=False):
+		site = sg.base_url
+		if not refresh:
+			result = self.get(site, entityType, filters, fields, limit)
+			if result is not None:
+				return result
+
+		result = sg.find(entityType, filters, fields, limit=limit)
+		if len(result) > 0:
+			self.set(site, entityType, filters, fields, limit, result)
+
+		return result
+
+
+	def findOne(self, sg, entityType, filters, fields=None, refresh=False):
+		result = self.find(sg, entityType, filters, fields, limit=1, refresh=refresh)
+		if len(result) > 0:
+			return result[0]
+		else:
+			return None
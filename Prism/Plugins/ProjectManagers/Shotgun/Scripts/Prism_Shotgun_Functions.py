@@ -57,11 +57,15 @@ else:
 	from ConfigParser import ConfigParser
 	pVersion = 2
 
+import Prism_Shotgun_Client as ShotgunClient
+import Prism_Shotgun_Sync as ShotgunSync
+
 
 class Prism_Shotgun_Functions(object):
 	def __init__(self, core, plugin):
 		self.core = core
 		self.plugin = plugin
+		self.sgCache = ShotgunClient.QueryCache(os.path.join(os.path.dirname(self.core.userini), "ShotgunCache.json"))
 
 
 	def err_decorator(func):
@@ -233,6 +237,10 @@ class Prism_Shotgun_Functions(object):
 			actSg.triggered.connect(self.openSg)
 			sgMenu.addAction(actSg)
 
+			actCache = QAction("Clear Shotgun cache", origin)
+			actCache.triggered.connect(lambda: self.sgCache.invalidate())
+			sgMenu.addAction(actCache)
+
 			sgMenu.addSeparator()
 
 			actSSL = QAction("Shotgun assets to local", origin)
@@ -328,7 +336,6 @@ class Prism_Shotgun_Functions(object):
 	@err_decorator
 	def connectToShotgun(self, user=True):
 		if not hasattr(self, "sg") or not hasattr(self, "sgPrjId") or (user and not hasattr(self, "sgUserId")):
-			import shotgun_api3
 			sgSite = self.core.getConfig('shotgun', "site", configPath=self.core.prismIni)
 			sgProjectName = self.core.getConfig('shotgun', "projectname", configPath=self.core.prismIni)
 			sgScriptName = self.core.getConfig('shotgun', "scriptname", configPath=self.core.prismIni)
@@ -346,22 +353,23 @@ class Prism_Shotgun_Functions(object):
 
 				if useUserAccount == "True" and sgUsername is not None and sgUsername != "" and sgPw is not None and sgPw != "":
 					try:
-						self.sg = shotgun_api3.Shotgun(sgSite, login=sgUsername, password=sgPw)
+						self.sg = ShotgunClient.getSession(sgSite, login=sgUsername, password=sgPw)
 						authentificated = True
 					except:
 						pass
 
 			if not authentificated:
 				try:
-					self.sg = shotgun_api3.Shotgun(sgSite, script_name=sgScriptName, api_key=sgApiKey)
+					self.sg = ShotgunClient.getSession(sgSite, script_name=sgScriptName, api_key=sgApiKey)
 				except Exception as e:
 					QMessageBox.warning(self.core.messageParent,"Shotgun", "Could not connect to Shotgun:\n\n%s" % e)
 					return [None, None, None]
 
 			# get project id
 			try:
-				sgPrj = self.sg.find("Project", [['name', 'is', sgProjectName]])
+				sgPrj = self.sgCache.find(self.sg, "Project", [['name', 'is', sgProjectName]])
 			except Exception as e:
+				ShotgunClient.removeSession(self.sg)
 				QMessageBox.warning(self.core.messageParent,"Shotgun", "Could not request Shotgun data:\n\n%s" % e)
 				return [None, None, None]
 
@@ -387,7 +395,7 @@ class Prism_Shotgun_Functions(object):
 				[filterStr, 'is', userName]
 			]
 
-			sgUser = self.sg.find("HumanUser", filters)
+			sgUser = self.sgCache.find(self.sg, "HumanUser", filters)
 
 			if len(sgUser) == 0:
 			#	QMessageBox.warning(self.core.messageParent, "Shotgun", "No user \"%s\" is assigned to the project." % userName)
@@ -401,6 +409,51 @@ class Prism_Shotgun_Functions(object):
 			return [self.sg, self.sgPrjId, None]
 
 
+	# returns a function, which creates a new Shotgun session with the script credentials of the project.
+	# Used by worker threads, which can't share the session of the plugin.
+	@err_decorator
+	def getSgSessionFactory(self):
+		import shotgun_api3
+		sgSite = self.core.getConfig('shotgun', "site", configPath=self.core.prismIni)
+		sgScriptName = self.core.getConfig('shotgun', "scriptname", configPath=self.core.prismIni)
+		sgApiKey = self.core.getConfig('shotgun', "apikey", configPath=self.core.prismIni)
+
+		return lambda: shotgun_api3.Shotgun(sgSite, script_name=sgScriptName, api_key=sgApiKey)
+
+
+	@err_decorator
+	def getLocalShotRanges(self):
+		shotFile = os.path.join(os.path.dirname(self.core.prismIni), "Shotinfo", "shotInfo.ini")
+		return ShotgunSync.readShotRanges(shotFile)
+
+
+	@err_decorator
+	def getShotPreview(self, shot):
+		shotImgPath = os.path.join(os.path.dirname(self.core.prismIni), "Shotinfo", "%s_preview.jpg" % shot)
+		if os.path.exists(shotImgPath):
+			return shotImgPath
+		else:
+			return ""
+
+
+	def syncShotsToSg(self, sg, sgPrjId, localShots):
+		shotRanges = self.getLocalShotRanges()
+		try:
+			createdShots, updatedShots, failed = ShotgunSync.syncShots(sg, sgPrjId, localShots, shotRanges, self.getShotPreview, self.getSgSessionFactory())
+		finally:
+			self.sgCache.invalidate(sg.base_url, "Sequence")
+			self.sgCache.invalidate(sg.base_url, "Shot")
+
+		if len(failed) > 0:
+			msgString = "The following thumbnails could not be uploaded:\n\n"
+			for i in failed:
+				msgString += "%s: %s\n" % (os.path.basename(i[2]), i[3])
+
+			QMessageBox.warning(self.core.messageParent, "Shotgun Sync", msgString)
+
+		return createdShots, updatedShots
+
+
 	@err_decorator
 	def createSgAssets(self, assets=[]):
 		sg, sgPrjId, sgUserId = self.connectToShotgun(user=False)
@@ -415,31 +468,11 @@ class Prism_Shotgun_Functions(object):
 				QMessageBox.critical(self.core.messageParent, "Create field", "Could not create field \"sg_localhierarchy\":\n\n%s" % e)
 				return
 
-		fields = ['id', 'code', 'tasks']
-		filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
-		sgAssets = {}
-		for x in sg.find("Asset", filters, fields):
-			assetName = x['code']
-			sgAssets[assetName] = x
-
-		fields = ["code", "short_name", "entity_type"]
-		sgSteps = { x['code'] : x for x in sg.find("Step", [], fields) if x['entity_type'] == "Asset"}
-
 		aBasePath = os.path.join(self.core.projectPath, self.core.getConfig('paths', "scenes", configPath=self.core.prismIni), "Assets")
 		assets = [[os.path.basename(x), x.replace(aBasePath, "")[1:]] for x in assets]
-		
-		createdAssets = []
-		updatedAssets = []
-		for asset in assets:
-			if asset[0] not in sgAssets.keys():
-				data = { 'project': {'type': 'Project','id': sgPrjId},
-					'code': asset[0],
-					'sg_status_list': 'ip',
-					'sg_localhierarchy': asset[1]
-					}
 
-				result = sg.create('Asset', data)
-				createdAssets.append(result)
+		ShotgunSync.syncAssets(sg, sgPrjId, assets)
+		self.sgCache.invalidate(sg.base_url, "Asset")
 
 
 	@err_decorator
@@ -449,114 +482,15 @@ class Prism_Shotgun_Functions(object):
 		if sg is None or sgPrjId is None or sgUserId:
 			return
 
-		fields = ['id', 'code', 'tasks', 'image', 'sg_cut_in', 'sg_cut_out', 'sg_sequence']
-		filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
-		sgShots = {}
-		for x in sg.find("Shot", filters, fields):
-			if x['sg_sequence'] is None:
-				shotName = x['code']
-			else:
-				shotName = "%s-%s" % (x['sg_sequence']['name'], x['code'])
-			sgShots[shotName] = x
-
-		fields = ["code", "short_name", "entity_type"]
-		sgSteps = { x['code'] : x for x in sg.find("Step", [], fields) if x['entity_type'] == "Shot"}
-
-		fields = ['id', 'code']
-		filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
-		sgSequences = {x['code']: x for x in sg.find("Sequence", filters, fields)}
-
-		createdShots = []
-		updatedShots = []
+		localShots = []
 		for shot in shots:
 			if "-" in shot:
 				sname = shot.split("-",1)
-				seqName = sname[0]
-				shotName = sname[1]
-			else:
-				seqName = ""
-				shotName = shot
-
-			shotImgPath = os.path.join(os.path.dirname(self.core.prismIni), "Shotinfo", "%s_preview.jpg" % shot)
-			if os.path.exists(shotImgPath):
-				shotImg = shotImgPath
+				localShots.append([shot, sname[0], sname[1]])
 			else:
-				shotImg = ""
+				localShots.append([shot, "", shot])
 
-			shotFile = os.path.join(os.path.dirname(self.core.prismIni), "Shotinfo", "shotInfo.ini")
-
-			startFrame = ""
-			endFrame = ""
-
-			if os.path.exists(shotFile):
-				sconfig = ConfigParser()
-				sconfig.read(shotFile)
-
-				if sconfig.has_option("shotRanges", shot):
-					shotRange = eval(sconfig.get("shotRanges", shot))
-					if type(shotRange) == list and len(shotRange) == 2:
-						startFrame = shotRange[0]
-						endFrame = shotRange[1]
-
-			shotSeq = {'code':""}
-			if seqName != "" and shot not in sgShots.keys():
-				if seqName in sgSequences.keys():
-					shotSeq = sgSequences[seqName]
-				else:
-					data = { 'project': {'type': 'Project','id': sgPrjId},
-						'code': seqName,
-						'sg_status_list': 'ip',
-						}
-
-					shotSeq = sg.create('Sequence', data)
-					sgSequences[shotSeq['code']] = shotSeq
-
-			if shot not in sgShots.keys():
-				data = { 'project': {'type': 'Project','id': sgPrjId},
-					'code': shotName,
-					'sg_status_list': 'ip',
-					'image' : shotImg
-					}
-
-				if shotSeq['code'] != "":
-					data['sg_sequence'] = shotSeq
-
-				try:
-					int(startFrame)
-					data['sg_cut_in'] = int(startFrame)
-				except:
-					pass
-
-				try:
-					int(startFrame)
-					data['sg_cut_out'] = int(endFrame)
-				except:
-					pass
-
-				result = sg.create('Shot', data)
-				result["sg_sequence"] = shotSeq['code']
-				createdShots.append(result)
-			else:
-				data = {
-					'image' : shotImg
-				}
-
-				try:
-					if sgShots[shot]['sg_cut_in'] != int(startFrame):
-						data['sg_cut_in'] = int(startFrame)
-				except:
-					pass
-
-				try:
-					if sgShots[shot]['sg_cut_out'] != int(endFrame):
-						data['sg_cut_out'] = int(endFrame)
-				except:
-					pass
-
-				if len(data.keys()) > 1 or shotImg != "":
-					result = sg.update('Shot', sgShots[shot]['id'], data)
-					if [seqName, shotName] not in [[x['code'],x['sg_sequence']] for x in createdShots] and shot not in updatedShots and (len(data.keys()) > 1 or sgShots[shot]['image'] is None):
-						updatedShots.append(shot)
+		self.syncShotsToSg(sg, sgPrjId, localShots)
 
 
 	@err_decorator
@@ -635,7 +569,7 @@ class Prism_Shotgun_Functions(object):
 					['code', 'is', seqName]
 				]
 
-				seq = sg.find_one("Sequence", seqFilters)
+				seq = self.sgCache.findOne(sg, "Sequence", seqFilters)
 				if seq is not None:
 					filters = [ 
 						['project','is', {'type': 'Project','id': sgPrjId}],
@@ -643,7 +577,7 @@ class Prism_Shotgun_Functions(object):
 						['sg_sequence', 'is', seq]
 					]
 
-			shot = sg.find_one(eType, filters)
+			shot = self.sgCache.findOne(sg, eType, filters)
 			if shot is None:
 				QMessageBox.warning(self.core.messageParent,"Shotgun", "Could not find %s %s in Shotgun" % (eType, shotName))
 				return
@@ -669,7 +603,7 @@ class Prism_Shotgun_Functions(object):
 		if hasLocalField:
 			fields.append("sg_localhierarchy")
 		filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
-		sgAssets = sg.find("Asset", filters, fields)
+		sgAssets = self.sgCache.find(sg, "Asset", filters, fields, refresh=True)
 
 		createdAssets = []
 		for i in sgAssets:
@@ -718,38 +652,15 @@ class Prism_Shotgun_Functions(object):
 				QMessageBox.critical(self.core.messageParent, "Create field", "Could not create field \"sg_localhierarchy\":\n\n%s" % e)
 				return
 
-		fields = ['id', 'code', 'tasks']
-		filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
-		sgAssets = {}
-		for x in sg.find("Asset", filters, fields):
-			assetName = x['code']
-			sgAssets[assetName] = x
-
-		fields = ["code", "short_name", "entity_type"]
-		sgSteps = { x['code'] : x for x in sg.find("Step", [], fields) if x['entity_type'] == "Asset"}
-
 		assets = self.core.getAssetPaths()
 		localAssets = [[os.path.basename(x), x.replace(origin.aBasePath, "")[1:]] for x in assets if x.replace(os.path.join(self.core.fixPath(origin.aBasePath), ""), "") not in origin.omittedEntities["Asset"]]
 		
-		createdAssets = []
+		createdAssetNames = ShotgunSync.syncAssets(sg, sgPrjId, localAssets)
+		self.sgCache.invalidate(sg.base_url, "Asset")
 		updatedAssets = []
-		for asset in localAssets:
-			if asset[0] not in sgAssets.keys():
-				data = { 'project': {'type': 'Project','id': sgPrjId},
-					'code': asset[0],
-					'sg_status_list': 'ip',
-					'sg_localhierarchy': asset[1]
-					}
-
-				result = sg.create('Asset', data)
-				createdAssets.append(result)
-
-		if len(createdAssets) > 0 or len(updatedAssets) > 0:
-			msgString = ""
 
-			createdAssetNames = []
-			for i in createdAssets:
-				createdAssetNames.append(i['code'])
+		if len(createdAssetNames) > 0 or len(updatedAssets) > 0:
+			msgString = ""
 
 			createdAssetNames.sort()
 			updatedAssets.sort()
@@ -784,7 +695,7 @@ class Prism_Shotgun_Functions(object):
 		fields = ['id', 'code', 'image', 'sg_cut_in', 'sg_cut_out', 'tasks', 'sg_sequence']
 		filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
 		sgShots = {}
-		for x in sg.find("Shot", filters, fields):
+		for x in self.sgCache.find(sg, "Shot", filters, fields, refresh=True):
 			if self.core.filenameSeperator not in x['code']:
 				if x['sg_sequence'] is None:
 					shotName = x['code']
@@ -792,9 +703,6 @@ class Prism_Shotgun_Functions(object):
 					shotName = "%s-%s" % (x['sg_sequence']['name'], x['code'])
 				sgShots[shotName] = x
 
-		fields = ["code", "short_name", 'entity_type']
-		sgSteps = { x['code'] : x['short_name'] for x in sg.find("Step", [], fields) if x['entity_type'] is not None }
-
 		createdShots = []
 		updatedShots = []
 		for shotName, shotData in sgShots.items():
@@ -926,23 +834,6 @@ class Prism_Shotgun_Functions(object):
 		if sg is None or sgPrjId is None or sgUserId:
 			return
 
-		fields = ['id', 'code', 'tasks', 'image', 'sg_cut_in', 'sg_cut_out', 'sg_sequence']
-		filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
-		sgShots = {}
-		for x in sg.find("Shot", filters, fields):
-			if x['sg_sequence'] is None:
-				shotName = x['code']
-			else:
-				shotName = "%s-%s" % (x['sg_sequence']['name'], x['code'])
-			sgShots[shotName] = x
-
-		fields = ["code", "short_name", "entity_type"]
-		sgSteps = { x['code'] : x for x in sg.find("Step", [], fields) if x['entity_type'] == "Shot"}
-
-		fields = ['id', 'code']
-		filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
-		sgSequences = {x['code']: x for x in sg.find("Sequence", filters, fields)}
-
 		for i in os.walk(origin.sBasePath):
 			foldercont = i
 			break
@@ -961,111 +852,11 @@ class Prism_Shotgun_Functions(object):
 					shotName = x
 				localShots.append([x, seqName, shotName])
 
-		createdShots = []
-		updatedShots = []
-		for shot in localShots:
-			shotImgPath = os.path.join(os.path.dirname(self.core.prismIni), "Shotinfo", "%s_preview.jpg" % shot[0])
-			if os.path.exists(shotImgPath):
-				shotImg = shotImgPath
-			else:
-				shotImg = ""
-
-			shotFile = os.path.join(os.path.dirname(self.core.prismIni), "Shotinfo", "shotInfo.ini")
-
-			startFrame = ""
-			endFrame = ""
-
-			if os.path.exists(shotFile):
-				sconfig = ConfigParser()
-				sconfig.read(shotFile)
-
-				if sconfig.has_option("shotRanges", shot[0]):
-					shotRange = eval(sconfig.get("shotRanges", shot[0]))
-					if type(shotRange) == list and len(shotRange) == 2:
-						startFrame = shotRange[0]
-						endFrame = shotRange[1]
-
-			shotSeq = {'code':""}
-			if shot[1] != "" and shot[0] not in sgShots.keys():
-				if shot[1] in sgSequences.keys():
-					shotSeq = sgSequences[shot[1]]
-				else:
-					data = { 'project': {'type': 'Project','id': sgPrjId},
-						'code': shot[1],
-						'sg_status_list': 'ip',
-						}
-
-					shotSeq = sg.create('Sequence', data)
-					sgSequences[shotSeq['code']] = shotSeq
-
-			if shot[0] not in sgShots.keys():
-				data = { 'project': {'type': 'Project','id': sgPrjId},
-					'code': shot[2],
-					'sg_status_list': 'ip',
-					'image' : shotImg
-					}
+		createdShotNames, updatedShots = self.syncShotsToSg(sg, sgPrjId, localShots)
 
-				if shotSeq['code'] != "":
-					data['sg_sequence'] = shotSeq
-
-				try:
-					int(startFrame)
-					data['sg_cut_in'] = int(startFrame)
-				except:
-					pass
-
-				try:
-					int(startFrame)
-					data['sg_cut_out'] = int(endFrame)
-				except:
-					pass
-
-				result = sg.create('Shot', data)
-				result["sg_sequence"] = shotSeq['code']
-				createdShots.append(result)
-			else:
-				data = {
-					'image' : shotImg
-				}
-
-				try:
-					if sgShots[shot[0]]['sg_cut_in'] != int(startFrame):
-						data['sg_cut_in'] = int(startFrame)
-				except:
-					pass
-
-				try:
-					if sgShots[shot[0]]['sg_cut_out'] != int(endFrame):
-						data['sg_cut_out'] = int(endFrame)
-				except:
-					pass
-
-				if len(data.keys()) > 1 or shotImg != "":
-					result = sg.update('Shot', sgShots[shot[0]]['id'], data)
-					if [shot[1], shot[2]] not in [[x['code'],x['sg_sequence']] for x in createdShots] and shot[0] not in updatedShots and (len(data.keys()) > 1 or sgShots[shot[0]]['image'] is None):
-						updatedShots.append(shot[0])
-
-			shotSteps = []
-			for k in os.walk(os.path.join(origin.sBasePath, shot[0], "Scenefiles")):
-				shotSteps = k[1]
-				break
-
-			shotTasks = {}
-			for k in shotSteps:
-				for m in os.walk(os.path.join(origin.sBasePath, shot[0], "Scenefiles", k)):
-					shotTasks[k] = m[1]
-					break
-
-		if len(createdShots) > 0 or len(updatedShots) > 0:
+		if len(createdShotNames) > 0 or len(updatedShots) > 0:
 			msgString = ""
 
-			createdShotNames = []
-			for i in createdShots:
-				if i["sg_sequence"] == "":
-					createdShotNames.append(i['code'])
-				else:
-					createdShotNames.append("%s-%s" % (i['sg_sequence'], i['code']))
-
 			createdShotNames.sort()
 			updatedShots.sort()
 
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+
+import os, sys, time, threading
+
+if sys.version[0] == "3":
+	from configparser import ConfigParser
+	from queue import Queue, Empty
+else:
+	from ConfigParser import ConfigParser
+	from Queue import Queue, Empty
+
+try:
+	from shotgun_api3 import Fault
+except ImportError:
+	Fault = ()
+
+
+batchSize = 100
+
+
+# returns the frameranges of all shots from the shotInfo.ini. The keys are lower case like the ConfigParser options.
+def readShotRanges(shotFile):
+	shotRanges = {}
+	if not os.path.exists(shotFile):
+		return shotRanges
+
+	sconfig = ConfigParser()
+	sconfig.read(shotFile)
+
+	if not sconfig.has_section("shotRanges"):
+		return shotRanges
+
+	for shotName, value in sconfig.items("shotRanges"):
+		try:
+			shotRange = eval(value)
+		except:
+			continue
+
+		if type(shotRange) == list and len(shotRange) == 2:
+			shotRanges[shotName] = shotRange
+
+	return shotRanges
+
+
+# sends the requests in chunks through sg.batch. A batch is executed as one transaction in Shotgun, so a failed
+# chunk can be sent again. The connection can fail after Shotgun committed the batch though, so the entities of
+# the create requests are queried before a retry and only the missing ones are created again. Errors returned by the
+# server (Fault) are not retried.
+def batchRequests(sg, requests, chunkSize=batchSize, retries=3, retryDelay=2):
+	results = []
+	for idx in range(0, len(requests), chunkSize):
+		chunk = requests[idx:idx+chunkSize]
+		chunkResults = [None] * len(chunk)
+		attempt = 0
+		while True:
+			try:
+				if attempt > 0:
+					pending = [x for x in range(len(chunk)) if chunkResults[x] is None]
+					for x, entity in findCreatedEntities(sg, chunk, pending).items():
+						chunkResults[x] = entity
+
+				pending = [x for x in range(len(chunk)) if chunkResults[x] is None]
+				if len(pending) > 0:
+					for x, result in zip(pending, sg.batch([chunk[x] for x in pending])):
+						chunkResults[x] = result
+				break
+			except Fault:
+				raise
+			except Exception:
+				attempt += 1
+				if attempt > retries:
+					raise
+
+				time.sleep(retryDelay * attempt)
+
+		results += chunkResults
+
+	return results
+
+
+# returns the existing entities of the create requests at the given indices as a dict of index: entity.
+# Shots are matched by their code and sequence, the other entities by their code.
+def findCreatedEntities(sg, requests, indices):
+	found = {}
+	creates = [x for x in indices if requests[x]["request_type"] == "create"]
+	for entityType in set([requests[x]["entity_type"] for x in creates]):
+		typeCreates = [x for x in creates if requests[x]["entity_type"] == entityType]
+		fields = ['id', 'code']
+		if entityType == "Shot":
+			fields.append('sg_sequence')
+
+		filters = [ ['project', 'is', requests[typeCreates[0]]["data"]["project"]], ['code', 'in', [requests[x]["data"]["code"] for x in typeCreates]]]
+		entities = {}
+		for entity in sg.find(entityType, filters, fields):
+			seq = entity.get('sg_sequence')
+			entities[(entity['code'], seq['id'] if seq else None)] = entity
+
+		for x in typeCreates:
+			data = requests[x]["data"]
+			seq = data.get('sg_sequence') if entityType == "Shot" else None
+			key = (data['code'], seq['id'] if seq else None)
+			if key in entities:
+				found[x] = entities[key]
+
+	return found
+
+
+def createRequest(entityType, data):
+	return {"request_type": "create", "entity_type": entityType, "data": data}
+
+
+def updateRequest(entityType, entityId, data):
+	return {"request_type": "update", "entity_type": entityType, "entity_id": entityId, "data": data}
+
+
+# uploads the thumbnails in parallel. Each worker uses its own session from sessionFactory, because a Shotgun
+# connection can't be shared between threads. Returns the uploads, which failed.
+def uploadThumbnails(uploads, sessionFactory, workers=4):
+	jobs = Queue()
+	for upload in uploads:
+		jobs.put(upload)
+
+	failed = []
+	lock = threading.Lock()
+
+	def work():
+		sg = None
+		while True:
+			try:
+				entityType, entityId, imgPath = jobs.get_nowait()
+			except Empty:
+				return
+
+			try:
+				if sg is None:
+					sg = sessionFactory()
+
+				sg.upload_thumbnail(entityType, entityId, imgPath)
+			except Exception as e:
+				with lock:
+					failed.append([entityType, entityId, imgPath, str(e)])
+
+	threads = [threading.Thread(target=work) for x in range(min(workers, len(uploads)))]
+	for thread in threads:
+		thread.daemon = True
+		thread.start()
+
+	for thread in threads:
+		thread.join()
+
+	return failed
+
+
+# creates the missing assets in Shotgun. localAssets is a list of [assetName, localHierarchy].
+# Returns the names of the created assets.
+def syncAssets(sg, sgPrjId, localAssets):
+	fields = ['id', 'code']
+	filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
+	sgAssets = set([x['code'] for x in sg.find("Asset", filters, fields)])
+
+	requests = []
+	for assetName, assetHierarchy in localAssets:
+		if assetName in sgAssets:
+			continue
+
+		sgAssets.add(assetName)
+		data = { 'project': {'type': 'Project','id': sgPrjId},
+			'code': assetName,
+			'sg_status_list': 'ip',
+			'sg_localhierarchy': assetHierarchy
+			}
+		requests.append(createRequest("Asset", data))
+
+	results = batchRequests(sg, requests)
+	return [x['code'] for x in results]
+
+
+# creates missing shots and sequences in Shotgun and updates the frameranges and thumbnails of existing shots.
+# localShots is a list of [shot, sequenceName, shotName], shotRanges the result of readShotRanges and
+# getPreview a function, which returns the path of the preview image of a shot or "".
+# Returns the names of the created and the updated shots and the failed thumbnail uploads.
+def syncShots(sg, sgPrjId, localShots, shotRanges, getPreview, sessionFactory):
+	fields = ['id', 'code', 'image', 'sg_cut_in', 'sg_cut_out', 'sg_sequence']
+	filters = [ ['project', 'is', {'type': 'Project', 'id': sgPrjId}]]
+	sgShots = {}
+	for x in sg.find("Shot", filters, fields):
+		if x['sg_sequence'] is None:
+			shotName = x['code']
+		else:
+			shotName = "%s-%s" % (x['sg_sequence']['name'], x['code'])
+		sgShots[shotName] = x
+
+	fields = ['id', 'code']
+	sgSequences = {x['code']: x for x in sg.find("Sequence", filters, fields)}
+
+	# the sequences have to exist before the shots can be linked to them
+	seqRequests = []
+	for shot, seqName, shotName in localShots:
+		if seqName != "" and shot not in sgShots and seqName not in sgSequences:
+			data = { 'project': {'type': 'Project','id': sgPrjId},
+				'code': seqName,
+				'sg_status_list': 'ip',
+				}
+			seqRequests.append(createRequest("Sequence", data))
+			sgSequences[seqName] = None
+
+	for seq in batchRequests(sg, seqRequests):
+		sgSequences[seq['code']] = {'type': 'Sequence', 'id': seq['id']}
+
+	requests = []
+	createdShots = []
+	updatedShots = []
+	thumbnails = []
+	for shot, seqName, shotName in localShots:
+		shotImg = getPreview(shot)
+		startFrame, endFrame = shotRanges.get(shot.lower(), ["", ""])
+
+		if shot not in sgShots:
+			data = { 'project': {'type': 'Project','id': sgPrjId},
+				'code': shotName,
+				'sg_status_list': 'ip',
+				}
+
+			if seqName != "":
+				data['sg_sequence'] = {'type': 'Sequence', 'id': sgSequences[seqName]['id']}
+
+			try:
+				data['sg_cut_in'] = int(startFrame)
+				data['sg_cut_out'] = int(endFrame)
+			except:
+				pass
+
+			requests.append(createRequest("Shot", data))
+			sgShots[shot] = None
+			createdShots.append(shot)
+		elif sgShots[shot] is not None:
+			sgShot = sgShots[shot]
+			data = {}
+
+			try:
+				if sgShot['sg_cut_in'] != int(startFrame):
+					data['sg_cut_in'] = int(startFrame)
+			except:
+				pass
+
+			try:
+				if sgShot['sg_cut_out'] != int(endFrame):
+					data['sg_cut_out'] = int(endFrame)
+			except:
+				pass
+
+			if len(data.keys()) > 0:
+				requests.append(updateRequest("Shot", sgShot['id'], data))
+
+			if shotImg != "":
+				thumbnails.append(["Shot", sgShot['id'], shotImg])
+
+			if shot not in updatedShots and (len(data.keys()) > 0 or (shotImg != "" and sgShot['image'] is None)):
+				updatedShots.append(shot)
+
+	results = batchRequests(sg, requests)
+
+	# batch requests can't upload files, so the thumbnails of the new shots are uploaded afterwards
+	createdIds = [x['id'] for x, request in zip(results, requests) if request["request_type"] == "create"]
+	for shot, shotId in zip(createdShots, createdIds):
+		shotImg = getPreview(shot)
+		if shotImg != "":
+			thumbnails.append(["Shot", shotId, shotImg])
+
+	failed = uploadThumbnails(thumbnails, sessionFactory)
+
+	return createdShots, updatedShots, failed
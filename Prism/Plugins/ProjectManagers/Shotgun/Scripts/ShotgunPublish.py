@@ -89,6 +89,7 @@ class sgPublish(QDialog, ShotgunPublish_ui.Ui_dlg_sgPublish):
 			return
 
 		self.sg, self.sgPrjId, self.sgUserId = sgData
+		self.sgCache = origin.sgCache
 
 		self.core.appPlugin.shotgunPublish_startup(self)
 
@@ -144,7 +145,7 @@ class sgPublish(QDialog, ShotgunPublish_ui.Ui_dlg_sgPublish):
 		elif self.rb_shot.isDown():
 			self.ptype = "Shot"
 
-		self.sgShots = self.sg.find(self.ptype, filters, fields)
+		self.sgShots = self.sgCache.find(self.sg, self.ptype, filters, fields)
 
 		self.cb_shot.clear()
 		self.shotList = {}
@@ -189,7 +190,7 @@ class sgPublish(QDialog, ShotgunPublish_ui.Ui_dlg_sgPublish):
 				['code', 'is', seqName]
 			]
 
-			seq = self.sg.find_one("Sequence", filters)
+			seq = self.sgCache.findOne(self.sg, "Sequence", filters)
 
 			filters = [
 				['project','is', {'type': 'Project','id': self.sgPrjId}],
@@ -321,22 +322,9 @@ class sgPublish(QDialog, ShotgunPublish_ui.Ui_dlg_sgPublish):
 
 			tmpFiles = []
 
-			ffmpegIsInstalled = False
-			if platform.system() == "Windows":
-				ffmpegPath = os.path.join(self.core.prismRoot, "Tools", "FFmpeg" ,"bin", "ffmpeg.exe")
-				if os.path.exists(ffmpegPath):
-					ffmpegIsInstalled = True
-			elif platform.system() == "Linux":
-				ffmpegPath = "ffmpeg"
-				try:
-					subprocess.Popen([ffmpegPath])
-					ffmpegIsInstalled = True
-				except:
-					pass
-			elif platform.system() == "Darwin":
-				ffmpegPath = os.path.join(self.core.prismRoot, "Tools", "ffmpeg")
-				if os.path.exists(ffmpegPath):
-					ffmpegIsInstalled = True
+			ffmpegPath = self.core.getFfmpegPath(title=None)
+			ffmpegIsInstalled = ffmpegPath is not None
+			queue = self.core.getTranscodeQueue()
 
 			imgPath = source[0]
 			if extension in [".exr", ".mp4", ".mov"]:
@@ -344,11 +332,10 @@ class sgPublish(QDialog, ShotgunPublish_ui.Ui_dlg_sgPublish):
 				outputpath = os.path.splitext(inputpath)[0] + ".jpg"
 				if ffmpegIsInstalled:
 					if videoInput:
-						nProc = subprocess.Popen([ffmpegPath, "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", "-vf", "select=gte(n\,%s)" % source[1], "-frames", "1", outputpath, "-y"])
+						result = queue.run([ffmpegPath, "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", "-vf", "select=gte(n\,%s)" % source[1], "-frames", "1", outputpath, "-y"], outputPath=outputpath, priority=1)
 					else:
-						nProc = subprocess.Popen([ffmpegPath, "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", outputpath, "-y"])
-					
-					result = nProc.communicate()
+						result = queue.run([ffmpegPath, "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", outputpath, "-y"], outputPath=outputpath, priority=1)
+
 					imgPath = outputpath
 					tmpFiles.append(imgPath)
 
@@ -434,12 +421,11 @@ class sgPublish(QDialog, ShotgunPublish_ui.Ui_dlg_sgPublish):
 							if isSequence:
 								inputpath = inputpath[:-8] + "%04d" + inputpath[-4:]
 								outputpath = inputpath[:-9] + ".mp4"
-								nProc = subprocess.Popen([ffmpegPath, "-start_number", str(self.startFrame), "-framerate", "24", "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", "-start_number", str(self.startFrame), outputpath, "-y"])
+								mp4Result = queue.run([ffmpegPath, "-start_number", str(self.startFrame), "-framerate", "24", "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", "-start_number", str(self.startFrame), outputpath, "-y"], outputPath=outputpath, priority=1)
 							else:
 								outputpath = inputpath[:-9] + "(proxy).mp4"
-								nProc = subprocess.Popen([ffmpegPath, "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", "-start_number", str(self.startFrame), outputpath, "-y"])
+								mp4Result = queue.run([ffmpegPath, "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", "-start_number", str(self.startFrame), outputpath, "-y"], outputPath=outputpath, priority=1)
 
-							mp4Result = nProc.communicate()
 							proxyPath = outputpath
 							tmpFiles.append(proxyPath)
 			
@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+
+import os, sys, re, platform, subprocess, tempfile, threading, time, json, socket
+
+try:
+	import http.client as httplib
+	from urllib.parse import urlparse
+except ImportError:
+	import httplib
+	from urlparse import urlparse
+
+
+def decodeOutput(data):
+	if isinstance(data, bytes) and not isinstance(data, str):
+		return data.decode("utf-8", "replace")
+
+	return data
+
+
+# reads the key=value lines of a Deadline job or plugin info file
+def readInfoFile(path):
+	info = {}
+	with open(path, "r") as infoFile:
+		for line in infoFile:
+			if "=" in line:
+				key, value = line.rstrip("\r\n").split("=", 1)
+				info[key] = value
+
+	return info
+
+
+def writeInfoFile(path, info):
+	with open(path, "w") as infoFile:
+		for key in info:
+			infoFile.write("%s=%s\n" % (key, info[key]))
+
+
+def getJobId(result):
+	for line in result.splitlines():
+		if line.startswith("JobID="):
+			return line.split("=", 1)[1].strip()
+
+	return None
+
+
+# the frame number of an output or dependency path gets replaced, so that the paths of the same sequence can be compared
+def getSequenceKey(path):
+	path = path.replace("$F4", "####").replace("%04d", "####")
+	if "####" not in path:
+		path = re.sub(r"\d{4}(?=\D*$)", "####", path)
+
+	return os.path.normcase(os.path.normpath(path))
+
+
+# Runs deadlinecommand. Every call starts a new process, so the DeadlineClient caches the results of queries.
+class DeadlineCommandBackend(object):
+	def __init__(self, deadlineBin):
+		self.deadlineBin = deadlineBin
+		if platform.system() == "Windows":
+			self.executable = os.path.join(deadlineBin, "deadlinecommand.exe")
+		else:
+			self.executable = os.path.join(deadlineBin, "deadlinecommand")
+
+
+	def run(self, arguments, background=True):
+		startupinfo = None
+		creationflags = 0
+		if platform.system() == "Windows":
+			if background:
+				startupinfo = subprocess.STARTUPINFO()
+				startupinfo.dwFlags |= getattr(subprocess, "STARTF_USESHOWWINDOW", 1)
+			else:
+				# still show top-level windows, but don't show a console window
+				creationflags = 0x08000000
+
+		proc = subprocess.Popen([self.executable] + list(arguments), cwd=self.deadlineBin, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, startupinfo=startupinfo, creationflags=creationflags)
+		output = proc.communicate()[0]
+		return decodeOutput(output)
+
+
+	def getGroups(self):
+		output = self.run(["-groups"])
+		if "Error" in output:
+			return []
+
+		return output.splitlines()
+
+
+	def getPools(self):
+		output = self.run(["-pools"])
+		if "Error" in output:
+			return []
+
+		return output.splitlines()
+
+
+	def getHomeDir(self):
+		return self.run(["-GetCurrentUserHomeDirectory"]).replace("\r", "").replace("\n", "")
+
+
+	def getVersion(self):
+		return self.run(["-version"]).strip()
+
+
+	def submit(self, jobInfoFile, pluginInfoFile, auxFiles=[]):
+		return self.run([jobInfoFile, pluginInfoFile] + list(auxFiles), background=False)
+
+
+	# submits all jobs with one process. If not every job was submitted, the created jobs are deleted again.
+	def submitMultiple(self, jobs):
+		arguments = ["-SubmitMultipleJobs"]
+		for i in jobs:
+			arguments += ["-job", i["jobInfoFile"], i["pluginInfoFile"]] + list(i["auxFiles"])
+
+		output = self.run(arguments, background=False)
+		jobIds = [x.split("=", 1)[1].strip() for x in output.splitlines() if x.startswith("JobID=")]
+		if len(jobIds) != len(jobs):
+			for i in jobIds:
+				self.deleteJob(i)
+
+			return ["Error: the jobs couldn't be submitted:\n%s" % output] * len(jobs)
+
+		return ["Result=Success\nJobID=%s" % x for x in jobIds]
+
+
+	def deleteJob(self, jobId):
+		return self.run(["-DeleteJob", jobId])
+
+
+# Talks to the Deadline Web Service over a single keep-alive connection. The job and plugin info files are
+# sent as json, so the output of a submission looks like the output of deadlinecommand.
+class DeadlineWebBackend(object):
+	def __init__(self, url, homeDirFunc=None, timeout=10):
+		parsed = urlparse(url if "://" in url else "http://" + url)
+		self.scheme = parsed.scheme
+		self.host = parsed.hostname
+		self.port = parsed.port or 8082
+		self.homeDirFunc = homeDirFunc
+		self.timeout = timeout
+		self.connection = None
+		self.lock = threading.Lock()
+
+
+	def getConnection(self):
+		if self.connection is None:
+			if self.scheme == "https":
+				self.connection = httplib.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+			else:
+				self.connection = httplib.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+		return self.connection
+
+
+	# a connection, which was closed by the server, gets reopened once
+	def request(self, method, path, data=None):
+		body = None
+		headers = {}
+		if data is not None:
+			body = json.dumps(data)
+			headers["Content-Type"] = "application/json"
+
+		with self.lock:
+			for i in range(2):
+				try:
+					connection = self.getConnection()
+					connection.request(method, path, body, headers)
+					response = connection.getresponse()
+					content = decodeOutput(response.read())
+					break
+				except (httplib.HTTPException, socket.error):
+					if self.connection is not None:
+						self.connection.close()
+						self.connection = None
+
+					if i == 1:
+						raise
+
+		if response.status >= 400:
+			raise RuntimeError("Deadline Web Service error %s: %s" % (response.status, content))
+
+		if not content:
+			return None
+
+		try:
+			return json.loads(content)
+		except ValueError:
+			return content
+
+
+	def getGroups(self):
+		try:
+			return self.request("GET", "/api/groups") or []
+		except Exception:
+			return []
+
+
+	def getPools(self):
+		try:
+			return self.request("GET", "/api/pools") or []
+		except Exception:
+			return []
+
+
+	# the auxiliary files are read by the Web Service, so homeDirFunc should return a folder, which the server can access
+	def getHomeDir(self):
+		if self.homeDirFunc is not None:
+			homeDir = self.homeDirFunc()
+		else:
+			homeDir = os.path.join(tempfile.gettempdir(), "PrismDeadline")
+
+		if not os.path.exists(os.path.join(homeDir, "temp")):
+			os.makedirs(os.path.join(homeDir, "temp"))
+
+		return homeDir
+
+
+	def getVersion(self):
+		return None
+
+
+	def submit(self, jobInfoFile, pluginInfoFile, auxFiles=[]):
+		data = {"JobInfo": readInfoFile(jobInfoFile), "PluginInfo": readInfoFile(pluginInfoFile), "AuxFiles": list(auxFiles), "IdOnly": True}
+		try:
+			result = self.request("POST", "/api/jobs", data)
+		except Exception as e:
+			return "Error: %s" % e
+
+		if isinstance(result, dict) and "_id" in result:
+			return "Result=Success\nJobID=%s" % result["_id"]
+
+		return "Error: unexpected response from the Deadline Web Service: %s" % result
+
+
+	# the requests share one connection, so the jobs are submitted one after another
+	def submitMultiple(self, jobs):
+		return [self.submit(x["jobInfoFile"], x["pluginInfoFile"], x["auxFiles"]) for x in jobs]
+
+
+	def deleteJob(self, jobId):
+		try:
+			return self.request("DELETE", "/api/jobs?JobID=%s" % jobId)
+		except Exception as e:
+			return "Error: %s" % e
+
+
+# Caches the queries of a backend for ttl seconds, so that a publish with several states doesn't query the
+# groups, home directory and version of Deadline for every state.
+class DeadlineClient(object):
+	def __init__(self, backend, ttl=300):
+		self.backend = backend
+		self.ttl = ttl
+		self.cache = {}
+		self.lock = threading.Lock()
+
+
+	def getCached(self, key, func):
+		with self.lock:
+			cached = self.cache.get(key)
+
+		if cached is not None and (time.time() - cached[0]) < self.ttl:
+			return cached[1]
+
+		value = func()
+		with self.lock:
+			self.cache[key] = [time.time(), value]
+
+		return value
+
+
+	def invalidate(self, key=None):
+		with self.lock:
+			if key is None:
+				self.cache = {}
+			else:
+				self.cache.pop(key, None)
+
+
+	def getGroups(self):
+		return self.getCached("groups", self.backend.getGroups)
+
+
+	def getPools(self):
+		return self.getCached("pools", self.backend.getPools)
+
+
+	# the home directory of the Web Service backend can depend on the current project and isn't cached
+	def getHomeDir(self):
+		if isinstance(self.backend, DeadlineWebBackend):
+			return self.backend.getHomeDir()
+
+		return self.getCached("homeDir", self.backend.getHomeDir)
+
+
+	def getVersion(self):
+		return self.getCached("version", self.backend.getVersion)
+
+
+	# returns the major version of Deadline or None if it is unknown
+	def getMajorVersion(self):
+		version = self.getVersion()
+		try:
+			return int(version.split(".")[0].lstrip("v"))
+		except (AttributeError, ValueError):
+			return None
+
+
+	def submit(self, jobInfoFile, pluginInfoFile, auxFiles=[]):
+		return self.backend.submit(jobInfoFile, pluginInfoFile, auxFiles)
+
+
+	# jobs is a list of dicts with the keys jobInfoFile, pluginInfoFile, auxFiles, dependencies and outputFile.
+	# A dependency on the output of an earlier job in the list becomes a frame dependency on that job. The
+	# jobs are submitted in as few calls as the dependencies allow and if one call fails, all jobs, which were
+	# already submitted, are deleted again, so that the farm never gets only a part of the jobs.
+	def submitBatch(self, jobs):
+		self.resolveDependencies(jobs)
+
+		levels = []
+		for idx, job in enumerate(jobs):
+			job["level"] = max([jobs[x]["level"] + 1 for x in job["parents"]] + [0])
+			if job["level"] == len(levels):
+				levels.append([])
+
+			levels[job["level"]].append(idx)
+
+		results = [None] * len(jobs)
+		jobIds = {}
+		for level in levels:
+			for idx in level:
+				self.prepareJob(jobs[idx], [jobIds[x] for x in jobs[idx]["parents"]])
+
+			levelResults = self.backend.submitMultiple([jobs[x] for x in level])
+			for idx, result in zip(level, levelResults):
+				results[idx] = result
+				jobId = getJobId(result) if "Result=Success" in result else None
+				if jobId is not None:
+					jobIds[idx] = jobId
+
+			if len([x for x in level if x not in jobIds]) > 0:
+				for jobId in jobIds.values():
+					self.backend.deleteJob(jobId)
+
+				for idx in range(len(jobs)):
+					if results[idx] is None or idx in jobIds:
+						results[idx] = "Execute failed: the job wasn't submitted, because another job of this publish couldn't be submitted"
+
+				break
+
+		return results
+
+
+	def resolveDependencies(self, jobs):
+		outputs = {}
+		for idx, job in enumerate(jobs):
+			job["parents"] = []
+			job["remainingDependencies"] = []
+			offsets = set()
+			for dep in job["dependencies"]:
+				parent = outputs.get(getSequenceKey(dep[1]))
+				if parent is not None:
+					job["parents"].append(parent)
+					offsets.add(int(dep[0]))
+				else:
+					job["remainingDependencies"].append(dep)
+
+			# Deadline has only one frame offset per job
+			if len(offsets) > 1:
+				job["parents"] = []
+				job["remainingDependencies"] = list(job["dependencies"])
+			else:
+				job["offset"] = offsets.pop() if offsets else 0
+
+			outputs[getSequenceKey(job["outputFile"])] = idx
+
+
+	def prepareJob(self, job, parentIds):
+		if len(parentIds) == 0:
+			return
+
+		jobInfo = readInfoFile(job["jobInfoFile"])
+		jobInfo["JobDependencies"] = ",".join(parentIds)
+		jobInfo["IsFrameDependent"] = "true"
+		jobInfo["FrameDependencyOffsetStart"] = job["offset"]
+		jobInfo["FrameDependencyOffsetEnd"] = job["offset"]
+
+		depFiles = [x for x in job["auxFiles"] if os.path.basename(x) == "dependencies.txt"]
+		if len(job["remainingDependencies"]) > 0:
+			for depFile in depFiles:
+				with open(depFile, "w") as fileHandle:
+					for i in job["remainingDependencies"]:
+						fileHandle.write(str(i[0]) + "\n")
+						fileHandle.write(str(i[1]) + "\n")
+		else:
+			jobInfo.pop("ScriptDependencies", None)
+			job["auxFiles"] = [x for x in job["auxFiles"] if x not in depFiles]
+
+		writeInfoFile(job["jobInfoFile"], jobInfo)
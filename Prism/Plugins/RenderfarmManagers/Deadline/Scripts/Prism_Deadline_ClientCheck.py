@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+
+# Checks the DeadlineWebBackend and the batch submission of the DeadlineClient against a local stub of the
+# Deadline Web Service. Run it with "python Prism_Deadline_ClientCheck.py". No Deadline installation is needed.
+
+import os, sys, json, shutil, tempfile, threading
+
+try:
+	from http.server import HTTPServer, BaseHTTPRequestHandler
+	from socketserver import ThreadingMixIn
+except ImportError:
+	from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+	from SocketServer import ThreadingMixIn
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import Prism_Deadline_Client as DeadlineClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+
+	def sendJson(self, data, status=200):
+		content = json.dumps(data).encode("utf-8")
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(content)))
+		self.end_headers()
+		self.wfile.write(content)
+
+
+	def do_GET(self):
+		if self.path == "/api/groups":
+			self.sendJson(["none", "cpu"])
+		elif self.path == "/api/pools":
+			self.sendJson(["none", "render"])
+		else:
+			self.sendJson({"error": "not found"}, status=404)
+
+
+	def do_POST(self):
+		data = json.loads(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+		server = self.server
+		server.submitted.append(data)
+		if data["JobInfo"].get("Name") in server.failNames:
+			self.sendJson({"error": "rejected"}, status=500)
+			return
+
+		self.sendJson({"_id": "job%s" % len(server.submitted)})
+
+
+	def do_DELETE(self):
+		self.server.deleted.append(self.path.split("JobID=")[-1])
+		self.sendJson("Success")
+
+
+	def log_message(self, *args):
+		pass
+
+
+# the client keeps its connection open, so every connection gets its own thread
+class StubServer(ThreadingMixIn, HTTPServer):
+	daemon_threads = True
+
+
+def startServer():
+	server = StubServer(("127.0.0.1", 0), StubHandler)
+	server.submitted = []
+	server.deleted = []
+	server.failNames = []
+	thread = threading.Thread(target=server.serve_forever)
+	thread.daemon = True
+	thread.start()
+	return server
+
+
+def createJob(folder, name, outputFile, dependencies=[]):
+	jobInfoFile = os.path.join(folder, name + "_job.txt")
+	pluginInfoFile = os.path.join(folder, name + "_plugin.txt")
+	depFile = os.path.join(folder, name, "dependencies.txt")
+	DeadlineClient.writeInfoFile(jobInfoFile, {"Name": name, "ScriptDependencies": "dependencies.py"})
+	DeadlineClient.writeInfoFile(pluginInfoFile, {"OutputFile": outputFile})
+	os.makedirs(os.path.dirname(depFile))
+	open(depFile, "w").close()
+	return {"jobInfoFile": jobInfoFile, "pluginInfoFile": pluginInfoFile, "auxFiles": [depFile], "dependencies": dependencies, "outputFile": outputFile}
+
+
+def check(name, condition):
+	print("%s: %s" % ("ok" if condition else "FAILED", name))
+	return condition
+
+
+def main():
+	server = startServer()
+	folder = tempfile.mkdtemp(prefix="PrismDeadlineCheck_")
+	results = []
+	backend = DeadlineClient.DeadlineWebBackend("127.0.0.1:%s" % server.server_address[1], homeDirFunc=lambda: folder)
+	try:
+		client = DeadlineClient.DeadlineClient(backend)
+
+		results.append(check("groups are queried", client.getGroups() == ["none", "cpu"]))
+		results.append(check("pools are queried", client.getPools() == ["none", "render"]))
+		results.append(check("home directory is created", os.path.exists(os.path.join(client.getHomeDir(), "temp"))))
+
+		# the second job renders from the cache of the first one, so it becomes a frame dependency on that job
+		cacheJob = createJob(folder, "cache", "/proj/cache/cache.$F4.bgeo")
+		renderJob = createJob(folder, "render", "/proj/render/beauty.####.exr", dependencies=[["0", "/proj/cache/cache.0001.bgeo"]])
+		batchResults = client.submitBatch([cacheJob, renderJob])
+		results.append(check("batch is submitted", len([x for x in batchResults if x.startswith("Result=Success")]) == 2))
+		renderInfo = server.submitted[-1]["JobInfo"]
+		results.append(check("dependency on the batch becomes a job dependency", renderInfo.get("JobDependencies") == DeadlineClient.getJobId(batchResults[0])))
+		results.append(check("resolved dependencies don't need the dependency script", "ScriptDependencies" not in renderInfo))
+
+		# if a job of the batch is rejected, the jobs, which were already submitted, are deleted again
+		server.failNames.append("render2")
+		cacheJob = createJob(folder, "cache2", "/proj/cache/cache2.$F4.bgeo")
+		renderJob = createJob(folder, "render2", "/proj/render/beauty2.####.exr", dependencies=[["0", "/proj/cache/cache2.0001.bgeo"]])
+		batchResults = client.submitBatch([cacheJob, renderJob])
+		results.append(check("failed batch reports errors for all jobs", len([x for x in batchResults if x.startswith("Result=Success")]) == 0))
+		results.append(check("submitted jobs of a failed batch are deleted", server.deleted == ["job%s" % (len(server.submitted) - 1)]))
+	finally:
+		if backend.connection is not None:
+			backend.connection.close()
+
+		server.shutdown()
+		server.server_close()
+		shutil.rmtree(folder, ignore_errors=True)
+
+	return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
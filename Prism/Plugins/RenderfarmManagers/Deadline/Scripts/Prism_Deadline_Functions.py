@@ -32,9 +32,11 @@
 
 
 
-import os, sys, traceback, time, subprocess
+import os, sys, traceback, time, subprocess, shutil, tempfile
 from functools import wraps
 
+import Prism_Deadline_Client as DeadlineClient
+
 try:
 	import hou
 except:
@@ -76,90 +78,60 @@ class Prism_Deadline_Functions(object):
 		return len(self.getDeadlineGroups()) > 0
 
 
+	# uses the Deadline Web Service, if an url is set in the "deadline" section of the Prism config, and deadlinecommand otherwise
 	@err_decorator
-	def deadlineCommand(self, arguments, background=True, readStdout=True):
-		deadlineBin = os.getenv('DEADLINE_PATH')
-		if deadlineBin is None:
-			return False
-		deadlineCommand = os.path.join( deadlineBin, "deadlinecommand.exe" )
-
-		startupinfo = None
-		creationflags = 0
-		if background:
-			startupinfo = subprocess.STARTUPINFO()
-			startupinfo.dwFlags |= subprocess._subprocess.STARTF_USESHOWWINDOW
-		else:
-			# still show top-level windows, but don't show a console window
-			CREATE_NO_WINDOW = 0x08000000   #MSDN process creation flag
-			creationflags = CREATE_NO_WINDOW
-
-		arguments.insert( 0, deadlineCommand)
-		
-		stdoutPipe = None
-		if readStdout:
-			stdoutPipe=subprocess.PIPE
-			
-		# Specifying PIPE for all handles to workaround a Python bug on Windows. The unused handles are then closed immediatley afterwards.
-		proc = subprocess.Popen(arguments, cwd=deadlineBin, stdin=subprocess.PIPE, stdout=stdoutPipe, stderr=subprocess.PIPE, startupinfo=startupinfo, creationflags=creationflags )
-		proc.stdin.close()
-		proc.stderr.close()
+	def getDeadlineClient(self):
+		if not hasattr(self, "deadlineClient"):
+			webServiceUrl = self.core.getConfig("deadline", "webserviceurl")
+			deadlineBin = os.getenv('DEADLINE_PATH')
+			if webServiceUrl:
+				homeDirFunc = lambda: os.path.join(self.core.projectPath, "00_Pipeline", "DeadlineSubmissions", self.core.user)
+				self.deadlineClient = DeadlineClient.DeadlineClient(DeadlineClient.DeadlineWebBackend(webServiceUrl, homeDirFunc=homeDirFunc))
+			elif deadlineBin is not None:
+				self.deadlineClient = DeadlineClient.DeadlineClient(DeadlineClient.DeadlineCommandBackend(deadlineBin))
+			else:
+				self.deadlineClient = None
 
-		output = ""
-		if readStdout:
-			output = proc.stdout.read()
-		return output
+		return self.deadlineClient
 
 
+	# during a publish, the State Manager collects the jobs and submits them together in submitJobBatch.
+	# The files are copied, because the scene can change before the batch is submitted.
 	@err_decorator
-	def blenderDeadlineCommand(self):
-		deadlineBin = ""
-		try:
-			deadlineBin = os.environ['DEADLINE_PATH']
-		except KeyError:
-			pass
+	def submitJob(self, origin, jobInfoFile, pluginInfoFile, auxFiles, dependencies, outputFile):
+		client = self.getDeadlineClient()
+		farmJobs = getattr(origin.stateManager, "farmJobs", None)
+		if farmJobs is None:
+			return client.submit(jobInfoFile, pluginInfoFile, auxFiles)
 
-		if deadlineBin == "":
-			return None
+		batchPath = tempfile.mkdtemp(prefix="PrismBatch_", dir=os.path.join(client.getHomeDir(), "temp"))
+		files = []
+		for i in [jobInfoFile, pluginInfoFile] + list(auxFiles):
+			targetPath = os.path.join(batchPath, os.path.basename(i))
+			shutil.copy2(i, targetPath)
+			files.append(targetPath)
 
-		deadlineCommand = os.path.join(deadlineBin, "deadlinecommand")
-		
-		return deadlineCommand
+		farmJobs.append({"manager": self, "state": origin, "jobInfoFile": files[0], "pluginInfoFile": files[1], "auxFiles": files[2:], "dependencies": list(dependencies), "outputFile": outputFile, "batchPath": batchPath})
+		return "Result=Success"
 
 
+	# returns a result string for every job
 	@err_decorator
-	def getDeadlineGroups(self, subdir=None):
-		if not hasattr(self, "deadlineGroups"):
-			if self.core.appPlugin.pluginName == "Blender":
-				deadlineCommand = self.blenderDeadlineCommand()
-				
-				if deadlineCommand is None:
-					return []
-
-				startupinfo = None
-
-				args = [deadlineCommand, "-groups"]   
-				if subdir != None and subdir != "":
-					args.append(subdir)
-				
-				# Specifying PIPE for all handles to workaround a Python bug on Windows. The unused handles are then closed immediatley afterwards.
-				proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, startupinfo=startupinfo)
-
-				proc.stdin.close()
-				proc.stderr.close()
-
-				output = proc.stdout.read()
-
-				output = output.decode("utf_8")
+	def submitJobBatch(self, jobs):
+		try:
+			return self.getDeadlineClient().submitBatch(jobs)
+		finally:
+			for i in jobs:
+				shutil.rmtree(i["batchPath"], ignore_errors=True)
 
-			else:
-				output = self.deadlineCommand( ["-groups",] )
 
-			if output != False and not "Error" in output:
-				self.deadlineGroups = output.splitlines()
-			else:
-				self.deadlineGroups = []
+	@err_decorator
+	def getDeadlineGroups(self, subdir=None):
+		client = self.getDeadlineClient()
+		if client is None:
+			return []
 
-		return self.deadlineGroups
+		return client.getGroups()
 
 
 	@err_decorator
@@ -180,7 +152,7 @@ class Prism_Deadline_Functions(object):
 
 		origin.nameChanged(origin.e_name.text())
 
-		origin.stateManager.saveStatesToScene()
+		origin.stateManager.saveStatesToScene(state=origin)
 
 
 	@err_decorator
@@ -323,12 +295,11 @@ class Prism_Deadline_Functions(object):
 	def sm_houExport_submitJob(self, origin, jobOutputFile, parent):
 		jobOutputFile = jobOutputFile.replace("$F4", "####")
 
-		homeDir = (self.deadlineCommand( ["-GetCurrentUserHomeDirectory",] ))
-
-		if homeDir == False:
+		client = self.getDeadlineClient()
+		if client is None:
 			return "Execute Canceled: Deadline is not installed"
 
-		homeDir = homeDir.replace( "\r", "" ).replace( "\n", "" )
+		homeDir = client.getHomeDir()
 
 		dependencies = parent.dependencies
 
@@ -383,7 +354,8 @@ class Prism_Deadline_Functions(object):
 		fileHandle.write( "IgnoreInputs=%s\n" % ignoreInputs )
 
 		#fileHandle.write( "Version=16.0\n" )
-		if int(self.deadlineCommand( ["-version",] ).split(".")[0][1:]) > 9:
+		majorVersion = client.getMajorVersion()
+		if majorVersion is None or majorVersion > 9:
 			fileHandle.write( "Version=%s.%s\n" % (hou.applicationVersion()[0], hou.applicationVersion()[1]) )
 		else:
 			fileHandle.write( "Version=%s\n" % hou.applicationVersion()[0] )
@@ -401,14 +373,11 @@ class Prism_Deadline_Functions(object):
 
 			fileHandle.close()
 		
-		arguments = []
-		arguments.append( jobInfoFile )
-		arguments.append( pluginInfoFile )
-		arguments.append( hou.hipFile.path() )
+		auxFiles = [hou.hipFile.path()]
 		if "dependencyFile" in locals():
-			arguments.append( dependencyFile )
+			auxFiles.append( dependencyFile )
 			
-		jobResult = self.deadlineCommand( arguments )
+		jobResult = self.submitJob(origin, jobInfoFile, pluginInfoFile, auxFiles, dependencies, jobOutputFile)
 	
 		return jobResult
 
@@ -447,12 +416,11 @@ class Prism_Deadline_Functions(object):
 	def sm_houRender_submitJob(self, origin, jobOutputFile, parent):
 		jobOutputFile = jobOutputFile.replace("$F4", "####")
 
-		homeDir = (self.deadlineCommand( ["-GetCurrentUserHomeDirectory",] ))
-
-		if homeDir == False:
+		client = self.getDeadlineClient()
+		if client is None:
 			return "Execute Canceled: Deadline is not installed"
 
-		homeDir = homeDir.replace( "\r", "" ).replace( "\n", "" )
+		homeDir = client.getHomeDir()
 
 		dependencies = parent.dependencies
 
@@ -511,7 +479,8 @@ class Prism_Deadline_Functions(object):
 		fileHandle.write( "IgnoreInputs=%s\n" % ignoreInputs )
 
 		#fileHandle.write( "Version=16.0\n" )
-		if int(self.deadlineCommand( ["-version",] ).split(".")[0][1:]) > 9:
+		majorVersion = client.getMajorVersion()
+		if majorVersion is None or majorVersion > 9:
 			fileHandle.write( "Version=%s.%s\n" % (hou.applicationVersion()[0], hou.applicationVersion()[1]) )
 		else:
 			fileHandle.write( "Version=%s\n" % hou.applicationVersion()[0] )
@@ -539,14 +508,11 @@ class Prism_Deadline_Functions(object):
 
 			fileHandle.close()
 		
-		arguments = []
-		arguments.append( jobInfoFile )
-		arguments.append( pluginInfoFile )
-		arguments.append( hou.hipFile.path() )
+		auxFiles = [hou.hipFile.path()]
 		if "dependencyFile" in locals():
-			arguments.append( dependencyFile )
+			auxFiles.append( dependencyFile )
 			
-		jobResult = self.deadlineCommand( arguments )
+		jobResult = self.submitJob(origin, jobInfoFile, pluginInfoFile, auxFiles, dependencies, jobOutputFile)
 	
 		return jobResult
 
@@ -583,12 +549,11 @@ class Prism_Deadline_Functions(object):
 
 	@err_decorator
 	def sm_render_submitJob(self, origin, jobOutputFile, parent):
-		homeDir = (self.deadlineCommand( ["-GetCurrentUserHomeDirectory",], background=False )).decode("utf-8")
-
-		if homeDir == False:
+		client = self.getDeadlineClient()
+		if client is None:
 			return "Execute Canceled: Deadline is not installed"
 
-		homeDir = homeDir.replace( "\r", "" ).replace( "\n", "" )
+		homeDir = client.getHomeDir()
 
 		dependencies = parent.dependencies
 
@@ -667,15 +632,10 @@ class Prism_Deadline_Functions(object):
 
 			fileHandle.close()
 		
-		arguments = []
-		arguments.append( dlParams["jobInfoFile"] )
-		arguments.append( dlParams["pluginInfoFile"] )
-		for i in self.core.appPlugin.getCurrentSceneFiles(origin):
-			arguments.append(i)
-
+		auxFiles = list(self.core.appPlugin.getCurrentSceneFiles(origin))
 		if "dependencyFile" in locals():
-			arguments.append( dependencyFile )
+			auxFiles.append( dependencyFile )
 			
-		jobResult = self.deadlineCommand( arguments, background=False ).decode("utf-8") 
+		jobResult = self.submitJob(origin, dlParams["jobInfoFile"], dlParams["pluginInfoFile"], auxFiles, dependencies, jobOutputFile)
 		   
 		return jobResult
\ No newline at end of file
@@ -113,12 +113,12 @@ class Prism_Pandora_Functions(object):
 			elif item.toolTip().startswith("Job:"):
 				origin.dependencies["Pandora"] = [[item.text(), "Job"]]
 			origin.updateUi()
-			origin.stateManager.saveStatesToScene()
+			origin.stateManager.saveStatesToScene(state=origin)
 		elif item.checkState() == Qt.Unchecked:
 			if len(origin.dependencies["Pandora"]) > 0 and item.text() == origin.dependencies["Pandora"][0][0]:
 				origin.dependencies["Pandora"] = []
 				origin.updateUi()
-				origin.stateManager.saveStatesToScene()
+				origin.stateManager.saveStatesToScene(state=origin)
 
 
 	@err_decorator
@@ -260,14 +260,15 @@ class Prism_Pandora_Functions(object):
 		if submPath in [None, ""]:
 			warnings.append(["No Pandora submission folder is configured.", "", 3])
 
-		extFiles, extFilesSource = self.core.appPlugin.sm_getExternalFiles(origin)
+		sceneRefs = self.core.getSceneReferences(origin)
+		extFiles, extFilesSource = sceneRefs.externalFiles, sceneRefs.externalFilesSource
 
 		if origin.chb_osDependencies.isChecked():
 			lockedAssets = []
 			for idx, i in enumerate(extFiles):
 				i = self.core.fixPath(i)
 
-				if (not os.path.exists(i) and not i.startswith("op:")) or i == self.core.getCurrentFileName():
+				if (not sceneRefs.exists(i) and not i.startswith("op:")) or i == self.core.getCurrentFileName():
 					continue
 
 				if not extFilesSource[idx].node().isEditable():
@@ -378,14 +379,15 @@ class Prism_Pandora_Functions(object):
 		if submPath in [None, ""]:
 			warnings.append(["No Pandora submission folder is configured.", "", 3])
 
-		extFiles, extFilesSource = self.core.appPlugin.sm_getExternalFiles(origin)
+		sceneRefs = self.core.getSceneReferences(origin)
+		extFiles, extFilesSource = sceneRefs.externalFiles, sceneRefs.externalFilesSource
 
 		if origin.chb_osDependencies.isChecked():
 			lockedAssets = []
 			for idx, i in enumerate(extFiles):
 				i = self.core.fixPath(i)
 				
-				if (not os.path.exists(i) and not i.startswith("op:")) or i == self.core.getCurrentFileName():
+				if (not sceneRefs.exists(i) and not i.startswith("op:")) or i == self.core.getCurrentFileName():
 					continue
 
 				if not extFilesSource[idx].node().isEditable():
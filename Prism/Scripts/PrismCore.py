@@ -31,7 +31,7 @@
 # along with Prism.  If not, see <https://www.gnu.org/licenses/>.
 
 from pprint import pprint
-import sys, os, threading, shutil, time, socket, traceback, platform, random, errno, stat
+import sys, os, threading, shutil, time, socket, traceback, platform, random, errno, stat, hashlib
 
 #check if python 2 or python 3 is used
 if sys.version[0] == "3":
@@ -50,6 +50,7 @@ if prismConfigRoot not in sys.path:
 	sys.path.append(prismConfigRoot)
 
 import ConfigReader
+from PrismUtils import ConfigCache, ProjectIndex, ThumbnailCache, VersionCache, AssetCrawler, PluginManifest, TranscodeQueue, SceneReferences
 
 try:
 	from PySide2.QtCore import *
@@ -77,6 +78,7 @@ except:
 			psVersion = 1
 
 from functools import wraps
+from contextlib import contextmanager
 import subprocess
 
 try:
@@ -123,6 +125,11 @@ class PrismCore():
 		self.app_name = app
 
 		self.config_reader = ConfigReader.ConfigReader()
+		self.configCache = ConfigCache.configCache
+		self.projectIndex = ProjectIndex.ProjectIndex()
+		self.versionCache = VersionCache.VersionCache(self.projectIndex)
+		self.transcodeQueue = None
+		self.sceneReferences = None
 
 		try:
 			# set some general variables
@@ -140,6 +147,9 @@ class PrismCore():
 				self.userini = os.path.join(os.environ["HOME"], "Library", "Preferences", "Prism", "Prism.ini")
 				self.installLocPath = os.path.join(os.environ["HOME"], "Library", "Preferences", "Prism", "InstallLocations.ini")
 
+			self.thumbnailCache = ThumbnailCache.ThumbnailCache(os.path.join(os.path.dirname(self.userini), "ThumbnailCache"))
+			self.pluginManifest = PluginManifest.PluginManifest(os.path.join(os.path.dirname(self.userini), "PluginManifest.json"))
+
 			self.pluginPathApp = os.path.abspath(os.path.join(__file__, os.pardir, os.pardir, "Plugins", "Apps"))
 			self.pluginPathCustom = os.path.abspath(os.path.join(__file__, os.pardir, os.pardir, "Plugins", "Custom"))
 			self.pluginPathPrjMng = os.path.abspath(os.path.join(__file__, os.pardir, os.pardir, "Plugins", "ProjectManagers"))
@@ -276,14 +286,34 @@ class PrismCore():
 					if i == current or not (os.path.exists(initPath) or os.path.exists(initPath.replace("_init", "_init_unloaded"))):
 						continue
 
-					sys.path.append(os.path.dirname(initPath))
-					pPlug = getattr(__import__("Prism_%s_init_unloaded" % (i)), "Prism_%s_unloaded" % i)(self)
+					modName = "Prism_%s_init_unloaded" % i
+					className = "Prism_%s_unloaded" % i
 				else:
 					if not os.path.exists(initPath):
 						continue
 
-					sys.path.append(os.path.dirname(initPath))
-					pPlug = getattr(__import__("Prism_%s_init" % (i)), "Prism_%s" % i)(self)
+					modName = initmodule
+					className = "Prism_%s" % i
+
+				sys.path.append(pluginPath)
+
+				# plugins, which can't be used in this session, don't need to be imported
+				info = self.pluginManifest.getInfo(pluginPath, modName)
+				if info is not None:
+					if platform.system() not in info["data"].get("platforms", []):
+						continue
+
+					if info["data"].get("pluginType") == "RenderfarmManager" and self.appPlugin.appType != "3d":
+						continue
+
+				# managers and custom plugins need to be imported to check if they are active. isActive depends on the
+				# environment (Deadline queries the farm, Pandora checks if its module can be imported, custom plugins
+				# can check anything), so the result can't be cached in the manifest.
+				if info is not None and os.path.basename(k) == "Apps":
+					pPlug = PluginManifest.PluginProxy(info, lambda x=modName, y=className: getattr(__import__(x), y)(self))
+				else:
+					pPlug = getattr(__import__(modName), className)(self)
+					self.pluginManifest.setInfo(pluginPath, modName, pPlug)
 
 				if platform.system() in pPlug.platforms:
 					if pluginLocation is None:
@@ -302,6 +332,8 @@ class PrismCore():
 					elif pPlug.pluginType in ["ProjectManager"]:
 						prjManagers.append(pPlug)
 
+		self.pluginManifest.save()
+
 		for i in appPlugins:
 			self.unloadedAppPlugins[i.pluginName] = i
 
@@ -676,8 +708,7 @@ class PrismCore():
 
 		# write the config to the file
 		try:
-			with open(self.userini, 'w') as inifile:
-				uconfig.write(inifile)
+			self.configCache.write(self.userini, uconfig)
 		except Exception as e:
 			QMessageBox.warning(self.messageParent, "Warning", "Could not create the Prism preferences:\n\n%s\n\nMake sure you have required permissions to write to that folder.\n\nError:\n%s" % (self.userini, str(e)))
 
@@ -714,6 +745,7 @@ class PrismCore():
 
 		if not os.path.exists(inipath):
 			self.prismIni = ""
+			self.projectIndex.setDatabase(None)
 			self.setConfig("globals", "current project", "")
 			if hasattr(self, "projectName"):
 				del self.projectName
@@ -757,6 +789,9 @@ class PrismCore():
 		self.projectPath = os.path.abspath(os.path.join(self.prismIni, os.pardir, os.pardir))
 		if not self.projectPath.endswith(os.sep):
 			self.projectPath += os.sep
+		# the index is stored on the local disk, because SQLite locking isn't reliable on network shares
+		indexName = hashlib.md5(os.path.normcase(self.projectPath).encode("utf-8")).hexdigest() + ".db"
+		self.projectIndex.setDatabase(os.path.join(os.path.dirname(self.userini), "ProjectIndex", indexName))
 		self.projectName = self.getConfig("globals", "project_name", configPath=self.prismIni)
 		if self.getConfig("globals", "uselocalfiles", configPath=self.prismIni) is not None:
 			self.useLocalFiles = eval(self.getConfig("globals", "uselocalfiles", configPath=self.prismIni))
@@ -790,9 +825,13 @@ class PrismCore():
 
 		rSection = "recent_files_" + self.projectName
 
-		for i in range(10):
-			if self.getConfig(rSection, "recent" + "%02d" % (i+1)) is None:
-				self.setConfig(rSection, "recent" + "%02d" % (i+1), "")
+		with self.configTransaction() as userConfig:
+			if not userConfig.has_section(rSection):
+				userConfig.add_section(rSection)
+
+			for i in range(10):
+				if not userConfig.has_option(rSection, "recent" + "%02d" % (i+1)):
+					userConfig.set(rSection, "recent" + "%02d" % (i+1), "")
 
 		sep = self.getConfig("globals", "filenameseperator", configPath=self.prismIni)
 		if sep is not None:
@@ -816,36 +855,27 @@ class PrismCore():
 
 	@err_decorator
 	def setRecentPrj(self, path, action="add"):
-		userConfig = ConfigParser()
-		userConfig.read(self.userini)
-
 		path = self.fixPath(path)
 
-		rProjects = []
-		if userConfig.has_section("recent_projects"):
-			rProjects = userConfig.options("recent_projects")
+		with self.configTransaction() as userConfig:
+			recentProjects = []
+			if userConfig.has_section("recent_projects"):
+				for i in userConfig.options("recent_projects"):
+					prjName = userConfig.get('recent_projects', i)
+					if prjName != "":
+						recentProjects.append(self.fixPath(prjName))
 
-		recentProjects = []
+			if path in recentProjects:
+				recentProjects.remove(path)
+			if action == "add":
+				recentProjects = [path] + recentProjects
+			elif action == "remove" and path in recentProjects:
+				recentProjects.remove(path)
 
-		for i in rProjects:
-			if self.getConfig('recent_projects', i) is not None:
-				prjName = self.getConfig('recent_projects', i)
-				if prjName != "":
-					recentProjects.append(self.fixPath(prjName))
-
-		if path in recentProjects:
-			recentProjects.remove(path)
-		if action == "add":
-			recentProjects = [path] + recentProjects
-		elif action == "remove" and path in recentProjects:
-			recentProjects.remove(path)
-
-		userConfig.remove_section("recent_projects")
-		with open(self.userini, 'w') as inifile:
-			userConfig.write(inifile)
-
-		for idx, i in enumerate(recentProjects):
-			self.setConfig('recent_projects', "recent" + str(idx+1), i)
+			userConfig.remove_section("recent_projects")
+			userConfig.add_section("recent_projects")
+			for idx, i in enumerate(recentProjects):
+				userConfig.set('recent_projects', "recent" + str(idx+1), i)
 
 
 	@err_decorator
@@ -1259,6 +1289,7 @@ class PrismCore():
 	@err_decorator
 	def closeSM(self, restart=False):
 		if hasattr(self, "sm"):
+			self.sm.flushStates()
 			self.sm.saveEnabled = False
 			if self.sm.isVisible():
 				self.sm.close()
@@ -1426,21 +1457,18 @@ class PrismCore():
 	@err_decorator
 	def integrationRemoved(self, appName, path):
 		path = self.fixPath(path)
-		options = self.getConfig(configPath=self.installLocPath, cat=appName, getItems=True)
-		cData = []
-		for i in options:
-			cData.append([appName, i[0], ""])
-
-		self.setConfig(configPath=self.installLocPath, data=cData, delete=True)
-
-		cData = []
-		for idx, i in enumerate(options):
-			if self.fixPath(i[1]) == path:
-				continue
-
-			cData.append([appName, "%02d" % (idx+1), i[1]])
+		with self.configTransaction(self.installLocPath) as installConfig:
+			options = []
+			if installConfig.has_section(appName):
+				options = installConfig.items(appName, raw=True)
+				installConfig.remove_section(appName)
+
+			installConfig.add_section(appName)
+			for idx, i in enumerate(options):
+				if self.fixPath(i[1]) == path:
+					continue
 
-		self.setConfig(configPath=self.installLocPath, data=cData)
+				installConfig.set(appName, "%02d" % (idx+1), i[1])
 
 
 	@err_decorator
@@ -1599,15 +1627,13 @@ class PrismCore():
 
 
 	@err_decorator
-	def getConfig(self, cat=None, param=None, ptype="string", data=None, configPath=None, getOptions=False, getItems=False, getConf=False):
-		if configPath is None:
-			configPath = self.userini
-
-		if configPath is None or configPath == "":
-			return
-
+	def readConfig(self, configPath, resetMsg=False):
 		isUserIni = configPath == self.userini
 
+		userConfig = self.configCache.getCached(configPath)
+		if userConfig is not None:
+			return userConfig
+
 		if isUserIni and not os.path.exists(configPath):
 			self.createUserPrefs()
 
@@ -1617,13 +1643,13 @@ class PrismCore():
 		if len([x for x in os.listdir(os.path.dirname(configPath)) if x.startswith(os.path.basename(configPath) + ".bak")]):
 			self.restoreConfig(configPath)
 
-		userConfig = ConfigParser()
 		try:
-			if os.path.exists(configPath):
-				userConfig.read(configPath)
+			userConfig = self.configCache.load(configPath)
 		except:
 			if isUserIni:
 				warnStr = "The Prism preferences file seems to be corrupt.\n\nIt will be reset, which means all local Prism settings will fall back to their defaults.\nYou will need to set your last project again, but no project files (like scenefiles or renderings) are lost."
+			elif resetMsg:
+				warnStr = "Cannot read the following file. It will be reset now:\n\n%s" % configPath
 			else:
 				warnStr = "Cannot read the following file:\n\n%s" % configPath
 
@@ -1631,12 +1657,28 @@ class PrismCore():
 			msg.setFocus()
 			action = msg.exec_()
 
+			userConfig = ConfigParser()
 			if isUserIni:
 				self.createUserPrefs()
-				userConfig.read(configPath)
+				userConfig = self.configCache.load(configPath)
+
+		return userConfig
+
+
+	@err_decorator
+	def getConfig(self, cat=None, param=None, ptype="string", data=None, configPath=None, getOptions=False, getItems=False, getConf=False):
+		if configPath is None:
+			configPath = self.userini
+
+		if configPath is None or configPath == "":
+			return
+
+		userConfig = self.readConfig(configPath)
+		if userConfig is None:
+			return
 
 		if getConf:
-			return userConfig
+			return self.configCache.copyConfig(userConfig)
 
 		if getOptions:
 			if userConfig.has_section(cat):
@@ -1699,32 +1741,11 @@ class PrismCore():
 		if configPath is None:
 			configPath = self.userini
 
-		isUserIni = configPath == self.userini
-
-		if isUserIni and not os.path.exists(configPath):
-			self.createUserPrefs()
-
-		fcontent = os.listdir(os.path.dirname(configPath))
-		if len([x for x in fcontent if x.startswith(os.path.basename(configPath) + ".bak")]):
-			self.restoreConfig(configPath)
-
-		userConfig = ConfigParser()
-		try:
-			if os.path.exists(configPath):
-				userConfig.read(configPath)
-		except:
-			if isUserIni:
-				warnStr = "The Prism preferences file seems to be corrupt.\n\nIt will be reset, which means all local Prism settings will fall back to their defaults.\nYou will need to set your last project again, but no project files (like scenefiles or renderings) are lost."
-			else:
-				warnStr = "Cannot read the following file. It will be reset now:\n\n%s" % configPath
-
-			msg = QMessageBox(QMessageBox.Warning, "Warning", warnStr, QMessageBox.Ok, parent=self.messageParent)
-			msg.setFocus()
-			action = msg.exec_()
+		userConfig = self.readConfig(configPath, resetMsg=True)
+		if userConfig is None:
+			return
 
-			if isUserIni:
-				self.createUserPrefs()
-				userConfig.read(configPath)
+		userConfig = self.configCache.copyConfig(userConfig)
 
 		if data is None:
 			data = [[cat, param, val]]
@@ -1746,20 +1767,26 @@ class PrismCore():
 			except UnicodeEncodeError:
 				QMessageBox.warning(self.messageParent, "Save config", "Cannot save setting because it contains illegal characters:\n\n%s   -   %s" % (param, unicode(val)), QMessageBox.Ok)
 
-		with open(configPath, 'w') as inifile:
-			userConfig.write(inifile)
+		self.configCache.write(configPath, userConfig)
 
-		testConfig = ConfigParser()
-		try:
-			testConfig.read(configPath)
-			for i in userConfig.sections():
-				for k in userConfig.options(i):
-					if not testConfig.has_option(i,k):
-						raise ConfigParser.Error
-		except:
-			backupPath = configPath + ".bak" + str(random.randint(1000000,9999999))
-			with open(backupPath, 'w') as inifile:
-				userConfig.write(inifile)
+
+	# loads the config once and writes all changes, which were made inside the with-block, in a single write
+	@contextmanager
+	def configTransaction(self, configPath=None):
+		if configPath is None:
+			configPath = self.userini
+
+		userConfig = self.readConfig(configPath, resetMsg=True)
+		if userConfig is None:
+			userConfig = ConfigParser()
+
+		origData = self.configCache.getData(userConfig)
+		userConfig = self.configCache.copyConfig(userConfig)
+
+		yield userConfig
+
+		if self.configCache.getData(userConfig) != origData:
+			self.configCache.write(configPath, userConfig)
 
 
 	@err_decorator
@@ -1808,6 +1835,7 @@ class PrismCore():
 
 		try:
 			shutil.copy2(validBuPath, configPath)
+			self.configCache.invalidate(configPath)
 		except:
 			msg = QMessageBox(QMessageBox.Warning, "Restore config", "Could not restore backup config:\n\n%s" % validBuPath, QMessageBox.Ok)
 			msg.setFocus()
@@ -1909,17 +1937,27 @@ class PrismCore():
 	def getScenefiles(self, latestOnly=True, getAssets=True, getShots=True, localScenes=True, apps=[]):
 		scenes = []
 
-		sceneDirs = []
+		entityDirs = []
 		sceneDirName = self.getConfig('paths', "scenes", configPath=self.prismIni)
 		if getAssets:
-			sceneDirs.append(os.path.join(self.projectPath, sceneDirName, "Assets"))
-			if localScenes and self.useLocalFiles and not latestOnly:
-				sceneDirs.append(os.path.join(self.localProjectPath, sceneDirName, "Assets"))
+			aBasePath = os.path.join(self.projectPath, sceneDirName, "Assets")
+			entityDirs.append(aBasePath)
+			entityDirs += self.getAssetPaths()
 
 		if getShots:
-			sceneDirs.append(os.path.join(self.projectPath, sceneDirName, "Shots"))
+			sBasePath = os.path.join(self.projectPath, sceneDirName, "Shots")
+			shotNames = self.projectIndex.getDirs(sBasePath)
 			if localScenes and self.useLocalFiles and not latestOnly:
-				sceneDirs.append(os.path.join(self.localProjectPath, sceneDirName, "Shots"))
+				shotNames += [x for x in self.projectIndex.getDirs(sBasePath.replace(self.projectPath, self.localProjectPath)) if x not in shotNames]
+
+			entityDirs += [os.path.join(sBasePath, x) for x in shotNames]
+
+		# only the Scenefiles folders of the entities get walked, so the Export and Rendering trees are skipped
+		sceneDirs = []
+		for i in entityDirs:
+			sceneDirs.append(os.path.join(i, "Scenefiles"))
+			if localScenes and self.useLocalFiles and not latestOnly:
+				sceneDirs.append(os.path.join(i.replace(self.projectPath, self.localProjectPath), "Scenefiles"))
 
 		fileTypes = []
 		for app in apps:
@@ -1927,8 +1965,9 @@ class PrismCore():
 			if ftypes:
 				fileTypes += ftypes
 
+		crawler = AssetCrawler.AssetCrawler(index=self.projectIndex)
 		for bPath in sceneDirs:
-			for fcont in os.walk(bPath):
+			for fcont in crawler.walk(bPath):
 				if "/Scenefiles/" not in fcont[0].replace("\\", "/"):
 					continue
 
@@ -1968,34 +2007,13 @@ class PrismCore():
 		elif scenetype == "Shot":
 			numvers = 4
 
-		files = []
 		if self.useLocalFiles and localVersions:
 			dstname = dstname.replace(self.localProjectPath, self.projectPath)
+			paths = [dstname, dstname.replace(self.projectPath, self.localProjectPath)]
+		else:
+			paths = [dstname]
 
-		for i in os.walk(dstname):
-			files += [os.path.join(i[0], x) for x in i[2]]
-			break
-
-		if self.useLocalFiles and localVersions:
-			for i in os.walk(dstname.replace(self.projectPath, self.localProjectPath)):
-				files += [os.path.join(i[0], x) for x in i[2]]
-				break
-
-		highversion = [0, ""]
-		for i in files:
-			if fileTypes != "*" and os.path.splitext(i)[1] not in fileTypes:
-				continue
-
-			fname = os.path.basename(i).split(self.filenameSeperator)
-
-			if (len(fname) == 8 or len(fname) == 6):
-				try:
-					version = int(fname[numvers][-4:])
-				except:
-					continue
-
-				if version > highversion[0]:
-					highversion = [version, i]
+		highversion = self.versionCache.getHighestSceneVersion(paths, numvers, fileTypes=fileTypes, separator=self.filenameSeperator)
 
 		if getExistingPath:
 			return highversion[1]
@@ -2005,43 +2023,13 @@ class PrismCore():
 
 	@err_decorator
 	def getHighestTaskVersion(self, dstname, getExisting=False, ignoreEmpty=False):
-		taskDirs = []
 		if self.useLocalFiles:
 			dstname = dstname.replace(self.localProjectPath, self.projectPath)
+			paths = [dstname, dstname.replace(self.projectPath, self.localProjectPath)]
+		else:
+			paths = [dstname]
 
-		for i in os.walk(dstname):
-			if ignoreEmpty:
-				for k in i[1]:
-					exFiles = os.listdir(os.path.join(i[0], k))
-					if len(exFiles) > 1 or (len(exFiles) == 1 and exFiles[0] != "versioninfo.ini"):
-						taskDirs.append(k)
-			else:
-				taskDirs += i[1]
-			break
-
-		if self.useLocalFiles:
-			for i in os.walk(dstname.replace(self.projectPath, self.localProjectPath)):
-				if ignoreEmpty:
-					for k in i[1]:
-						exFiles = os.listdir(os.path.join(i[0], k))
-						if len(exFiles) > 1 or (len(exFiles) == 1 and exFiles[0] != "versioninfo.ini"):
-							taskDirs.append(k)
-				else:
-					taskDirs += i[1]
-				break
-
-		highversion = 0
-		for i in taskDirs:
-			fname = i.split(self.filenameSeperator)
-
-			if len(fname) in [1,2,3]:
-				try:
-					version = int(fname[0][1:5])
-				except:
-					continue
-
-				if version > highversion:
-					highversion = version
+		highversion = self.versionCache.getHighestTaskVersion(paths, ignoreEmpty=ignoreEmpty, separator=self.filenameSeperator)[0]
 
 		if not getExisting and not self.separateOutputVersionStack:
 			fileName = self.getCurrentFileName()
@@ -2160,79 +2148,37 @@ class PrismCore():
 
 
 	@err_decorator
-	def getAssetPaths(self):
+	def getAssetTree(self):
 		aBasePath = os.path.join(self.projectPath, self.getConfig('paths', "scenes", configPath=self.prismIni), "Assets")
 
-		dirs = []
-
-		for i in os.walk(aBasePath):
-			for k in i[1]:
-				if k in ["Export", "Playblasts", "Rendering", "Scenefiles"]:
-					continue
-				dirs.append(os.path.join(i[0], k))
-			break
-
+		basePaths = [aBasePath]
 		if self.useLocalFiles:
-			lBasePath = aBasePath.replace(self.projectPath, self.localProjectPath)
+			basePaths.append(aBasePath.replace(self.projectPath, self.localProjectPath))
 
-			for i in os.walk(lBasePath):
-				for k in i[1]:
-					if k in ["Export", "Playblasts", "Rendering", "Scenefiles"]:
-						continue
+		return AssetCrawler.AssetCrawler(index=self.projectIndex).crawl(basePaths)
 
-					ldir = os.path.join(i[0], k)
-					if ldir.replace(self.localProjectPath, self.projectPath) not in dirs:
-						dirs.append(ldir)
-				break
 
+	@err_decorator
+	def getAssetPaths(self):
+		aBasePath = os.path.join(self.projectPath, self.getConfig('paths', "scenes", configPath=self.prismIni), "Assets")
 
-		assetPaths = []
-		for path in dirs:
-			val = os.path.basename(path)
-			if path == aBasePath or (self.useLocalFiles and path == lBasePath):
-				if aBasePath not in assetPaths:
-					assetPaths.append(aBasePath)
-			else:
-				assetPaths += self.refreshAItem(path)
-
-		return assetPaths
+		crawler = AssetCrawler.AssetCrawler(index=self.projectIndex)
+		return [os.path.join(aBasePath, x["relPath"]) for x in crawler.getAssetNodes(self.getAssetTree())]
 
 
 	@err_decorator
 	def refreshAItem(self, path):
 		self.adclick = False
 
+		basePaths = [path]
 		if self.useLocalFiles:
 			path = path.replace(self.localProjectPath, self.projectPath)
-			lpath = path.replace(self.projectPath, self.localProjectPath)
+			basePaths = [path, path.replace(self.projectPath, self.localProjectPath)]
 
-		dirContent = []
-		dirContentPaths = []
+		crawler = AssetCrawler.AssetCrawler(index=self.projectIndex)
+		tree = crawler.crawl(basePaths, isBase=False)
 
-		if os.path.exists(path):
-			dirContent += os.listdir(path)
-			dirContentPaths += [os.path.join(path,x) for x in os.listdir(path)]
-
-		if self.useLocalFiles and os.path.exists(lpath):
-			dirContent += os.listdir(lpath)
-			dirContentPaths += [os.path.join(lpath,x) for x in os.listdir(lpath)]
-
-		isAsset = False
-		if "Export" in dirContent and "Playblasts" in dirContent and "Rendering" in dirContent and "Scenefiles" in dirContent:
-			isAsset = True
-			return [path]
-		else:
-			childs = []
-			assetPaths = []
-			for i in dirContentPaths:
-				if os.path.isdir(i):
-					if os.path.basename(i) not in childs:
-						childs.append(os.path.basename(i))
-						assetPaths += self.refreshAItem(i)
-
-			return assetPaths
-
-		return []
+		return [os.path.join(path, x["relPath"]) if x["relPath"] else path for x in crawler.getAssetNodes(tree)]
 
 
 	@err_decorator
@@ -2300,7 +2246,13 @@ class PrismCore():
 
 		self.callback(name="onAboutToSaveFile", types=["custom"], args=[self, filepath])
 
+		# all states are read again before the scene is saved, in case the scene changed without a state signal
+		if hasattr(self, "sm"):
+			self.sm.allStatesDirty = True
+			self.sm.flushStates()
+
 		result = self.appPlugin.saveScene(self, filepath, details)
+		self.projectIndex.invalidate(os.path.dirname(filepath))
 		if len(details) > 0:
 			ymlPath = os.path.splitext(filepath)[0] + "info.yml"
 			self.writeYaml(path=ymlPath, data=details)
@@ -2440,20 +2392,27 @@ class PrismCore():
 
 	@err_decorator
 	def addToRecent(self,filepath):
-		recentfiles = []
 		rSection = 'recent_files_' + self.projectName
-		for i in range(10):
-			recentfiles.append(self.getConfig(rSection, "recent" + "%02d" % (i+1)))
-		if filepath in recentfiles:
-			recentfiles.remove(filepath)
-		recentfiles = [filepath] + recentfiles
-		if len(recentfiles) > 10:
-			recentfiles = recentfiles[:10]
-		for i in range(10):
-			if i < len(recentfiles):
-				self.setConfig(rSection, "recent" + "%02d" % (i+1), recentfiles[i])
-			else:
-				self.setConfig(rSection, "recent" + "%02d" % (i+1), "")
+		with self.configTransaction() as userConfig:
+			if not userConfig.has_section(rSection):
+				userConfig.add_section(rSection)
+
+			recentfiles = []
+			for i in range(10):
+				if userConfig.has_option(rSection, "recent" + "%02d" % (i+1)):
+					recentfiles.append(userConfig.get(rSection, "recent" + "%02d" % (i+1)))
+				else:
+					recentfiles.append("")
+			if filepath in recentfiles:
+				recentfiles.remove(filepath)
+			recentfiles = [filepath] + recentfiles
+			if len(recentfiles) > 10:
+				recentfiles = recentfiles[:10]
+			for i in range(10):
+				if i < len(recentfiles):
+					userConfig.set(rSection, "recent" + "%02d" % (i+1), recentfiles[i])
+				else:
+					userConfig.set(rSection, "recent" + "%02d" % (i+1), "")
 
 
 	@err_decorator
@@ -2570,6 +2529,7 @@ class PrismCore():
 	@err_decorator
 	def sceneUnload(self, arg=None): #callback function
 		if hasattr(self, "sm"):
+			self.sm.saveEnabled = False
 			self.sm.close()
 			del self.sm
 
@@ -2584,6 +2544,9 @@ class PrismCore():
 
 		self.appPlugin.sceneOpen(self)
 
+		if hasattr(self, "sm"):
+			self.sm.updateImportStates()
+
 		self.checkImportVersions()
 		self.checkFramerange()
 		self.checkFPS()
@@ -2615,27 +2578,12 @@ class PrismCore():
 		msgString = "For the following imports there is a newer version available:\n\n"
 		updates = 0
 
-		for i in paths:
-			if not os.path.exists(os.path.dirname(i[0])):
-				continue
+		versions = self.getImportVersions([x[0] for x in paths])
 
-			versionData = os.path.dirname(os.path.dirname(i[0])).rsplit(os.sep, 1)[1].split(self.filenameSeperator)
+		for idx, i in enumerate(paths):
+			curVersion, latestVersion, latestPath = versions[idx]
 
-			if len(versionData) != 3 or not self.getConfig('paths', "scenes", configPath=self.prismIni) in i[0]:
-				continue
-
-			curVersion = versionData[0] + self.filenameSeperator + versionData[1] + self.filenameSeperator + versionData[2]
-			latestVersion = None
-			for m in os.walk(os.path.dirname(os.path.dirname(os.path.dirname(i[0])))):
-				folders = m[1]
-				folders.sort()
-				for k in reversed(folders):
-					if len(k.split(self.filenameSeperator)) == 3 and k[0] == "v" and len(k.split(self.filenameSeperator)[0]) == 5 and len(os.listdir(os.path.join(m[0], k))) > 0:
-						latestVersion = k
-						break
-				break
-
-			if latestVersion is None or curVersion == latestVersion:
+			if curVersion is None or latestVersion is None or curVersion == latestVersion:
 				continue
 
 			msgString += "%s\n    current: %s\n    latest: %s\n\n" % (i[1], curVersion, latestVersion)
@@ -2648,6 +2596,39 @@ class PrismCore():
 				QMessageBox.information(self.messageParent, "State updates", msgString)
 
 
+	# resolves the current and the latest version of many imported files at once. Every task folder gets
+	# scanned only once per call. Returns [currentVersion, latestVersion, latestVersionPath] for every file,
+	# the values are None, if they couldn't be resolved.
+	@err_decorator
+	def getImportVersions(self, filepaths, unitFolders=None):
+		sceneDir = self.getConfig('paths', "scenes", configPath=self.prismIni)
+		latestVersions = {}
+		versions = []
+		for i in filepaths:
+			versionPath = os.path.dirname(i)
+			if os.path.basename(versionPath) in ["centimeter", "meter"]:
+				versionPath = os.path.dirname(versionPath)
+
+			versionData = os.path.basename(versionPath).split(self.filenameSeperator)
+			if sceneDir is None or len(versionData) != 3 or sceneDir not in i:
+				versions.append([None, None, None])
+				continue
+
+			taskPath = os.path.dirname(versionPath)
+			if taskPath not in latestVersions:
+				latestVersions[taskPath] = self.versionCache.getLatestExportVersion(taskPath, unitFolders=unitFolders, separator=self.filenameSeperator)
+
+			latestVersion = latestVersions[taskPath]
+			if latestVersion is None:
+				latestPath = None
+			else:
+				latestPath = os.path.join(taskPath, latestVersion).replace("\\", "/")
+
+			versions.append([self.filenameSeperator.join(versionData), latestVersion, latestPath])
+
+		return versions
+
+
 	def checkFramerange(self):
 		if self.getConfig('paths', "scenes", configPath=self.prismIni) is None:
 			return
@@ -2823,7 +2804,7 @@ current project.\n\nYour current version: %s\nVersion configured in project: %s\
 		latestVersion = self.getHighestTaskVersion(taskPath, getExisting=True, ignoreEmpty=True)
 
 		newPath = ""
-		for k in os.listdir(taskPath):
+		for k in self.projectIndex.getDirs(taskPath):
 			if k.startswith(latestVersion):
 				newPath = os.path.join(taskPath, k, passName)
 				break
@@ -2894,44 +2875,62 @@ current project.\n\nYour current version: %s\nVersion configured in project: %s\
 
 
 	@err_decorator
-	def convertMedia(self, inputpath, startNum, outputpath):
+	def getFfmpegPath(self, title="Video conversion"):
+		ffmpegPath = TranscodeQueue.findFfmpeg(self.prismRoot)
+		if ffmpegPath is None and title is not None:
+			QMessageBox.critical(self.messageParent, title, "Could not find ffmpeg. Searched in %s and in the PATH." % os.path.join(self.prismRoot, "PrismFiles", "Tools"))
+
+		return ffmpegPath
+
+
+	@err_decorator
+	def getTranscodeQueue(self):
+		if self.transcodeQueue is None:
+			workers = self.getConfig("globals", "transcode_workers", ptype="int")
+			if workers is None or workers < 1:
+				workers = 2
+
+			self.transcodeQueue = TranscodeQueue.TranscodeQueue(maxWorkers=workers)
+
+		return self.transcodeQueue
+
+
+	# returns the snapshot of the current publish or scans the scene, if no publish is running
+	@err_decorator
+	def getSceneReferences(self, origin=None):
+		if self.sceneReferences is not None:
+			return self.sceneReferences
+
+		return SceneReferences.SceneReferences(self, origin or self)
+
+
+	# with background=True the job id is returned and onFinished gets called with the ffmpeg output, when the conversion is done
+	@err_decorator
+	def convertMedia(self, inputpath, startNum, outputpath, background=False, onFinished=None, onProgress=None, priority=0, frameCount=None):
 		inputpath = inputpath.replace("\\", "/")
 		inputExt = os.path.splitext(inputpath)[1]
 		videoInput = inputExt in [".mp4", ".mov"]
 		startNum = str(startNum)
 
-		ffmpegIsInstalled = False
-		if platform.system() == "Windows":
-			ffmpegPath = os.path.join(self.prismRoot, "PrismFiles", "Tools", "FFmpeg" ,"bin", "ffmpeg.exe")
-			if os.path.exists(ffmpegPath):
-				ffmpegIsInstalled = True
-		elif platform.system() == "Linux":
-			# ffmpegPath = "ffmpeg"
-			ffmpegPath = os.path.join(self.prismRoot, "PrismFiles", "Tools", "FFmpeg", "bin", "ffmpeg.exe")
-			try:
-				subprocess.Popen([ffmpegPath])
-				ffmpegIsInstalled = True
-			except:
-				pass
-		elif platform.system() == "Darwin":
-			ffmpegPath = os.path.join(self.prismRoot, "PrismFiles", "Tools", "ffmpeg")
-			if os.path.exists(ffmpegPath):
-				ffmpegIsInstalled = True
-
-		if not ffmpegIsInstalled:
-			QMessageBox.critical(self.messageParent, "Video conversion", "Could not find %s" % ffmpegPath)
+		ffmpegPath = self.getFfmpegPath()
+		if ffmpegPath is None:
 			return
 
 		if not os.path.exists(os.path.dirname(outputpath)):
 			os.makedirs(os.path.dirname(outputpath))
 
 		if videoInput:
-			nProc = subprocess.Popen([ffmpegPath, "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", "-start_number", startNum, outputpath, "-y"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+			args = [ffmpegPath, "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuv420p", "-start_number", startNum, outputpath, "-y"]
 		else:
-			nProc = subprocess.Popen([ffmpegPath, "-start_number", startNum, "-framerate", "24", "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuva420p", "-start_number", startNum, outputpath, "-y"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-		result = nProc.communicate()
+			args = [ffmpegPath, "-start_number", startNum, "-framerate", "24", "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuva420p", "-start_number", startNum, outputpath, "-y"]
+
+		queue = self.getTranscodeQueue()
+		outputFile = None if "%" in outputpath else outputpath
+		jobId = queue.submit(args, outputPath=outputFile, priority=priority, frameCount=frameCount, onFinished=onFinished, onProgress=onProgress)
+		if background:
+			return jobId
 
-		return result
+		return queue.wait([jobId])[0]
 
 
 	@err_decorator
@@ -2955,7 +2954,8 @@ current project.\n\nYour current version: %s\nVersion configured in project: %s\
 			if depsEnabled is None:
 				self.setConfig('globals', "track_dependencies", val="True", configPath=self.prismIni)
 
-			deps = self.appPlugin.getImportPaths(self)
+			sceneRefs = self.getSceneReferences()
+			deps = sceneRefs.importPaths
 
 			if deps == False:
 				deps = "[]"
@@ -2963,8 +2963,7 @@ current project.\n\nYour current version: %s\nVersion configured in project: %s\
 			deps = eval(deps.replace("\\", "/").replace("//", "/"))
 			deps = str([str(x[0]) for x in deps])
 
-			extFiles =  getattr(self.appPlugin, "sm_getExternalFiles", lambda x: [[],[]])(self)[0]
-			extFiles = str(list(set(extFiles)))
+			extFiles = str(list(set(sceneRefs.externalFiles)))
 
 			data["Dependencies"] = deps
 			data["External files"] = extFiles
@@ -305,19 +305,12 @@ class PrismSettings(QDialog, PrismSettings_ui.Ui_dlg_PrismSettings):
 				existingPaths.append(self.integrationPlugins[prog]["lw"].item(i).text())
 
 			installConfigPath = os.path.join(os.path.dirname(self.core.userini), "installLocations.ini")
-			options = self.core.getConfig(cat=prog, configPath=installConfigPath, getOptions=True)
-			cData = []
-			for i in options:
-				cData.append([prog, i, ""])
-
-			self.core.setConfig(configPath=installConfigPath, data=cData, delete=True)
-
 			existingPaths.pop(self.integrationPlugins[prog]["lw"].currentRow())
-			cData = []
-			for idx, i in enumerate(existingPaths):
-				cData.append([prog, "%02d" % idx, i])
-
-			self.core.setConfig(configPath=installConfigPath, data=cData)
+			with self.core.configTransaction(installConfigPath) as installConfig:
+				installConfig.remove_section(prog)
+				installConfig.add_section(prog)
+				for idx, i in enumerate(existingPaths):
+					installConfig.set(prog, "%02d" % idx, i)
 			self.refreshIntegrations()
 
 
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+
+try:
+	from os import scandir
+except ImportError:
+	try:
+		from scandir import scandir
+	except ImportError:
+		scandir = None
+
+
+# Discovers the assets of a project in a single traversal. The global and the local asset folders are
+# crawled together, so every relative folder is visited once and the listings of both trees get merged.
+# The traversal stops at asset folders, which are folders containing Export, Playblasts, Rendering and Scenefiles.
+# The result is a tree of nodes:
+# {"name": str, "relPath": str, "paths": [existing folders], "type": "Folder"/"Asset", "dirs": [subfolder names], "children": [nodes]}
+class AssetCrawler(object):
+	assetFolders = ["Export", "Playblasts", "Rendering", "Scenefiles"]
+
+	def __init__(self, index=None):
+		self.index = index
+
+
+	# returns the names of the subfolders of path or None, if path doesn't exist
+	def listDirs(self, path):
+		if self.index is not None:
+			entry = self.index.getEntry(path)
+			if entry is None:
+				return None
+
+			return list(entry["dirs"])
+
+		try:
+			if scandir is not None:
+				dirs = []
+				for entry in scandir(path):
+					try:
+						if entry.is_dir():
+							dirs.append(entry.name)
+					except OSError:
+						continue
+
+				return dirs
+			else:
+				return [x for x in os.listdir(path) if os.path.isdir(os.path.join(path, x))]
+		except OSError:
+			return None
+
+
+	# basePaths are the global and local versions of the same folder. If isBase is True, the folder is
+	# the asset base folder, which is never an asset itself.
+	def crawl(self, basePaths, isBase=True):
+		root = {"name": os.path.basename(basePaths[0]), "relPath": "", "paths": [], "type": "Folder", "dirs": [], "children": []}
+		self.crawlNode(root, basePaths, isRoot=isBase)
+		if self.index is not None:
+			self.index.commit()
+
+		return root
+
+
+	def crawlNode(self, node, basePaths, isRoot=False):
+		dirs = []
+		for base in basePaths:
+			path = os.path.join(base, node["relPath"]) if node["relPath"] else base
+			content = self.listDirs(path)
+			if content is None:
+				continue
+
+			node["paths"].append(path)
+			for i in content:
+				if i not in dirs:
+					dirs.append(i)
+
+		node["dirs"] = sorted(dirs)
+
+		if not isRoot and all([x in dirs for x in self.assetFolders]):
+			node["type"] = "Asset"
+			return
+
+		for i in node["dirs"]:
+			if isRoot and i in self.assetFolders:
+				continue
+
+			relPath = os.path.join(node["relPath"], i) if node["relPath"] else i
+			child = {"name": i, "relPath": relPath, "paths": [], "type": "Folder", "dirs": [], "children": []}
+			self.crawlNode(child, basePaths)
+			if child["paths"]:
+				node["children"].append(child)
+
+
+	def getAssetNodes(self, node):
+		if node["type"] == "Asset":
+			return [node]
+
+		assets = []
+		for i in node["children"]:
+			assets += self.getAssetNodes(i)
+
+		return assets
+
+
+	# like os.walk, but the listings are taken from the index, if one is available
+	def walk(self, path):
+		dirs = self.listDirs(path)
+		if dirs is None:
+			return
+
+		if self.index is not None:
+			files = self.index.getFiles(path)
+		else:
+			files = [x for x in os.listdir(path) if x not in dirs]
+
+		yield path, sorted(dirs), sorted(files)
+
+		for i in sorted(dirs):
+			for k in self.walk(os.path.join(path, i)):
+				yield k
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+try:
+	from PySide2.QtCore import *
+	psVersion = 2
+except:
+	from PySide.QtCore import *
+	psVersion = 1
+
+import threading, types, traceback
+
+
+class ScanJob(QRunnable):
+	def __init__(self, runner, channel, token, func, args):
+		QRunnable.__init__(self)
+		self.runner = runner
+		self.channel = channel
+		self.token = token
+		self.func = func
+		self.args = args
+
+
+	def run(self):
+		try:
+			result = self.func(*self.args)
+			if isinstance(result, types.GeneratorType):
+				for chunk in result:
+					if not self.runner.isCurrent(self.channel, self.token):
+						result.close()
+						return
+
+					self.runner.resultReady.emit([self.channel, self.token, "chunk", chunk])
+			else:
+				self.runner.resultReady.emit([self.channel, self.token, "chunk", result])
+		except Exception:
+			self.runner.resultReady.emit([self.channel, self.token, "error", traceback.format_exc()])
+			return
+
+		self.runner.resultReady.emit([self.channel, self.token, "finished", None])
+
+
+# Runs filesystem scans outside of the GUI thread. Every channel (for example "shots" or "tasks") has a
+# generation token. Starting a new scan or cancelling a channel increases the token, so results of
+# older scans are discarded and generator based scans stop at the next yielded chunk.
+class ScanRunner(QObject):
+	resultReady = Signal(object)
+
+	def __init__(self, maxThreads=2, errorHandler=None):
+		QObject.__init__(self)
+		self.tokens = {}
+		self.callbacks = {}
+		self.lock = threading.Lock()
+		self.errorHandler = errorHandler
+		self.pool = QThreadPool()
+		self.pool.setMaxThreadCount(maxThreads)
+		self.resultReady.connect(self.handleResult)
+
+
+	# func gets called with args in a worker thread. If it is a generator function, onChunk is called
+	# in the GUI thread for every yielded value, otherwise once with the return value.
+	def start(self, channel, func, args=[], onChunk=None, onFinished=None):
+		with self.lock:
+			token = self.tokens.get(channel, 0) + 1
+			self.tokens[channel] = token
+			self.callbacks[channel] = {"token": token, "onChunk": onChunk, "onFinished": onFinished}
+
+		self.pool.start(ScanJob(self, channel, token, func, args))
+		return token
+
+
+	def cancel(self, channel=None):
+		with self.lock:
+			if channel is None:
+				channels = list(self.tokens.keys())
+			else:
+				channels = [channel]
+
+			for i in channels:
+				self.tokens[i] = self.tokens.get(i, 0) + 1
+				self.callbacks.pop(i, None)
+
+
+	def isCurrent(self, channel, token):
+		with self.lock:
+			return self.tokens.get(channel) == token
+
+
+	def isRunning(self, channel):
+		with self.lock:
+			return channel in self.callbacks
+
+
+	def handleResult(self, data):
+		channel, token, rtype, result = data
+		with self.lock:
+			callbacks = self.callbacks.get(channel)
+			if callbacks is None or callbacks["token"] != token:
+				return
+
+			if rtype != "chunk":
+				self.callbacks.pop(channel, None)
+
+		if rtype == "chunk":
+			if callbacks["onChunk"] is not None:
+				callbacks["onChunk"](result)
+		elif rtype == "finished":
+			if callbacks["onFinished"] is not None:
+				callbacks["onFinished"]()
+		elif rtype == "error":
+			if self.errorHandler is not None:
+				self.errorHandler(result)
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import sys, os, threading, random, stat, time
+
+if sys.version[0] == "3":
+	from configparser import ConfigParser, RawConfigParser
+else:
+	from ConfigParser import ConfigParser, RawConfigParser
+
+
+# Process-wide cache of parsed ini files. Entries are validated by the (mtime, size) of the file,
+# so a lookup only costs a single stat call as long as the file wasn't changed on disk.
+class ConfigCache(object):
+	def __init__(self):
+		self.entries = {}
+		self.lock = threading.RLock()
+		# files, which were modified within this amount of seconds, are read again, because a second change
+		# in the same mtime tick with the same size wouldn't be detected
+		self.settleTime = 2
+
+
+	def getKey(self, path):
+		return os.path.normcase(os.path.abspath(path))
+
+
+	def getStamp(self, path):
+		try:
+			st = os.stat(path)
+		except OSError:
+			return None
+
+		return (st.st_mtime, st.st_size)
+
+
+	# returns the cached config if it is still valid, otherwise None
+	def getCached(self, path, stamp=None):
+		if stamp is None:
+			stamp = self.getStamp(path)
+
+		if stamp is None or (time.time() - stamp[0]) < self.settleTime:
+			return None
+
+		with self.lock:
+			entry = self.entries.get(self.getKey(path))
+
+		if entry is None or entry["stamp"] != stamp:
+			return None
+
+		return entry["config"]
+
+
+	# parses the file and stores it in the cache. Parsing errors are raised to the caller.
+	def load(self, path):
+		stamp = self.getStamp(path)
+		config = ConfigParser()
+		if stamp is None:
+			return config
+
+		config.read(path)
+
+		with self.lock:
+			self.entries[self.getKey(path)] = {"stamp": stamp, "config": config}
+
+		return config
+
+
+	def getConfig(self, path):
+		config = self.getCached(path)
+		if config is None:
+			config = self.load(path)
+
+		return config
+
+
+	def copyConfig(self, config):
+		newConfig = ConfigParser()
+		for section in config.sections():
+			newConfig.add_section(section)
+			for option in config.options(section):
+				RawConfigParser.set(newConfig, section, option, config.get(section, option, raw=True))
+
+		return newConfig
+
+
+	def getData(self, config):
+		data = {}
+		for section in config.sections():
+			data[section] = dict(config.items(section, raw=True))
+
+		return data
+
+
+	# writes the config to a temporary file next to the target and renames it afterwards,
+	# so readers never see a partially written file. If that fails, the config is written to a .bak file,
+	# which is restored by PrismCore.restoreConfig on the next read.
+	def write(self, path, config):
+		tmpPath = os.path.join(os.path.dirname(path), "~%s.tmp%s" % (os.path.basename(path), random.randint(1000000, 9999999)))
+		prevStat = None
+		try:
+			prevStat = os.stat(path)
+		except OSError:
+			pass
+
+		try:
+			with open(tmpPath, "w") as inifile:
+				config.write(inifile)
+				inifile.flush()
+				os.fsync(inifile.fileno())
+
+			if prevStat is not None:
+				try:
+					os.chmod(tmpPath, stat.S_IMODE(prevStat.st_mode))
+				except OSError:
+					pass
+
+			if hasattr(os, "replace"):
+				os.replace(tmpPath, path)
+			else:
+				if os.name == "nt" and os.path.exists(path):
+					os.remove(path)
+				os.rename(tmpPath, path)
+		except:
+			if os.path.exists(tmpPath):
+				try:
+					os.remove(tmpPath)
+				except OSError:
+					pass
+			self.invalidate(path)
+			try:
+				with open(path + ".bak" + str(random.randint(1000000, 9999999)), "w") as inifile:
+					config.write(inifile)
+			except Exception:
+				pass
+			raise
+
+		stamp = self.getStamp(path)
+		with self.lock:
+			if stamp is None:
+				self.entries.pop(self.getKey(path), None)
+			else:
+				self.entries[self.getKey(path)] = {"stamp": stamp, "config": config}
+
+
+	def invalidate(self, path=None):
+		with self.lock:
+			if path is None:
+				self.entries = {}
+			else:
+				self.entries.pop(self.getKey(path), None)
+
+
+configCache = ConfigCache()
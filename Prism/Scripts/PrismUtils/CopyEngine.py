@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+try:
+	from PySide2.QtCore import *
+	psVersion = 2
+except:
+	from PySide.QtCore import *
+	psVersion = 1
+
+import os, sys, shutil, threading, json, time, traceback
+
+
+class CopyCanceled(Exception):
+	pass
+
+
+# copies the content of src to dst. The data is written to a temporary file first, so an interrupted
+# copy never leaves a file behind, which looks complete.
+def copyFile(src, dst, cancelEvent=None, bufferSize=8*1024*1024):
+	tmpPath = dst + ".prismpart"
+	try:
+		with open(src, "rb") as srcFile:
+			with open(tmpPath, "wb") as dstFile:
+				copied = False
+				if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+					try:
+						size = os.fstat(srcFile.fileno()).st_size
+						offset = 0
+						while offset < size:
+							if cancelEvent is not None and cancelEvent.is_set():
+								raise CopyCanceled()
+
+							sent = os.sendfile(dstFile.fileno(), srcFile.fileno(), offset, min(bufferSize, size - offset))
+							if sent == 0:
+								break
+
+							offset += sent
+
+						copied = offset == size
+					except OSError:
+						srcFile.seek(0)
+						dstFile.seek(0)
+						dstFile.truncate()
+
+				if not copied:
+					while True:
+						if cancelEvent is not None and cancelEvent.is_set():
+							raise CopyCanceled()
+
+						data = srcFile.read(bufferSize)
+						if not data:
+							break
+
+						dstFile.write(data)
+
+		shutil.copystat(src, tmpPath)
+
+		if hasattr(os, "replace"):
+			os.replace(tmpPath, dst)
+		else:
+			if os.path.exists(dst):
+				os.remove(dst)
+			os.rename(tmpPath, dst)
+	except:
+		if os.path.exists(tmpPath):
+			try:
+				os.remove(tmpPath)
+			except OSError:
+				pass
+		raise
+
+
+def isSameFile(src, dst):
+	try:
+		srcStat = os.stat(src)
+		dstStat = os.stat(dst)
+	except OSError:
+		return False
+
+	# some filesystems store the mtime with a precision of 1 or 2 seconds
+	return srcStat.st_size == dstStat.st_size and abs(srcStat.st_mtime - dstStat.st_mtime) <= 2
+
+
+class CopyJob(QRunnable):
+	def __init__(self, engine, src, dst):
+		QRunnable.__init__(self)
+		self.engine = engine
+		self.src = src
+		self.dst = dst
+
+
+	def run(self):
+		if self.engine.cancelEvent.is_set():
+			self.engine.fileFinished.emit([self.src, self.dst, "canceled", 0])
+			return
+
+		try:
+			if isSameFile(self.src, self.dst):
+				self.engine.fileFinished.emit([self.src, self.dst, "skipped", os.path.getsize(self.src)])
+				return
+
+			if not os.path.exists(os.path.dirname(self.dst)):
+				try:
+					os.makedirs(os.path.dirname(self.dst))
+				except OSError:
+					if not os.path.isdir(os.path.dirname(self.dst)):
+						raise
+
+			copyFile(self.src, self.dst, cancelEvent=self.engine.cancelEvent, bufferSize=self.engine.bufferSize)
+			self.engine.fileFinished.emit([self.src, self.dst, "copied", os.path.getsize(self.dst)])
+		except CopyCanceled:
+			self.engine.fileFinished.emit([self.src, self.dst, "canceled", 0])
+		except Exception:
+			self.engine.fileFinished.emit([self.src, self.dst, "failed", traceback.format_exc()])
+
+
+# Copies a list of files on a thread pool. progress gets emitted with [doneBytes, totalBytes, doneFiles, totalFiles]
+# and finished with a dict containing the copied, skipped and failed files. Files, which have the same size and
+# mtime at the destination, are skipped. If a manifestPath is given, the file list and the finished files are
+# stored in it, so that an interrupted copy can be continued with resume(). The manifest is removed, when all
+# files were copied successfully.
+class CopyEngine(QObject):
+	progress = Signal(object)
+	finished = Signal(object)
+	fileFinished = Signal(object)
+
+	def __init__(self, maxThreads=4, bufferSize=8*1024*1024):
+		QObject.__init__(self)
+		self.bufferSize = bufferSize
+		self.cancelEvent = threading.Event()
+		self.pool = QThreadPool()
+		self.pool.setMaxThreadCount(maxThreads)
+		self.fileFinished.connect(self.onFileFinished)
+		self.running = False
+		self.manifestPath = None
+		self.lastManifestSave = 0
+
+
+	def getSize(self, path):
+		try:
+			return os.path.getsize(path)
+		except OSError:
+			return 0
+
+
+	def loadManifest(self, manifestPath):
+		if not manifestPath or not os.path.exists(manifestPath):
+			return None
+
+		try:
+			with open(manifestPath, "r") as manifestFile:
+				return json.load(manifestFile)
+		except Exception:
+			return None
+
+
+	def saveManifest(self, force=False):
+		if not self.manifestPath or (not force and (time.time() - self.lastManifestSave) < 1):
+			return
+
+		self.lastManifestSave = time.time()
+		data = {"files": self.files, "done": sorted(self.done)}
+		try:
+			if not os.path.exists(os.path.dirname(self.manifestPath)):
+				os.makedirs(os.path.dirname(self.manifestPath))
+
+			with open(self.manifestPath + ".tmp", "w") as manifestFile:
+				json.dump(data, manifestFile)
+
+			if os.path.exists(self.manifestPath):
+				os.remove(self.manifestPath)
+			os.rename(self.manifestPath + ".tmp", self.manifestPath)
+		except Exception:
+			pass
+
+
+	# files is a list of [source, destination] pairs
+	def start(self, files, manifestPath=None):
+		if self.running:
+			return False
+
+		self.cancelEvent.clear()
+		self.manifestPath = manifestPath
+		self.files = [list(x) for x in files]
+		self.done = set()
+
+		manifest = self.loadManifest(manifestPath)
+		if manifest is not None:
+			knownFiles = set([tuple(x) for x in self.files])
+			for i in manifest.get("files", []):
+				if tuple(i) not in knownFiles:
+					self.files.append(i)
+					knownFiles.add(tuple(i))
+
+			# files, which were completed before the interruption, are only skipped if they still exist
+			self.done = set([x for x in manifest.get("done", []) if os.path.exists(x)])
+
+		self.result = {"copied": [], "skipped": [], "failed": [], "canceled": False}
+		self.totalBytes = sum([self.getSize(x[0]) for x in self.files])
+		self.doneBytes = 0
+		self.doneFiles = 0
+		self.running = True
+
+		self.saveManifest(force=True)
+
+		pending = []
+		for i in self.files:
+			if i[1] in self.done and isSameFile(i[0], i[1]):
+				self.result["skipped"].append(i[1])
+				self.doneBytes += self.getSize(i[0])
+				self.doneFiles += 1
+			else:
+				pending.append(i)
+
+		self.pendingFiles = len(pending)
+		self.progress.emit([self.doneBytes, self.totalBytes, self.doneFiles, len(self.files)])
+
+		if self.pendingFiles == 0:
+			self.finish()
+			return True
+
+		for i in pending:
+			self.pool.start(CopyJob(self, i[0], i[1]))
+
+		return True
+
+
+	def resume(self, manifestPath):
+		return self.start([], manifestPath=manifestPath)
+
+
+	# jobs, which didn't start yet, report back as canceled without copying anything
+	def cancel(self):
+		self.cancelEvent.set()
+
+
+	def isRunning(self):
+		return self.running
+
+
+	def waitForDone(self, msecs=-1):
+		return self.pool.waitForDone(msecs)
+
+
+	def onFileFinished(self, data):
+		if not self.running:
+			return
+
+		src, dst, state, info = data
+		if state in ["copied", "skipped"]:
+			self.result[state].append(dst)
+			self.done.add(dst)
+			self.doneBytes += info
+			self.doneFiles += 1
+		elif state == "failed":
+			self.result["failed"].append([src, info])
+		elif state == "canceled":
+			self.result["canceled"] = True
+
+		self.pendingFiles -= 1
+		self.saveManifest()
+		self.progress.emit([self.doneBytes, self.totalBytes, self.doneFiles, len(self.files)])
+
+		if self.pendingFiles <= 0:
+			self.finish()
+
+
+	def finish(self):
+		self.running = False
+		if self.cancelEvent.is_set():
+			self.result["canceled"] = True
+
+		if self.manifestPath:
+			if self.result["canceled"] or len(self.result["failed"]) > 0:
+				self.saveManifest(force=True)
+			elif os.path.exists(self.manifestPath):
+				try:
+					os.remove(self.manifestPath)
+				except OSError:
+					pass
+
+		self.finished.emit(self.result)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os, threading
+from multiprocessing.pool import ThreadPool
+
+
+# Builds the dependency graph of a versioninfo.ini lazily, when the children of a versioninfo are requested.
+# Every versioninfo gets parsed once and every dependency gets checked once, no matter how often it is referenced.
+# The file checks of the children of a versioninfo are done in parallel on a thread pool. Callers, which walk the
+# graph, have to check for versioninfos, which are already in their parent chain, to stop at cycles.
+class DependencyGraph(object):
+	def __init__(self, configCache, maxThreads=8):
+		self.configCache = configCache
+		self.maxThreads = maxThreads
+		self.infos = {}
+		self.entries = {}
+		self.lock = threading.Lock()
+
+
+	def getInfo(self, versionInfo):
+		with self.lock:
+			if versionInfo in self.infos:
+				return self.infos[versionInfo]
+
+		info = {"source": None, "deps": [], "extFiles": [], "error": False}
+		try:
+			config = self.configCache.getConfig(versionInfo)
+			if config.has_option("information", "source scene"):
+				info["source"] = config.get("information", "source scene")
+
+			deps = eval(config.get("information", "dependencies"))
+			if info["source"] is not None:
+				deps.append(info["source"])
+
+			info["deps"] = deps
+			info["extFiles"] = eval(config.get("information", "external files"))
+		except:
+			info = {"source": None, "deps": [], "extFiles": [], "error": True}
+
+		with self.lock:
+			self.infos[versionInfo] = info
+
+		return info
+
+
+	def getEntry(self, path, dType):
+		key = (path, dType == "File")
+		with self.lock:
+			if key in self.entries:
+				return self.entries[key]
+
+		statPath = path
+		infoPath = None
+		if dType != "File":
+			if not os.path.exists(path):
+				depDir = os.path.dirname(path)
+				try:
+					if os.path.exists(depDir) and len(os.listdir(depDir)) > 0:
+						statPath = depDir
+				except OSError:
+					pass
+
+			infoPath = os.path.join(os.path.dirname(path), "versioninfo.ini")
+			if not os.path.exists(infoPath):
+				infoPath = os.path.join(os.path.dirname(os.path.dirname(path)), "versioninfo.ini")
+				if not os.path.exists(infoPath):
+					infoPath = None
+
+		try:
+			mtime = os.path.getmtime(statPath)
+		except OSError:
+			mtime = None
+
+		entry = {"path": path, "type": dType, "exists": mtime is not None, "mtime": mtime, "infoPath": infoPath}
+		with self.lock:
+			self.entries[key] = entry
+
+		return entry
+
+
+	def getChildPaths(self, versionInfo):
+		info = self.getInfo(versionInfo)
+		childs = []
+		for i in info["deps"]:
+			if i == info["source"]:
+				childs.append([i, "Source Scene"])
+			else:
+				childs.append([i, "Export"])
+
+		for i in info["extFiles"]:
+			if i not in info["deps"]:
+				childs.append([i, "File"])
+
+		return childs
+
+
+	# returns the dependencies of a versioninfo as dicts with the keys path, type, exists, mtime and infoPath
+	def getChildren(self, versionInfo):
+		childs = self.getChildPaths(versionInfo)
+		with self.lock:
+			unchecked = len([x for x in childs if (x[0], x[1] == "File") not in self.entries])
+
+		if unchecked < 2:
+			return [self.getEntry(x[0], x[1]) for x in childs]
+
+		pool = ThreadPool(min(self.maxThreads, unchecked))
+		try:
+			return pool.map(lambda x: self.getEntry(x[0], x[1]), childs)
+		finally:
+			pool.close()
+			pool.join()
+
+
+	# drops the graph and the parsed versioninfos from the config cache, which would otherwise keep them
+	# for the lifetime of the process
+	def clear(self):
+		with self.lock:
+			infos = list(self.infos.keys())
+			self.infos = {}
+			self.entries = {}
+
+		for i in infos:
+			self.configCache.invalidate(i)
+
+
+	def hasError(self, versionInfo):
+		return self.getInfo(versionInfo)["error"]
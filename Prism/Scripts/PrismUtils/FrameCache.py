@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+try:
+	from PySide2.QtCore import *
+	from PySide2.QtGui import *
+	psVersion = 2
+except:
+	from PySide.QtCore import *
+	from PySide.QtGui import *
+	psVersion = 1
+
+import threading
+from collections import OrderedDict
+
+
+# LRU cache of decoded preview frames. The frames are stored as QImages, because QPixmaps can't be
+# created outside of the GUI thread.
+class FrameCache(object):
+	def __init__(self, maxBytes=256*1024*1024):
+		self.maxBytes = maxBytes
+		self.curBytes = 0
+		self.frames = OrderedDict()
+		self.lock = threading.Lock()
+
+
+	def getImageSize(self, img):
+		if hasattr(img, "sizeInBytes"):
+			return img.sizeInBytes()
+		else:
+			return img.byteCount()
+
+
+	def get(self, key):
+		with self.lock:
+			img = self.frames.pop(key, None)
+			if img is not None:
+				self.frames[key] = img
+
+		return img
+
+
+	def contains(self, key):
+		with self.lock:
+			return key in self.frames
+
+
+	def insert(self, key, img):
+		if img is None or img.isNull():
+			return
+
+		size = self.getImageSize(img)
+		with self.lock:
+			prevImg = self.frames.pop(key, None)
+			if prevImg is not None:
+				self.curBytes -= self.getImageSize(prevImg)
+
+			self.frames[key] = img
+			self.curBytes += size
+
+			while self.curBytes > self.maxBytes and len(self.frames) > 1:
+				oldKey, oldImg = self.frames.popitem(last=False)
+				self.curBytes -= self.getImageSize(oldImg)
+
+
+	def clear(self):
+		with self.lock:
+			self.frames = OrderedDict()
+			self.curBytes = 0
+
+
+class FrameDecodeJob(QRunnable):
+	def __init__(self, prefetcher, key, decodeFunc, args):
+		QRunnable.__init__(self)
+		self.prefetcher = prefetcher
+		self.key = key
+		self.decodeFunc = decodeFunc
+		self.args = args
+
+
+	def run(self):
+		try:
+			img = self.decodeFunc(*self.args)
+		except Exception:
+			img = None
+
+		self.prefetcher.jobFinished(self.key, img)
+
+
+# Decodes frames on a thread pool and stores them in a FrameCache. frameReady is emitted
+# (queued to the GUI thread) for every frame, which was added to the cache.
+class FramePrefetcher(QObject):
+	frameReady = Signal(object)
+
+	def __init__(self, cache, maxThreads=None):
+		QObject.__init__(self)
+		self.cache = cache
+		self.pending = set()
+		self.lock = threading.Lock()
+		self.pool = QThreadPool()
+		if maxThreads is None:
+			maxThreads = max(1, min(4, QThread.idealThreadCount() - 1))
+
+		self.pool.setMaxThreadCount(maxThreads)
+
+
+	def request(self, key, decodeFunc, *args):
+		with self.lock:
+			if key in self.pending or self.cache.contains(key):
+				return False
+
+			self.pending.add(key)
+
+		self.pool.start(FrameDecodeJob(self, key, decodeFunc, args))
+		return True
+
+
+	def isPending(self, key):
+		with self.lock:
+			return key in self.pending
+
+
+	def jobFinished(self, key, img):
+		self.cache.insert(key, img)
+		with self.lock:
+			self.pending.discard(key)
+
+		if img is not None:
+			self.frameReady.emit(key)
+
+
+	# removes all jobs, which didn't start yet. Running jobs finish and still fill the cache.
+	def cancelPending(self):
+		if hasattr(self.pool, "clear"):
+			self.pool.clear()
+
+		with self.lock:
+			self.pending = set()
+
+
+	def waitForDone(self, msecs=-1):
+		return self.pool.waitForDone(msecs)
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+
+import os, json, random, threading
+
+
+# Caches the static variables of the plugins, so that the plugins of other applications don't need to be
+# imported on startup. An entry is valid as long as the mtimes of the plugin scripts didn't change.
+class PluginManifest(object):
+	manifestVersion = 1
+	metaAttrs = ["version", "pluginName", "pluginType", "appShortName", "appType", "hasQtParent", "sceneFormats", "appSpecificFormats", "outputFormats", "appColor", "platforms", "preferredUnit"]
+
+	def __init__(self, cachePath):
+		self.cachePath = cachePath
+		self.entries = None
+		self.dirty = False
+		self.lock = threading.Lock()
+
+
+	def load(self):
+		if self.entries is not None:
+			return
+
+		self.entries = {}
+		if not os.path.exists(self.cachePath):
+			return
+
+		try:
+			with open(self.cachePath, "r") as f:
+				data = json.load(f)
+		except (OSError, IOError, ValueError):
+			return
+
+		if data.get("version") == self.manifestVersion:
+			self.entries = data.get("plugins", {})
+
+
+	def save(self):
+		with self.lock:
+			if not self.dirty:
+				return
+
+			data = {"version": self.manifestVersion, "plugins": self.entries}
+			self.dirty = False
+
+		tmpPath = self.cachePath + ".tmp%s" % random.randint(0, 1000000)
+		try:
+			if not os.path.exists(os.path.dirname(self.cachePath)):
+				os.makedirs(os.path.dirname(self.cachePath))
+
+			with open(tmpPath, "w") as f:
+				json.dump(data, f)
+
+			if hasattr(os, "replace"):
+				os.replace(tmpPath, self.cachePath)
+			else:
+				if os.path.exists(self.cachePath):
+					os.remove(self.cachePath)
+				os.rename(tmpPath, self.cachePath)
+		except (OSError, IOError):
+			if os.path.exists(tmpPath):
+				try:
+					os.remove(tmpPath)
+				except OSError:
+					pass
+
+
+	def getKey(self, scriptPath, moduleName):
+		return os.path.normcase(os.path.normpath(scriptPath)) + "|" + moduleName
+
+
+	# the mtime of the folder changes when modules are added or removed, the mtimes of the files when they are edited
+	def getSignature(self, scriptPath):
+		try:
+			mtimes = [os.path.getmtime(scriptPath)]
+			for i in sorted(os.listdir(scriptPath)):
+				if i.endswith(".py"):
+					mtimes.append(os.path.getmtime(os.path.join(scriptPath, i)))
+		except OSError:
+			return None
+
+		return mtimes
+
+
+	def getInfo(self, scriptPath, moduleName):
+		with self.lock:
+			self.load()
+			info = self.entries.get(self.getKey(scriptPath, moduleName))
+
+		if info is None or info["signature"] != self.getSignature(scriptPath):
+			return None
+
+		return info
+
+
+	def setInfo(self, scriptPath, moduleName, plugin):
+		data = {}
+		for i in self.metaAttrs:
+			if hasattr(plugin, i):
+				data[i] = getattr(plugin, i)
+
+		info = {"module": moduleName, "path": scriptPath, "signature": self.getSignature(scriptPath), "data": data, "attrs": [x for x in dir(plugin) if not x.startswith("__")]}
+
+		with self.lock:
+			self.load()
+			self.entries[self.getKey(scriptPath, moduleName)] = info
+			self.dirty = True
+
+		return info
+
+
+# Stands in for a plugin, which wasn't imported yet. The cached variables are served directly and the
+# plugin module gets imported on the first access of any other attribute.
+class PluginProxy(object):
+	def __init__(self, info, loadFunc):
+		self.__dict__["_info"] = info
+		self.__dict__["_attrs"] = set(info["attrs"])
+		self.__dict__["_loadFunc"] = loadFunc
+		self.__dict__["_plugin"] = None
+		self.__dict__["_localAttrs"] = []
+		self.__dict__.update(info["data"])
+
+
+	def isLoaded(self):
+		return self._plugin is not None
+
+
+	def loadPlugin(self):
+		if self._plugin is None:
+			plugin = self._loadFunc()
+			for i in self._localAttrs:
+				setattr(plugin, i, self.__dict__[i])
+
+			self.__dict__["_plugin"] = plugin
+
+		return self._plugin
+
+
+	def __getattr__(self, name):
+		if self._plugin is None and (name.startswith("__") or name not in self._attrs):
+			raise AttributeError(name)
+
+		return getattr(self.loadPlugin(), name)
+
+
+	def __setattr__(self, name, value):
+		self.__dict__[name] = value
+		if self._plugin is None:
+			if name not in self._localAttrs:
+				self._localAttrs.append(name)
+		else:
+			setattr(self._plugin, name, value)
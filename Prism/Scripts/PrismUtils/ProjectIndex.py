@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os, threading, time, json, sqlite3
+
+try:
+	from os import scandir
+except ImportError:
+	scandir = None
+
+
+# Index of the directory contents of a project. Every listing is stored together with the mtime of the
+# directory, so it only has to be reread when entries were added, removed or renamed in that directory.
+# The listings are kept in memory and persisted in a SQLite database on the local disk, so they survive restarts.
+# New listings are committed in batches, because a commit per directory is slow during the first scan of a project.
+class ProjectIndex(object):
+	def __init__(self, dbPath=None):
+		self.lock = threading.RLock()
+		self.entries = {}
+		self.db = None
+		self.dbPath = None
+		# directories, which were modified within this amount of seconds, are not trusted, because a
+		# second change in the same mtime tick wouldn't be detected
+		self.settleTime = 2
+		self.commitSize = 500
+		self.commitInterval = 5
+		self.pendingWrites = 0
+		self.lastCommit = time.time()
+		self.setDatabase(dbPath)
+
+
+	def setDatabase(self, dbPath):
+		with self.lock:
+			if self.db is not None:
+				self.commit()
+				try:
+					self.db.close()
+				except Exception:
+					pass
+
+			self.db = None
+			self.dbPath = dbPath
+			self.entries = {}
+
+			if not dbPath:
+				return
+
+			try:
+				if not os.path.exists(os.path.dirname(dbPath)):
+					os.makedirs(os.path.dirname(dbPath))
+
+				self.db = sqlite3.connect(dbPath, check_same_thread=False)
+				self.db.execute("CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime REAL, dirs TEXT, files TEXT)")
+				self.db.commit()
+			except Exception:
+				self.db = None
+
+
+	def getKey(self, path):
+		return os.path.normcase(os.path.normpath(path))
+
+
+	def commit(self):
+		with self.lock:
+			if self.db is not None and self.pendingWrites > 0:
+				try:
+					self.db.commit()
+				except Exception:
+					pass
+
+			self.pendingWrites = 0
+			self.lastCommit = time.time()
+
+
+	# only the names are stored. DirEntry.is_dir doesn't need an extra stat call on most platforms, so a listing
+	# doesn't stat the files in it.
+	def scanDir(self, path):
+		dirs = {}
+		files = {}
+		if scandir is not None:
+			for entry in scandir(path):
+				try:
+					if entry.is_dir():
+						dirs[entry.name] = None
+					else:
+						files[entry.name] = None
+				except OSError:
+					continue
+		else:
+			for name in os.listdir(path):
+				try:
+					if os.path.isdir(os.path.join(path, name)):
+						dirs[name] = None
+					else:
+						files[name] = None
+				except OSError:
+					continue
+
+		return dirs, files
+
+
+	def getEntry(self, path):
+		try:
+			mtime = os.stat(path).st_mtime
+		except OSError:
+			return None
+
+		key = self.getKey(path)
+		with self.lock:
+			entry = self.entries.get(key)
+			if entry is None and self.db is not None:
+				try:
+					row = self.db.execute("SELECT mtime, dirs, files FROM dirs WHERE path=?", (key,)).fetchone()
+				except Exception:
+					row = None
+
+				if row is not None:
+					entry = {"mtime": row[0], "dirs": json.loads(row[1]), "files": json.loads(row[2])}
+					self.entries[key] = entry
+
+		if entry is not None and entry["mtime"] == mtime:
+			return entry
+
+		try:
+			dirs, files = self.scanDir(path)
+		except OSError:
+			return None
+
+		if (time.time() - mtime) < self.settleTime:
+			validMtime = None
+		else:
+			validMtime = mtime
+
+		entry = {"mtime": validMtime, "dirs": dirs, "files": files}
+		with self.lock:
+			self.entries[key] = entry
+			if self.db is not None:
+				try:
+					self.db.execute("INSERT OR REPLACE INTO dirs (path, mtime, dirs, files) VALUES (?, ?, ?, ?)", (key, validMtime, json.dumps(dirs), json.dumps(files)))
+					self.pendingWrites += 1
+				except Exception:
+					pass
+
+				if self.pendingWrites >= self.commitSize or (time.time() - self.lastCommit) > self.commitInterval:
+					self.commit()
+
+		return entry
+
+
+	# returns the subfolders and files of a directory like the first iteration of os.walk
+	def getDirContent(self, path):
+		entry = self.getEntry(path)
+		if entry is None:
+			return [], []
+
+		return sorted(entry["dirs"]), sorted(entry["files"])
+
+
+	def getDirs(self, path):
+		return self.getDirContent(path)[0]
+
+
+	def getFiles(self, path):
+		return self.getDirContent(path)[1]
+
+
+	# forces a rescan of the directory, e.g. after a file was overwritten without changing the directory
+	def invalidate(self, path=None):
+		with self.lock:
+			if path is None:
+				self.entries = {}
+				if self.db is not None:
+					try:
+						self.db.execute("DELETE FROM dirs")
+						self.db.commit()
+					except Exception:
+						pass
+				return
+
+			key = self.getKey(path)
+			self.entries.pop(key, None)
+			if self.db is not None:
+				try:
+					self.db.execute("DELETE FROM dirs WHERE path=?", (key,))
+					self.db.commit()
+				except Exception:
+					pass
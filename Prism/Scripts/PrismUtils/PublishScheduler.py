@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+
+try:
+	from PySide2.QtCore import *
+	psVersion = 2
+except:
+	from PySide.QtCore import *
+	psVersion = 1
+
+import threading, traceback
+
+
+class PublishTask(object):
+	def __init__(self, taskId, state, func, dependsOn, onDone):
+		self.id = taskId
+		self.state = state
+		self.func = func
+		self.dependsOn = dependsOn
+		self.onDone = onDone
+		self.status = "pending"
+		self.error = None
+		self.traceback = None
+		self.result = None
+
+
+# Runs the post-processing steps of the states during a publish on worker threads, while the next states are
+# executed on the main thread. A task starts, when all the tasks it depends on are done. Tasks, which depend on a
+# failed task, are skipped. The functions must not use the UI or the scene. They return None on success or an error
+# string. onDone gets called with the error on the main thread in getResults.
+class PublishScheduler(object):
+	def __init__(self, maxWorkers=4):
+		self.maxWorkers = max(1, maxWorkers)
+		self.tasks = []
+		self.ready = []
+		self.workers = 0
+		self.condition = threading.Condition()
+
+
+	def addTask(self, state, func, dependsOn=None, onDone=None):
+		with self.condition:
+			task = PublishTask(len(self.tasks), state, func, list(dependsOn or []), onDone)
+			self.tasks.append(task)
+			self.updateTask(task)
+			self.startWorkers()
+
+		return task.id
+
+
+	# has to be called with the condition acquired
+	def updateTask(self, task):
+		if task.status != "pending":
+			return
+
+		deps = [self.tasks[x] for x in task.dependsOn]
+		if len([x for x in deps if x.status in ["failed", "skipped"]]) > 0:
+			task.status = "skipped"
+			task.error = "a task, which this state depends on, failed"
+			self.taskFinished(task)
+		elif len([x for x in deps if x.status != "done"]) == 0:
+			task.status = "ready"
+			self.ready.append(task)
+
+
+	# has to be called with the condition acquired
+	def taskFinished(self, task):
+		for i in self.tasks:
+			if task.id in i.dependsOn:
+				self.updateTask(i)
+
+		self.condition.notify_all()
+
+
+	def startWorkers(self):
+		while self.workers < min(self.maxWorkers, len(self.ready)):
+			self.workers += 1
+			thread = threading.Thread(target=self.work)
+			thread.daemon = True
+			thread.start()
+
+
+	def work(self):
+		while True:
+			with self.condition:
+				if len(self.ready) == 0:
+					self.workers -= 1
+					self.condition.notify_all()
+					return
+
+				task = self.ready.pop(0)
+				task.status = "running"
+
+			try:
+				error = task.func()
+				tb = None
+			except Exception as e:
+				error = "unknown error (view console for more information)"
+				tb = traceback.format_exc()
+
+			with self.condition:
+				task.error = error
+				task.traceback = tb
+				task.status = "done" if error is None else "failed"
+				self.taskFinished(task)
+				self.startWorkers()
+
+
+	def isDone(self):
+		with self.condition:
+			return len([x for x in self.tasks if x.status in ["pending", "ready", "running"]]) == 0
+
+
+	# on the main thread only paint events are sent while waiting, so that timers and queued signals don't run
+	# in the middle of the publish
+	def wait(self):
+		paint = QCoreApplication.instance() is not None and QThread.currentThread() == QCoreApplication.instance().thread()
+		while True:
+			with self.condition:
+				if len([x for x in self.tasks if x.status in ["pending", "ready", "running"]]) == 0:
+					return
+
+				self.condition.wait(0.05 if paint else None)
+
+			# the workers aren't blocked by the condition while the UI repaints
+			if paint:
+				QCoreApplication.sendPostedEvents(None, QEvent.UpdateRequest)
+
+
+	# waits for all tasks and returns them in the order they were added. The return value of onDone is stored
+	# as the result of the task.
+	def getResults(self):
+		self.wait()
+		for task in self.tasks:
+			if task.onDone is not None:
+				try:
+					task.result = task.onDone(task.error)
+				except Exception as e:
+					task.error = "unknown error (view console for more information)"
+					task.traceback = traceback.format_exc()
+
+		return list(self.tasks)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+
+import os, sys, threading
+
+if sys.version[0] == "3":
+	from queue import Queue, Empty
+else:
+	from Queue import Queue, Empty
+
+
+# checks the paths in parallel, because os.path.exists can take several milliseconds per file on network shares.
+# Returns a dict with the existence of each path.
+def pathsExist(paths, workers=8):
+	paths = list(set(paths))
+	result = {}
+	if len(paths) < 2:
+		for path in paths:
+			result[path] = os.path.exists(path)
+
+		return result
+
+	jobs = Queue()
+	for path in paths:
+		jobs.put(path)
+
+	lock = threading.Lock()
+
+	def work():
+		while True:
+			try:
+				path = jobs.get_nowait()
+			except Empty:
+				return
+
+			exists = os.path.exists(path)
+			with lock:
+				result[path] = exists
+
+	threads = [threading.Thread(target=work) for x in range(min(workers, len(paths)))]
+	for thread in threads:
+		thread.daemon = True
+		thread.start()
+
+	for thread in threads:
+		thread.join()
+
+	return result
+
+
+# A snapshot of the import paths and external files of the current scene. The StateManager creates one at the
+# start of a publish, so that the validation and the versioninfo of every exported state don't scan the scene again.
+class SceneReferences(object):
+	def __init__(self, core, origin):
+		self.core = core
+
+		self.importPaths = core.appPlugin.getImportPaths(core)
+
+		extResult = getattr(core.appPlugin, "sm_getExternalFiles", lambda x: [[],[]])(origin)
+		if extResult is not None:
+			self.externalFiles, self.externalFilesSource = extResult
+		else:
+			self.externalFiles = []
+			self.externalFilesSource = []
+
+		self.existence = None
+
+
+	def getExistence(self):
+		if self.existence is None:
+			self.existence = pathsExist([self.core.fixPath(x) for x in self.externalFiles])
+
+		return self.existence
+
+
+	def exists(self, path):
+		existence = self.getExistence()
+		if path not in existence:
+			existence[path] = os.path.exists(path)
+
+		return existence[path]
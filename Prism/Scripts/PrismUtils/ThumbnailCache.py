@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+try:
+	from PySide2.QtCore import *
+	from PySide2.QtGui import *
+	psVersion = 2
+except:
+	from PySide.QtCore import *
+	from PySide.QtGui import *
+	psVersion = 1
+
+import os, threading, hashlib, random
+
+
+# On-disk cache of scaled preview images. Thumbnails are stored in size buckets and addressed by a hash
+# of the source path, mtime and filesize, so changed source files never hit old thumbnails.
+# The least recently used thumbnails are removed, when the cache gets bigger than maxBytes.
+# All functions can be used outside of the GUI thread.
+class ThumbnailCache(object):
+	def __init__(self, cacheDir, maxBytes=512*1024*1024, buckets=[128, 256, 512, 1024]):
+		self.cacheDir = cacheDir
+		self.maxBytes = maxBytes
+		self.buckets = buckets
+		self.curBytes = None
+		self.lock = threading.RLock()
+
+
+	def getBucket(self, width, height):
+		size = max(width, height)
+		for i in self.buckets:
+			if i >= size:
+				return i
+
+		return self.buckets[-1]
+
+
+	def getThumbPath(self, path, width, height):
+		try:
+			st = os.stat(path)
+		except OSError:
+			return None
+
+		bucket = self.getBucket(width, height)
+		key = "%s|%s|%s|%s" % (os.path.normcase(os.path.abspath(path)), st.st_mtime, st.st_size, bucket)
+		digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+		return os.path.join(self.cacheDir, str(bucket), digest[:2], digest + ".jpg")
+
+
+	# returns the thumbnail of path as QImage, which fits into the size bucket of width x height.
+	# loadFunc(path) can be used to decode formats, which QImageReader doesn't support.
+	def getImage(self, path, width, height, loadFunc=None):
+		thumbPath = self.getThumbPath(path, width, height)
+		if thumbPath is None:
+			return None
+
+		if os.path.exists(thumbPath):
+			img = QImage(thumbPath)
+			if not img.isNull():
+				try:
+					os.utime(thumbPath, None)
+				except OSError:
+					pass
+
+				return img
+
+		img = self.createImage(path, self.getBucket(width, height), loadFunc)
+		if img is None or img.isNull():
+			return None
+
+		self.saveThumbnail(thumbPath, img)
+		return img
+
+
+	def createImage(self, path, bucket, loadFunc=None):
+		img = None
+		reader = QImageReader(path)
+		size = reader.size()
+		if reader.canRead() and size.isValid() and size.width() > 0 and size.height() > 0:
+			if size.width() > bucket or size.height() > bucket:
+				size.scale(bucket, bucket, Qt.KeepAspectRatio)
+				reader.setScaledSize(size)
+
+			img = reader.read()
+
+		if (img is None or img.isNull()) and loadFunc is not None:
+			img = loadFunc(path)
+
+		if img is None or img.isNull():
+			return None
+
+		if img.width() > bucket or img.height() > bucket:
+			img = img.scaled(bucket, bucket, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+		return img
+
+
+	def saveThumbnail(self, thumbPath, img):
+		tmpPath = thumbPath + ".tmp%s" % random.randint(0, 1000000)
+		try:
+			if not os.path.exists(os.path.dirname(thumbPath)):
+				os.makedirs(os.path.dirname(thumbPath))
+
+			if not img.save(tmpPath, "JPG", 90):
+				return False
+
+			if hasattr(os, "replace"):
+				os.replace(tmpPath, thumbPath)
+			else:
+				if os.path.exists(thumbPath):
+					os.remove(thumbPath)
+				os.rename(tmpPath, thumbPath)
+		except (OSError, IOError):
+			if os.path.exists(tmpPath):
+				try:
+					os.remove(tmpPath)
+				except OSError:
+					pass
+
+			return False
+
+		self.addBytes(os.path.getsize(thumbPath))
+		return True
+
+
+	def getFiles(self):
+		files = []
+		for root, dirs, fileNames in os.walk(self.cacheDir):
+			for i in fileNames:
+				path = os.path.join(root, i)
+				try:
+					st = os.stat(path)
+				except OSError:
+					continue
+
+				files.append([st.st_mtime, st.st_size, path])
+
+		return files
+
+
+	def addBytes(self, size):
+		with self.lock:
+			if self.curBytes is None:
+				self.curBytes = sum([x[1] for x in self.getFiles()])
+			else:
+				self.curBytes += size
+
+			if self.curBytes > self.maxBytes:
+				self.evict()
+
+
+	# removes the least recently used thumbnails until the cache uses less than 80% of maxBytes
+	def evict(self):
+		with self.lock:
+			files = sorted(self.getFiles())
+			self.curBytes = sum([x[1] for x in files])
+			for i in files:
+				if self.curBytes <= self.maxBytes * 0.8:
+					break
+
+				try:
+					os.remove(i[2])
+				except OSError:
+					continue
+
+				self.curBytes -= i[1]
+
+
+	def clear(self):
+		with self.lock:
+			for i in self.getFiles():
+				try:
+					os.remove(i[2])
+				except OSError:
+					pass
+
+			self.curBytes = 0
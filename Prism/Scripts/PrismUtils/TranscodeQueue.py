@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+
+try:
+	from PySide2.QtCore import *
+	psVersion = 2
+except:
+	from PySide.QtCore import *
+	psVersion = 1
+
+import os, sys, platform, subprocess, threading, traceback, collections
+
+ffmpegPaths = {}
+
+
+# looks for the ffmpeg executable without launching it. The result is cached per prism root.
+def findFfmpeg(prismRoot):
+	if prismRoot in ffmpegPaths:
+		return ffmpegPaths[prismRoot]
+
+	if platform.system() == "Windows":
+		candidates = [os.path.join(prismRoot, "PrismFiles", "Tools", "FFmpeg", "bin", "ffmpeg.exe"), os.path.join(prismRoot, "Tools", "FFmpeg", "bin", "ffmpeg.exe")]
+	elif platform.system() == "Darwin":
+		candidates = [os.path.join(prismRoot, "PrismFiles", "Tools", "ffmpeg"), os.path.join(prismRoot, "Tools", "ffmpeg")]
+	else:
+		candidates = [os.path.join(prismRoot, "PrismFiles", "Tools", "FFmpeg", "bin", "ffmpeg"), os.path.join(prismRoot, "Tools", "ffmpeg")]
+
+	ffmpegPath = None
+	for i in candidates:
+		if os.path.isfile(i):
+			ffmpegPath = i
+			break
+	else:
+		try:
+			from shutil import which
+		except ImportError:
+			from distutils.spawn import find_executable as which
+
+		ffmpegPath = which("ffmpeg")
+
+	ffmpegPaths[prismRoot] = ffmpegPath
+	return ffmpegPath
+
+
+def decodeOutput(data):
+	if isinstance(data, bytes) and not isinstance(data, str):
+		return data.decode("utf-8", "replace")
+
+	return data
+
+
+class TranscodeRunner(QRunnable):
+	def __init__(self, job):
+		QRunnable.__init__(self)
+		self.job = job
+
+
+	def run(self):
+		self.job.run()
+
+
+class TranscodeJob(object):
+	def __init__(self, queue, jobId, args, outputPath=None, frameCount=None):
+		self.queue = queue
+		self.jobId = jobId
+		self.args = args
+		self.outputPath = outputPath
+		self.frameCount = frameCount
+		self.cancelEvent = threading.Event()
+		self.doneEvent = threading.Event()
+		self.proc = None
+		self.result = None
+		self.state = "pending"
+		self.onFinished = []
+		self.onProgress = []
+
+
+	def run(self):
+		if self.cancelEvent.is_set():
+			state, result = "canceled", ["", ""]
+		else:
+			try:
+				state, result = self.execute()
+			except Exception:
+				state, result = "failed", ["", traceback.format_exc()]
+
+		self.state = state
+		self.result = result
+		self.doneEvent.set()
+		self.queue.jobFinished.emit([self.jobId, state, result])
+
+
+	# ffmpeg writes key=value pairs to stdout with -progress. stderr is read in a thread, so that
+	# neither pipe can fill up and block ffmpeg.
+	def execute(self):
+		args = [self.args[0], "-nostdin", "-nostats", "-progress", "pipe:1"] + list(self.args[1:])
+		self.proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+		stderr = []
+		errThread = threading.Thread(target=lambda: stderr.append(self.proc.stderr.read()))
+		errThread.daemon = True
+		errThread.start()
+
+		for line in iter(self.proc.stdout.readline, b""):
+			if self.cancelEvent.is_set():
+				self.proc.terminate()
+				break
+
+			line = decodeOutput(line).strip()
+			if line.startswith("frame="):
+				try:
+					frame = int(line.split("=", 1)[1])
+				except ValueError:
+					continue
+
+				self.queue.jobProgress.emit([self.jobId, frame, self.frameCount])
+
+		self.proc.wait()
+		errThread.join()
+		result = ["", decodeOutput(b"".join(stderr))]
+
+		if self.cancelEvent.is_set():
+			if self.outputPath is not None and os.path.isfile(self.outputPath):
+				try:
+					os.remove(self.outputPath)
+				except OSError:
+					pass
+
+			return "canceled", result
+
+		if self.proc.returncode != 0:
+			return "failed", result
+
+		return "finished", result
+
+
+	def cancel(self):
+		self.cancelEvent.set()
+		if self.proc is not None and self.proc.poll() is None:
+			try:
+				self.proc.terminate()
+			except OSError:
+				pass
+
+
+# Runs ffmpeg commands on a thread pool. Jobs with a higher priority are started first and a job, which
+# has the same arguments as a pending or running job, is merged into it. The callbacks of a job are called
+# in the thread of the queue with the result [stdout, stderr] and the progress with (frame, frameCount).
+# The results of finished jobs are kept until they are collected with wait, but at most for the last keepResults jobs.
+class TranscodeQueue(QObject):
+	jobProgress = Signal(object)
+	jobFinished = Signal(object)
+	keepResults = 100
+
+	def __init__(self, maxWorkers=2):
+		QObject.__init__(self)
+		self.pool = QThreadPool()
+		self.pool.setMaxThreadCount(max(1, maxWorkers))
+		self.lock = threading.RLock()
+		self.jobs = {}
+		self.jobKeys = {}
+		self.results = collections.OrderedDict()
+		self.nextId = 0
+		self.jobProgress.connect(self.onJobProgress)
+		self.jobFinished.connect(self.onJobFinished)
+
+
+	def setMaxWorkers(self, maxWorkers):
+		self.pool.setMaxThreadCount(max(1, maxWorkers))
+
+
+	def submit(self, args, outputPath=None, priority=0, frameCount=None, onFinished=None, onProgress=None):
+		key = tuple(args)
+		with self.lock:
+			job = self.jobs.get(self.jobKeys.get(key))
+			if job is None or job.cancelEvent.is_set():
+				self.nextId += 1
+				job = TranscodeJob(self, self.nextId, list(args), outputPath=outputPath, frameCount=frameCount)
+				self.jobs[job.jobId] = job
+				self.jobKeys[key] = job.jobId
+				self.pool.start(TranscodeRunner(job), priority)
+
+			if onFinished is not None:
+				job.onFinished.append(onFinished)
+
+			if onProgress is not None:
+				job.onProgress.append(onProgress)
+
+			return job.jobId
+
+
+	def cancel(self, jobId=None):
+		with self.lock:
+			if jobId is None:
+				jobs = list(self.jobs.values())
+			else:
+				jobs = [self.jobs[jobId]] if jobId in self.jobs else []
+
+		for i in jobs:
+			i.cancel()
+
+
+	def isPending(self, jobId):
+		with self.lock:
+			return jobId in self.jobs
+
+
+	# blocks until the jobs are finished and returns one result for every job id. Unknown ids and jobs, whose
+	# results were already dropped, return None. In the thread of the queue only paint events are processed while
+	# waiting, so that timers and queued signals don't run in the middle of the caller.
+	def wait(self, jobIds):
+		with self.lock:
+			jobs = [self.jobs.get(x) for x in jobIds]
+
+		paint = QCoreApplication.instance() is not None and QThread.currentThread() == self.thread()
+		for job in jobs:
+			if job is None:
+				continue
+
+			if paint:
+				while not job.doneEvent.wait(0.05):
+					QCoreApplication.sendPostedEvents(None, QEvent.UpdateRequest)
+			else:
+				job.doneEvent.wait()
+
+		results = []
+		with self.lock:
+			for jobId, job in zip(jobIds, jobs):
+				if job is not None:
+					self.results.pop(jobId, None)
+					results.append(job.result)
+				else:
+					results.append(self.results.pop(jobId, None))
+
+		return results
+
+
+	def run(self, args, outputPath=None, priority=0, frameCount=None):
+		return self.wait([self.submit(args, outputPath=outputPath, priority=priority, frameCount=frameCount)])[0]
+
+
+	def onJobProgress(self, data):
+		jobId, frame, frameCount = data
+		with self.lock:
+			job = self.jobs.get(jobId)
+		if job is None:
+			return
+
+		for i in job.onProgress:
+			i(frame, frameCount)
+
+
+	def onJobFinished(self, data):
+		jobId, state, result = data
+		with self.lock:
+			job = self.jobs.pop(jobId, None)
+			if job is None:
+				return
+
+			if self.jobKeys.get(tuple(job.args)) == jobId:
+				del self.jobKeys[tuple(job.args)]
+
+			self.results[jobId] = result
+			while len(self.results) > self.keepResults:
+				self.results.popitem(last=False)
+
+		for i in job.onFinished:
+			i(result)
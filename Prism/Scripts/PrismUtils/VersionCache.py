@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+#
+####################################################
+#
+# PRISM - Pipeline for animation and VFX projects
+#
+# www.prism-pipeline.com
+#
+# contact: contact@prism-pipeline.com
+#
+####################################################
+#
+#
+# Copyright (C) 2016-2019 Richard Frangenberg
+#
+# Licensed under GNU GPL-3.0-or-later
+#
+# This file is part of Prism.
+#
+# Prism is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Prism is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Prism.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os, threading
+
+
+# Caches the version numbers, which are parsed from the scenefile names and version folders of a
+# directory. The listings come from a ProjectIndex and the parsed versions are reused as long as the
+# mtime of the directory didn't change, so resolving the latest version only costs a stat call.
+class VersionCache(object):
+	def __init__(self, index):
+		self.index = index
+		self.entries = {}
+		self.lock = threading.Lock()
+		self.taskFolders = {"3d": ["Rendering", "3dRender"], "2d": ["Rendering", "2dRender"], "external": ["Rendering", "external"], "playblast": ["Playblasts"], "export": ["Export"]}
+
+
+	def getCached(self, path, kind, parseFunc):
+		entry = self.index.getEntry(path)
+		if entry is None:
+			return []
+
+		key = (self.index.getKey(path), kind)
+		with self.lock:
+			cached = self.entries.get(key)
+
+		if cached is not None and entry["mtime"] is not None and cached["mtime"] == entry["mtime"]:
+			return cached["versions"]
+
+		versions = parseFunc(entry)
+		with self.lock:
+			self.entries[key] = {"mtime": entry["mtime"], "versions": versions}
+
+		return versions
+
+
+	# returns [version, filename] for every scenefile in path. numvers is the index of the version in the filename.
+	def getSceneVersions(self, path, numvers, separator="_"):
+		def parse(entry):
+			versions = []
+			for i in entry["files"]:
+				fname = i.split(separator)
+				if len(fname) in [6, 8]:
+					try:
+						versions.append([int(fname[numvers][-4:]), i])
+					except:
+						continue
+
+			return versions
+
+		return self.getCached(path, ("scene", numvers, separator), parse)
+
+
+	# returns [version, foldername] for every version folder in path
+	def getTaskVersions(self, path, separator="_"):
+		def parse(entry):
+			versions = []
+			for i in entry["dirs"]:
+				fname = i.split(separator)
+				if len(fname) in [1, 2, 3]:
+					try:
+						versions.append([int(fname[0][1:5]), i])
+					except:
+						continue
+
+			return versions
+
+		return self.getCached(path, ("task", separator), parse)
+
+
+	def isEmptyVersion(self, path):
+		dirs, files = self.index.getDirContent(path)
+		content = dirs + files
+		return not (len(content) > 1 or (len(content) == 1 and content[0] != "versioninfo.ini"))
+
+
+	# returns [version, filepath] of the highest scenefile version in the given folders
+	def getHighestSceneVersion(self, paths, numvers, fileTypes="*", separator="_"):
+		highversion = [0, ""]
+		for path in paths:
+			for i in self.getSceneVersions(path, numvers, separator):
+				if fileTypes != "*" and os.path.splitext(i[1])[1] not in fileTypes:
+					continue
+
+				if i[0] > highversion[0]:
+					highversion = [i[0], os.path.join(path, i[1])]
+
+		return highversion
+
+
+	# returns [version, folderpath] of the highest version folder in the given task folders
+	def getHighestTaskVersion(self, paths, ignoreEmpty=False, separator="_"):
+		versions = []
+		for path in paths:
+			versions += [[x[0], os.path.join(path, x[1])] for x in self.getTaskVersions(path, separator)]
+
+		# the versions get checked from the highest to the lowest, so only the folders of the
+		# highest versions have to be listed to find the latest not empty version
+		for i in sorted(versions, key=lambda x: x[0], reverse=True):
+			if ignoreEmpty and self.isEmptyVersion(i[1]):
+				continue
+
+			return i
+
+		return [0, ""]
+
+
+	def getTaskPaths(self, entityPaths, task, taskType="3d"):
+		if not isinstance(entityPaths, (list, tuple)):
+			entityPaths = [entityPaths]
+
+		return [os.path.join(*([x] + self.taskFolders[taskType] + [task])) for x in entityPaths]
+
+
+	# returns the folder of the latest version of a task or None. entityPaths can be a single path or
+	# a list of paths, e.g. the global and the local path of the same entity.
+	def latest(self, entityPaths, task, taskType="3d", ignoreEmpty=True, separator="_"):
+		result = self.getHighestTaskVersion(self.getTaskPaths(entityPaths, task, taskType), ignoreEmpty=ignoreEmpty, separator=separator)
+		return result[1] or None
+
+
+	# resolves the latest versions for a list of [entityPaths, task, taskType] queries. Every task folder
+	# is only resolved once, even if it is requested multiple times.
+	def latestBulk(self, queries, ignoreEmpty=True, separator="_"):
+		results = []
+		resolved = {}
+		for query in queries:
+			paths = tuple(self.getTaskPaths(*query))
+			if paths not in resolved:
+				resolved[paths] = self.getHighestTaskVersion(paths, ignoreEmpty=ignoreEmpty, separator=separator)[1] or None
+
+			results.append(resolved[paths])
+
+		return results
+
+
+	def hasContent(self, path):
+		dirs, files = self.index.getDirContent(path)
+		return len(dirs) > 0 or len(files) > 0
+
+
+	# returns the name of the latest version folder of an export task, which isn't empty. If unitFolders
+	# is given, one of these subfolders of the version has to contain files.
+	def getLatestExportVersion(self, taskPath, unitFolders=None, separator="_"):
+		for i in sorted(self.index.getDirs(taskPath), reverse=True):
+			vData = i.split(separator)
+			if len(vData) != 3 or i[0] != "v" or len(vData[0]) != 5:
+				continue
+
+			versionPath = os.path.join(taskPath, i)
+			if unitFolders is None:
+				if self.hasContent(versionPath):
+					return i
+			else:
+				for k in unitFolders:
+					if self.hasContent(os.path.join(versionPath, k)):
+						return i
+
+		return None
+
+
+	def invalidate(self, path=None):
+		with self.lock:
+			if path is None:
+				self.entries = {}
+			else:
+				key = self.index.getKey(path)
+				for i in list(self.entries.keys()):
+					if i[0] == key:
+						del self.entries[i]
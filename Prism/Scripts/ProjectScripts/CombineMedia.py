@@ -32,7 +32,7 @@
 
 
 
-import sys, os, time, platform, traceback, subprocess
+import sys, os, time, traceback
 from functools import wraps
 
 try:
@@ -132,27 +132,12 @@ class CombineMedia(QDialog, CombineMedia_ui.Ui_dlg_CombineMedia):
 				QMessageBox.warning(self.core.messageParent, "Video combine", "Could not create outputfolder %s" % os.path.dirname(output))
 				return
 
-		ffmpegIsInstalled = False
-		if platform.system() == "Windows":
-			ffmpegPath = os.path.join(self.core.prismRoot, "Tools", "FFmpeg" ,"bin", "ffmpeg.exe")
-			if os.path.exists(ffmpegPath):
-				ffmpegIsInstalled = True
-		elif platform.system() == "Linux":
-			ffmpegPath = "ffmpeg"
-			try:
-				subprocess.Popen([ffmpegPath])
-				ffmpegIsInstalled = True
-			except:
-				pass
-		elif platform.system() == "Darwin":
-			ffmpegPath = os.path.join(self.core.prismRoot, "Tools", "ffmpeg")
-			if os.path.exists(ffmpegPath):
-				ffmpegIsInstalled = True
-
-		if not ffmpegIsInstalled:
-			QMessageBox.critical(self.core.messageParent, "Video combine", "Could not find %s" % ffmpegPath)
+		ffmpegPath = self.core.getFfmpegPath("Video combine")
+		if ffmpegPath is None:
 			return
 
+		queue = self.core.getTranscodeQueue()
+
 		if len(self.core.pb.compareStates) > 0:
 			cStates = self.core.pb.compareStates
 		else:
@@ -168,6 +153,7 @@ class CombineMedia(QDialog, CombineMedia_ui.Ui_dlg_CombineMedia):
 		stdout = ""
 		stderr = ""
 
+		# image sequences are converted in parallel. The order of the sources is kept for the combined video.
 		for i in cStates:
 			if os.path.isfile(i):
 				inputpath = i
@@ -191,6 +177,7 @@ class CombineMedia(QDialog, CombineMedia_ui.Ui_dlg_CombineMedia):
 
 			isSequence = not inputExt in [".mp4", ".mov"]
 
+			jobId = None
 			if isSequence:
 				outputpath = os.path.splitext(inputpath)[0][:-5] + ".mp4"
 				if not os.path.exists(os.path.dirname(outputpath)):
@@ -198,18 +185,21 @@ class CombineMedia(QDialog, CombineMedia_ui.Ui_dlg_CombineMedia):
 				
 				startNum = os.path.splitext(inputpath)[0][-4:]
 				inputpath = os.path.splitext(inputpath)[0][:-4] + "%04d" + inputExt
-				nProc = subprocess.Popen([ffmpegPath, "-start_number", startNum, "-framerate", "24", "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuva420p", "-start_number", startNum, outputpath, "-y"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-				result = nProc.communicate()
-				stdout += result[0]
-				stderr += result[1]
-				if not os.path.exists(outputpath) or os.stat(outputpath).st_size == 0:
-					continue
-
-				tmpFiles.append(outputpath)
+				jobId = queue.submit([ffmpegPath, "-start_number", startNum, "-framerate", "24", "-apply_trc", "iec61966_2_1", "-i", inputpath, "-pix_fmt", "yuva420p", "-start_number", startNum, outputpath, "-y"], outputPath=outputpath)
 				inputpath = outputpath
 
-			sources.append([inputpath, iw, ih])
+			sources.append([inputpath, iw, ih, jobId])
+
+		results = queue.wait([x[3] for x in sources if x[3] is not None])
+		for result in [x for x in results if x is not None]:
+			stdout += result[0]
+			stderr += result[1]
+
+		seqSources = [x for x in sources if x[3] is not None]
+		sources = [x for x in sources if x[3] is None or (os.path.exists(x[0]) and os.stat(x[0]).st_size > 0)]
+		tmpFiles += [x[0] for x in seqSources if x in sources]
 
+		convertJobs = []
 		for i in sources:
 			inputpath = i[0]
 
@@ -224,20 +214,30 @@ class CombineMedia(QDialog, CombineMedia_ui.Ui_dlg_CombineMedia):
 
 			pad = "%s:%s:%s:%s" % (tw, th, (tw-iw*min(tw/iw,th/ih))/2, (th-ih*min(tw/iw,th/ih))/2)
 
-			nProc = subprocess.Popen([ffmpegPath, "-i", inputpath, "-pix_fmt", "yuv420p", "-vf", "scale=%s:%s, pad=%s" % (newW, newH, pad), outputpath, "-y"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-			result = nProc.communicate()
-			stdout += result[0]
-			stderr += result[1]
-			nProc = subprocess.Popen([ffmpegPath, "-i", outputpath, "-pix_fmt", "yuv420p", "-c", "copy", "-bsf:v", "h264_mp4toannexb", outputpathts, "-y"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-			result = nProc.communicate()
+			jobId = queue.submit([ffmpegPath, "-i", inputpath, "-pix_fmt", "yuv420p", "-vf", "scale=%s:%s, pad=%s" % (newW, newH, pad), outputpath, "-y"], outputPath=outputpath)
+			convertJobs.append([jobId, outputpath, outputpathts])
+
+		results = queue.wait([x[0] for x in convertJobs])
+		for result in [x for x in results if x is not None]:
 			stdout += result[0]
 			stderr += result[1]
 
+		tsJobs = []
+		for i in convertJobs:
+			outputpath, outputpathts = i[1], i[2]
+			tsJobs.append(queue.submit([ffmpegPath, "-i", outputpath, "-pix_fmt", "yuv420p", "-c", "copy", "-bsf:v", "h264_mp4toannexb", outputpathts, "-y"], outputPath=outputpathts))
+
 			tmpFiles.append(outputpath)
 			tmpFiles.append(outputpathts)
 
-			if os.path.exists(outputpathts):
-				combineInputs.append(outputpathts)
+		results = queue.wait(tsJobs)
+		for result in [x for x in results if x is not None]:
+			stdout += result[0]
+			stderr += result[1]
+
+		for i in convertJobs:
+			if os.path.exists(i[2]):
+				combineInputs.append(i[2])
 
 		if self.ctype == "sequence":
 			args = [ffmpegPath]
@@ -248,7 +248,9 @@ class CombineMedia(QDialog, CombineMedia_ui.Ui_dlg_CombineMedia):
 			args += ["-filter_complex"]
 			filterStr += "concat=n=%s:v=1:a=0 [v]" % len(combineInputs)
 			args += [filterStr, "-map", "[v]", "-pix_fmt", "yuv420p", output, "-y"]
-			nProc = subprocess.call(args)
+			result = queue.run(args, outputPath=output)
+			stdout += result[0]
+			stderr += result[1]
 	#	elif self.ctype == "layout":
 	#	elif self.ctype == "stack":
 	#	elif self.ctype == "stackDif":
@@ -32,7 +32,7 @@
 
 
 
-import os, inspect
+import os, re, time, inspect
 from Deadline.Scripting import *
 
 #def log(text):
@@ -44,75 +44,139 @@ from Deadline.Scripting import *
 
 # perform: "Tools->Perform pending job scan" in super user mode to the log in Deadline console
 
+# The folder listings are kept between the checks. A listing is reused for listingTTL seconds, so that all jobs,
+# which depend on the same folder, share one listing during a scan. After that it is only read again, when the
+# mtime of the folder changed. Folder mtimes have a resolution of 1-2 seconds on network shares, so a listing, which
+# was read within settleTime of the folder mtime, isn't trusted and the folder gets listed again on the next check.
+listingTTL = 10
+settleTime = 2
+folderCache = {}
+frameCache = {}
+depFileCache = {}
+
+
+def getFolderContent(folder):
+	now = time.time()
+	cached = folderCache.get(folder)
+	if cached is not None and (now - cached["checked"]) < listingTTL:
+		return cached
+
+	try:
+		mtime = os.path.getmtime(folder)
+	except OSError:
+		folderCache[folder] = {"checked": now, "mtime": None, "files": []}
+		return folderCache[folder]
+
+	if cached is None or cached["mtime"] != mtime:
+		cached = {"mtime": mtime, "files": os.listdir(folder)}
+		if (now - mtime) < settleTime:
+			cached["mtime"] = None
+
+	cached["checked"] = now
+	folderCache[folder] = cached
+	return cached
+
+
+# returns the existing frame numbers of the sequence of depPath. The frame number are the last 4 digits of the filename.
+def getExistingFrames(depPath):
+	folder, fileName = os.path.split(depPath)
+	match = re.match(r"(.*)(\d{4})(\D*)$", fileName)
+	if match is None:
+		return set()
+
+	prefix, suffix = match.group(1), match.group(3)
+	content = getFolderContent(folder)
+
+	key = (folder, prefix, suffix)
+	cached = frameCache.get(key)
+	if cached is not None and content["mtime"] is not None and cached[0] == content["mtime"]:
+		return cached[1]
+
+	frames = set()
+	for i in content["files"]:
+		if i.startswith(prefix) and i.endswith(suffix):
+			frame = i[len(prefix):len(i)-len(suffix)]
+			if frame.isdigit():
+				frames.add(int(frame))
+
+	frameCache[key] = [content["mtime"], frames]
+	return frames
+
+
+# The offset of a dependency is either a single number or a range "start:end", for example "-1:1" if every frame
+# needs the previous and the next frame of the dependency too.
+def parseOffsets(offset):
+	if ":" in offset:
+		start, end = offset.split(":", 1)
+		return list(range(int(start), int(end) + 1))
+
+	return [int(offset)]
+
+
+def getDependencies(depfile):
+	try:
+		mtime = os.path.getmtime(depfile)
+	except OSError:
+		return None
+
+	cached = depFileCache.get(depfile)
+	if cached is not None and cached[0] == mtime:
+		return cached[1]
+
+	with open(depfile, 'r') as dependFile:
+		depData = [x.replace("\n", "") for x in dependFile.readlines()]
+
+	dependencies = []
+	for i in range(len(depData)//2):
+		dependencies.append([parseOffsets(depData[i*2]), depData[1+(i*2)]])
+
+	depFileCache[depfile] = [mtime, dependencies]
+	return dependencies
+
+
+def framesExist(dependencies, frames):
+	for offsets, depPath in dependencies:
+		existing = getExistingFrames(depPath)
+		for k in frames:
+			for offset in offsets:
+				if (k + offset) not in existing:
+					return False
+
+	return True
+
+
 def __main__( jobId, taskIds=None ):
 	job = RepositoryUtils.GetJob(jobId, True)
-	jobTasks = RepositoryUtils.GetJobTasks(job, True)
 
-	import os
 	depfile = os.path.join(RepositoryUtils.GetJobAuxiliaryPath(job), "dependencies.txt")
 	ClientUtils.LogText("\n start dep -----------%s" % depfile)
 
-	if not taskIds:
-
-		if os.path.exists(depfile):
-			with open(depfile, 'r') as dependFile:
-				depData = dependFile.readlines()
-				depData = [x.replace("\n", "") for x in depData]
-
-			curFrames = job.JobFramesList
-			releaseJob = True
+	dependencies = getDependencies(depfile)
+	if dependencies is None:
+		ClientUtils.LogText("\n" + str(jobId) + "- No Dependency File")
+		#log("\n" + str(jobId) + "- No Dependency File")
+		if not taskIds:
+			return False
 
-			for i in range(len(depData)/2):
-				offset = depData[i*2]
-				depPath = os.path.splitext(depData[1+(i*2)])[0]
-				depExt = os.path.splitext(depData[1+(i*2)])[1]
-				for k in curFrames:
-					if not os.path.exists(depPath[:-4] + format(k+int(offset), '04') + depExt):
-						ClientUtils.LogText("\n" + str(jobId) + " not released")
-						return False
+		return []
 
+	if not taskIds:
+		if framesExist(dependencies, job.JobFramesList):
 			ClientUtils.LogText("\n" + str(jobId) + " released")
 			return True
-		else:
-			ClientUtils.LogText("\n" + str(jobId) + "- No Dependency File")
-
 
+		ClientUtils.LogText("\n" + str(jobId) + " not released")
 		return False
 	else:
+		jobTasks = RepositoryUtils.GetJobTasks(job, True)
 
 		tasksToRelease = []
+		for taskID in taskIds:
+			task = jobTasks.Tasks[int(taskID)]
+			if framesExist(dependencies, task.TaskFrameList):
+				tasksToRelease.append(taskID)
+
+		ClientUtils.LogText("\n" + str(jobId) + "\n" + str(taskIds) + "-" + str(tasksToRelease))
+		#log("\n" + str(jobId) + "\n" + str(taskIds) + "-" + str(tasksToRelease))
 
-		if os.path.exists(depfile):
-			with open(depfile, 'r') as dependFile:
-				depData = dependFile.readlines()
-				depData = [x.replace("\n", "") for x in depData]
-
-			for taskID in taskIds:
-				task = jobTasks.Tasks[int(taskID)]
-
-				curFrames = task.TaskFrameList
-
-				release = True
-				for i in range(len(depData)/2):
-					offset = depData[i*2]
-					depPath = os.path.splitext(depData[1+(i*2)])[0]
-					depExt = os.path.splitext(depData[1+(i*2)])[1]
-					for k in curFrames:
-						ClientUtils.LogText(depPath[:-4] + format(k+int(offset), '04') + depExt)
-						if not os.path.exists(depPath[:-4] + format(k+int(offset), '04') + depExt):
-							release = False
-							break
-					else:
-						continue
-					break
-
-				if release:
-					tasksToRelease.append(taskID)
-
-			ClientUtils.LogText("\n" + str(jobId) + "\n" + str(taskIds) + "-" + str(tasksToRelease))
-			#log("\n" + str(jobId) + "\n" + str(taskIds) + "-" + str(tasksToRelease))
-		else:
-			ClientUtils.LogText("\n" + str(jobId) + "- No Dependency File")
-			#log("\n" + str(jobId) + "- No Dependency File")
-
-		return tasksToRelease
\ No newline at end of file
+		return tasksToRelease
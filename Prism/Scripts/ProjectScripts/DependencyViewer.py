@@ -44,6 +44,7 @@ except:
 
 import sys, os, datetime, traceback, time
 from functools import wraps
+from PrismUtils import DependencyGraph
 
 if sys.version[0] == "3":
 	from configparser import ConfigParser
@@ -86,11 +87,13 @@ class DependencyViewer(QDialog, DependencyViewer_ui.Ui_dlg_DependencyViewer):
 		else:
 			self.tw_dependencies.header().setSectionResizeMode(1,QHeaderView.Fixed)
 
-		self.dependencies = {}
 		self.depRoot = depRoot
+		self.graph = DependencyGraph.DependencyGraph(self.core.configCache)
+		self.warnedInfos = []
+		self.matchCache = {}
 
 		self.connectEvents()
-		self.updateDependencies("0", depRoot)
+		self.updateDependencies(self.tw_dependencies.invisibleRootItem(), depRoot)
 
 		self.tw_dependencies.setColumnWidth(0, 400)
 		self.tw_dependencies.setColumnWidth(1, 10)
@@ -120,6 +123,8 @@ class DependencyViewer(QDialog, DependencyViewer_ui.Ui_dlg_DependencyViewer):
 		self.tw_dependencies.mouseClickEvent = self.tw_dependencies.mouseReleaseEvent
 		self.tw_dependencies.mouseReleaseEvent = lambda x: self.mouseClickEvent(x,"deps")
 		self.tw_dependencies.customContextMenuRequested.connect(lambda x: self.rclList("deps",x))
+		self.tw_dependencies.itemExpanded.connect(self.itemExpanded)
+		self.finished.connect(lambda x: self.graph.clear())
 
 	@err_decorator
 	def mouseClickEvent(self, event, uielement):
@@ -164,123 +169,141 @@ class DependencyViewer(QDialog, DependencyViewer_ui.Ui_dlg_DependencyViewer):
 		rcmenu.exec_(QCursor.pos())
 
 
+	# returns the versioninfos of item and all its parents
 	@err_decorator
-	def updateDependencies(self, depID, versionInfo):
-		source = self.core.getConfig(cat="information", param="source scene", configPath=versionInfo)
-		deps = self.core.getConfig(cat="information", param="dependencies", configPath=versionInfo)
-		extFiles = self.core.getConfig(cat="information", param="external files", configPath=versionInfo)
-
-		try:
-			deps = eval(deps)
-			if source is not None:
-				deps.append(source)
-
-			extFiles = eval(extFiles)
-		except:
-			QMessageBox.warning(self.core.messageParent, "Warning", "Could not read dependencies from file:\n\n%s" % versionInfo)
-			deps = []
-			extFiles = []
+	def getItemInfos(self, item):
+		infos = [self.depRoot]
+		while item is not None:
+			if item.data(0, Qt.UserRole) is not None:
+				infos.append(item.data(0, Qt.UserRole))
+			item = item.parent()
+
+		return infos
 
-		if depID == "0":
-			depItem = self.tw_dependencies.invisibleRootItem()
+
+	@err_decorator
+	def createDepItem(self, dep, parentInfos):
+		if pVersion == 2:
+			existText = unicode("█", "utf-8")
 		else:
-			depItem = self.dependencies[depID][1]
+			existText = "█"
 
-		for i in deps:
-			if pVersion == 2:
-				existText = unicode("█", "utf-8")
-			else:
-				existText = "█"
+		if dep["exists"]:
+			cdate = datetime.datetime.fromtimestamp(dep["mtime"])
+			cdate = cdate.replace(microsecond = 0)
+			date = cdate.strftime("%d.%m.%y,  %X")
+			existColor = QColor(0,255,0)
+		else:
+			date = ""
+			existColor = QColor(255,0,0)
 
-			depPath = i
+		dType = dep["type"]
+		if dep["infoPath"] is not None and dep["infoPath"] in parentInfos:
+			dType += " (circular)"
 
-			if not os.path.exists(i):
-				depDir = os.path.dirname(i)
-				if os.path.exists(depDir) and len(os.listdir(depDir)) > 0:
-					depPath = depDir
+		item = QTreeWidgetItem([os.path.basename(dep["path"]), existText, dType, date, dep["path"].replace("\\", "/")])
+		item.setForeground(1, existColor)
 
-			if os.path.exists(depPath):
-				cdate = datetime.datetime.fromtimestamp(os.path.getmtime(depPath))
-				cdate = cdate.replace(microsecond = 0)
-				date = cdate.strftime("%d.%m.%y,  %X")
-				existColor = QColor(0,255,0)
-			else:
-				date = ""
-				existColor = QColor(255,0,0)
+		if dep["type"] != "File":
+			iFont = item.font(0)
+			iFont.setBold(True)
+			item.setFont(0, iFont)
 
-			if i == source:
-				dType = "Source Scene"
-			else:
-				dType = "Export"
+		# the dependencies of an item are only added, when it gets expanded
+		if dep["infoPath"] is not None and dep["infoPath"] not in parentInfos:
+			item.setData(0, Qt.UserRole, dep["infoPath"])
+			item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
 
-			item = QTreeWidgetItem([os.path.basename(i), existText, dType, date, i.replace("\\", "/")])
+		return item
 
-			item.setForeground(1, existColor)
 
-			depItem.addChild(item)
-			curID = str(len(self.dependencies)+1)
+	@err_decorator
+	def updateDependencies(self, depItem, versionInfo):
+		if self.graph.hasError(versionInfo) and versionInfo not in self.warnedInfos:
+			self.warnedInfos.append(versionInfo)
+			QMessageBox.warning(self.core.messageParent, "Warning", "Could not read dependencies from file:\n\n%s" % versionInfo)
 
-			self.dependencies[curID] = [i, item, depID]
+		parentInfos = self.getItemInfos(depItem)
+		for i in self.graph.getChildren(versionInfo):
+			depItem.addChild(self.createDepItem(i, parentInfos))
 
-			iFont = item.font(0)
-			iFont.setBold(True)
-			item.setFont(0, iFont)
+		depItem.setData(0, Qt.UserRole + 1, True)
 
-			depInfo = os.path.join(os.path.dirname(i), "versioninfo.ini")
-			if not os.path.exists(depInfo):
-				depInfo = os.path.join(os.path.dirname(os.path.dirname(i)), "versioninfo.ini")
 
-			if os.path.exists(depInfo):
-				self.updateDependencies(curID, depInfo)
+	@err_decorator
+	def itemExpanded(self, item):
+		versionInfo = item.data(0, Qt.UserRole)
+		if versionInfo is None or item.data(0, Qt.UserRole + 1):
+			return
+
+		self.updateDependencies(item, versionInfo)
+
 
-		for i in extFiles:
-			if i in deps:
+	# checks if any dependency below versionInfo matches the filter. Versioninfos in parentInfos are
+	# skipped, so cycles end the search.
+	@err_decorator
+	def hasMatch(self, versionInfo, filterStr, parentInfos):
+		return self.findMatch(versionInfo, filterStr, parentInfos)[0]
+
+
+	# returns if a dependency below versionInfo matches and if the search was cut off at a versioninfo in
+	# parentInfos. A match is found on every path, so it is always cached. Misses are only cached without a cut off,
+	# because a versioninfo, which was skipped here, can contain a match, when it is reached on another path.
+	def findMatch(self, versionInfo, filterStr, parentInfos):
+		key = (versionInfo, filterStr)
+		if key in self.matchCache:
+			return self.matchCache[key], False
+
+		childs = self.graph.getChildren(versionInfo)
+		if len([x for x in childs if filterStr in x["path"].lower()]) > 0:
+			self.matchCache[key] = True
+			return True, False
+
+		cut = False
+		for i in childs:
+			if i["infoPath"] is None:
 				continue
 
-			if pVersion == 2:
-				existText = unicode("█", "utf-8")
-			else:
-				existText = "█"
+			if i["infoPath"] in parentInfos:
+				cut = True
+				continue
 
-			if os.path.exists(i):
-				cdate = datetime.datetime.fromtimestamp(os.path.getmtime(i))
-				cdate = cdate.replace(microsecond = 0)
-				date = cdate.strftime("%d.%m.%y,  %X")
-				existColor = QColor(0,255,0)
-			else:
-				date = ""
-				existColor = QColor(255,0,0)
+			childResult, childCut = self.findMatch(i["infoPath"], filterStr, parentInfos + [i["infoPath"]])
+			if childResult:
+				self.matchCache[key] = True
+				return True, False
 
-			item = QTreeWidgetItem([os.path.basename(i), existText, "File", date, i.replace("\\", "/")])
+			cut = cut or childCut
 
-			item.setForeground(1, existColor)
-			
-			depItem.addChild(item)
+		if not cut:
+			self.matchCache[key] = False
 
-			curID = str(len(self.dependencies)+1)
-			self.dependencies[curID] = [i, item, depID]
+		return False, cut
 
 
+	@err_decorator
+	def addFilteredDependencies(self, depItem, versionInfo, filterStr, parentInfos):
+		for i in self.graph.getChildren(versionInfo):
+			hasChildMatch = i["infoPath"] is not None and i["infoPath"] not in parentInfos and self.hasMatch(i["infoPath"], filterStr, parentInfos + [i["infoPath"]])
+			if filterStr not in i["path"].lower() and not hasChildMatch:
+				continue
+
+			item = self.createDepItem(i, parentInfos)
+			item.setData(0, Qt.UserRole + 1, True)
+			item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+			depItem.addChild(item)
+			if hasChildMatch:
+				self.addFilteredDependencies(item, i["infoPath"], filterStr, parentInfos + [i["infoPath"]])
+
 
 	@err_decorator
 	def filterDeps(self, filterStr):
-		self.clearItem(self.tw_dependencies.invisibleRootItem())
+		self.tw_dependencies.clear()
 
 		if filterStr == "":
-			self.dependencies = {}
-			self.updateDependencies("0", self.depRoot)
+			self.updateDependencies(self.tw_dependencies.invisibleRootItem(), self.depRoot)
 		else:
-			for i in self.dependencies:
-				if filterStr.lower() in self.dependencies[i][0].lower():
-					depID = i
-					while depID != "0":
-						parID = self.dependencies[depID][2]
-						if parID == "0":
-							self.tw_dependencies.invisibleRootItem().addChild(self.dependencies[depID][1])
-						else:
-							self.dependencies[parID][1].addChild(self.dependencies[depID][1])
-						depID = parID
-
+			self.addFilteredDependencies(self.tw_dependencies.invisibleRootItem(), self.depRoot, filterStr.lower(), [self.depRoot])
 			self.tw_dependencies.expandAll()
 
 
@@ -32,7 +32,7 @@
 
 
 from pprint import pprint
-import sys, os, datetime, shutil, ast, time, traceback, random, platform, imp
+import sys, os, datetime, shutil, ast, time, traceback, random, platform, imp, hashlib
 
 prismRoot = os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
@@ -104,6 +104,8 @@ if psVersion == 1:
 else:
 	import ProjectBrowser_ui_ps2 as ProjectBrowser_ui
 
+from PrismUtils import FrameCache, AsyncScan, AssetCrawler, CopyEngine
+
 try:
 	import CreateItem
 except:
@@ -167,6 +169,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		self.sBasePath = os.path.join(self.core.projectPath, self.scenes, "Shots")
 
 		self.aExpanded = []
+		self.fillingAItems = False
 		self.sExpanded = []
 		self.fhierarchy =["Files"]
 		self.fbottom = False
@@ -222,6 +225,18 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 		self.oiioLoaded = False
 		self.wandLoaded = False
+		self.numpyLoaded = False
+
+		self.frameCache = FrameCache.FrameCache()
+		self.framePrefetcher = FrameCache.FramePrefetcher(self.frameCache)
+		self.framePrefetcher.frameReady.connect(self.prefetchedFrameReady)
+		self.prefetchFrameCount = 24
+		self.scanRunner = AsyncScan.ScanRunner(errorHandler=self.scanError)
+		self.copyEngine = CopyEngine.CopyEngine()
+		self.copyEngine.progress.connect(self.copyProgress)
+		self.copyEngine.finished.connect(self.copyFinished)
+		self.copyDlg = None
+		self.transcodeDlgs = {}
 
 		self.oldPalette = self.b_saveRender1.palette()
 		self.savedPalette = QPalette()
@@ -265,6 +280,12 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		return func_wrapper
 
 
+	# errors of background scans get logged in the GUI thread, since writeErrorLog opens a dialog
+	def scanError(self, text):
+		erStr = ("%s ERROR - ProjectBrowser %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, text))
+		self.core.writeErrorLog(erStr)
+
+
 	@err_decorator
 	def connectEvents(self):
 		self.tw_aHierarchy.mousePrEvent = self.tw_aHierarchy.mousePressEvent
@@ -309,7 +330,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		self.tw_recent.mouseReleaseEvent = lambda x: self.mouseClickEvent(x,"r")
 
 		self.tw_aHierarchy.currentItemChanged.connect(lambda x, y: self.Assetclicked(x))
-		self.tw_aHierarchy.itemExpanded.connect(self.refreshAItem)
+		self.tw_aHierarchy.itemExpanded.connect(self.aItemExpanded)
 		self.tw_aHierarchy.itemCollapsed.connect(self.hItemCollapsed)
 		self.tw_aHierarchy.customContextMenuRequested.connect(lambda x: self.rclCat("ah",x))
 		self.lw_aPipeline.currentItemChanged.connect(self.refreshAFile)
@@ -721,7 +742,12 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			if "timeline" in i and i["timeline"].state() != QTimeLine.NotRunning:
 				i["timeline"].setPaused(True)
 
-		QPixmapCache.clear()
+		self.framePrefetcher.cancelPending()
+		self.scanRunner.cancel()
+		self.copyEngine.cancel()
+		for i in list(self.transcodeDlgs):
+			self.core.getTranscodeQueue().cancel(i)
+			self.transcodeDlgs.pop(i).close()
 
 		self.core.callback(name="onProjectBrowserClose", types=["curApp", "custom"], args=[self])
 
@@ -740,6 +766,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			global numpy, wand
 			try:
 				import numpy
+				self.numpyLoaded = True
 				import wand, wand.image
 				self.wandLoaded = True
 			except:
@@ -793,7 +820,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		self.gb_renderings.setVisible(self.tabOrder[self.tbw_browser.widget(tab).property("tabType")]["showRenderings"])
 
 		if self.gb_renderings.isVisible() and self.chb_autoUpdate.isChecked():
-			self.updateTasks()
+			self.updateTasks(background=True)
 
 
 	@err_decorator
@@ -816,7 +843,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 						curStep = os.path.join("Scenefiles", curStepItem.text())
 				dstname = os.path.join(basePath, curStep)
 
-			self.refreshAHierarchy()
+			self.refreshAHierarchy(background=True, callback=lambda: self.refreshUIFinished(dstname, curData))
 		elif curTab == "Shots":
 			if self.cursShots is None:
 				shot = ""
@@ -835,13 +862,13 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 			dstname = os.path.join(self.sBasePath, shot, step, cat)
 
-			self.refreshShots()
+			self.refreshShots(background=True, callback=lambda: self.refreshUIFinished(dstname, curData))
 		elif curTab == "Recent":
 			self.setRecent()
-			return
-		else:
-			return
 
+
+	@err_decorator
+	def refreshUIFinished(self, dstname, curData):
 		self.navigateToCurrent(path=dstname)
 
 		self.showRender(curData[0], curData[1], curData[2], curData[3], curData[4])
@@ -1013,13 +1040,12 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			winheight = 10
 			VBox = QVBoxLayout()
 			if os.path.exists(prvPath):
-				imgmap = self.getImgPMap(prvPath)
-				l_prv = QLabel()
-				l_prv.setPixmap(imgmap)
-				l_prv.setStyleSheet( """
+				self.detailWin.l_prv = QLabel()
+				self.detailWin.l_prv.setStyleSheet( """
 					border: 1px solid rgb(100,100,100);
 				""")
-				VBox.addWidget(l_prv)
+				VBox.addWidget(self.detailWin.l_prv)
+				self.scanRunner.start("detailPreview", self.core.thumbnailCache.getImage, args=[prvPath, 500, 500, self.getImgQImage], onChunk=lambda x: self.setDetailPreview(scenePath, x))
 			w_info = QWidget()
 			GridL = QGridLayout()
 			GridL.setColumnStretch(1,1)
@@ -1061,6 +1087,15 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			self.detailWin.show()
 
 
+	@err_decorator
+	def setDetailPreview(self, scenePath, img):
+		if not hasattr(self, "detailWin") or not hasattr(self.detailWin, "l_prv") or self.detailWin.scenePath != scenePath or img is None:
+			return
+
+		self.detailWin.l_prv.setPixmap(QPixmap.fromImage(img))
+		self.detailWin.adjustSize()
+
+
 	@err_decorator
 	def tableLeaveEvent(self, event, table):
 		if hasattr(self, "detailWin") and self.detailWin.isVisible():
@@ -1794,46 +1829,146 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 
 	@err_decorator
-	def refreshAHierarchy(self, load=False):
+	def refreshAHierarchy(self, load=False, background=False, callback=None):
 		self.tw_aHierarchy.clear()
+		self.refreshOmittedEntities()
+
+		if background:
+			self.scanRunner.start("assets", self.iterAssetDirs, args=[self.getAssetDirs()], onChunk=lambda x: self.addAssetItem(*x), onFinished=lambda: self.assetHierarchyRefreshed(callback))
+			return
+
+		self.scanRunner.cancel("assets")
 
+		for path, node in self.iterAssetDirs(self.getAssetDirs()):
+			self.addAssetItem(path, node)
+
+		self.assetHierarchyRefreshed(callback)
+
+
+	@err_decorator
+	def getAssetDirs(self):
 		if self.core.useLocalFiles:
 			lBasePath = self.aBasePath.replace(self.core.projectPath, self.core.localProjectPath)
 
 		dirs = []
 
-		for i in os.walk(self.aBasePath):
-			for k in i[1]:
+		for k in self.core.projectIndex.getDirs(self.aBasePath):
+			if k in ["Export", "Playblasts", "Rendering", "Scenefiles"]:
+				continue
+			dirs.append(os.path.join(self.aBasePath, k))
+
+		if self.core.useLocalFiles:
+			for k in self.core.projectIndex.getDirs(lBasePath):
 				if k in ["Export", "Playblasts", "Rendering", "Scenefiles"]:
 					continue
-				dirs.append(os.path.join(i[0], k))
-			break
 
-		if self.core.useLocalFiles:
-			for i in os.walk(lBasePath):
-				for k in i[1]:
-					if k in ["Export", "Playblasts", "Rendering", "Scenefiles"]:
-						continue
-
-					ldir = os.path.join(i[0], k)
-					if ldir.replace(self.core.localProjectPath, self.core.projectPath) not in dirs:
-						dirs.append(ldir)
-				break
+				ldir = os.path.join(lBasePath, k)
+				if ldir.replace(self.core.localProjectPath, self.core.projectPath) not in dirs:
+					dirs.append(ldir)
 
-		self.refreshOmittedEntities()
+		return dirs
 
+
+	# can run in a worker thread. Crawls the global and local folders of every top level entity in one pass,
+	# so that addAssetItem can build the items in the GUI thread without touching the disk.
+	def iterAssetDirs(self, dirs):
+		crawler = AssetCrawler.AssetCrawler(index=self.core.projectIndex)
 		for path in dirs:
-			val = os.path.basename(path)
-			if val not in self.omittedEntities["Asset"]:
-				item = QTreeWidgetItem([val, path])
-				self.tw_aHierarchy.addTopLevelItem(item)
-				self.refreshAItem(item, expanded=False)
+			basePaths = [path]
+			if self.core.useLocalFiles:
+				gPath = path.replace(self.core.localProjectPath, self.core.projectPath)
+				basePaths = [gPath, gPath.replace(self.core.projectPath, self.core.localProjectPath)]
+
+			yield path, crawler.crawl(basePaths, isBase=False)
+
 
+	@err_decorator
+	def addAssetItem(self, path, node=None):
+		val = os.path.basename(path)
+		if val in self.omittedEntities["Asset"]:
+			return
+
+		item = QTreeWidgetItem([val, path])
+		self.tw_aHierarchy.addTopLevelItem(item)
+		if node is None:
+			self.refreshAItem(item, expanded=False)
+		else:
+			self.fillingAItems = True
+			try:
+				self.fillAssetItem(item, node, val)
+			finally:
+				self.fillingAItems = False
+
+
+	@err_decorator
+	def fillAssetItem(self, item, node, aName):
+		if node["type"] == "Asset":
+			item.setText(2, "Asset")
+			iFont = item.font(0)
+			iFont.setBold(True)
+			item.setFont(0, iFont)
+		else:
+			item.setText(2, "Folder")
+			for i in node["children"]:
+				childName = os.path.join(aName, i["name"])
+				if childName in self.omittedEntities["Asset"]:
+					continue
+
+				child = QTreeWidgetItem([i["name"], i["paths"][0]])
+				item.addChild(child)
+				self.fillAssetItem(child, i, childName)
+
+		if item.text(1) in self.aExpanded:
+			item.setExpanded(True)
+
+
+	@err_decorator
+	def assetHierarchyRefreshed(self, callback=None):
 		if self.tw_aHierarchy.topLevelItemCount() > 0:
 			self.tw_aHierarchy.setCurrentItem(self.tw_aHierarchy.topLevelItem(0))
 		else:
 			self.refreshAStep()
 
+		if callback is not None:
+			callback()
+
+
+	# the expanded item is crawled again in a worker thread, so that new folders show up. Items, which get
+	# expanded while the crawled nodes are filled in, already have their children.
+	@err_decorator
+	def aItemExpanded(self, item):
+		self.adclick = False
+		path = item.text(1)
+		if path not in self.aExpanded:
+			self.aExpanded.append(path)
+
+		if self.fillingAItems:
+			return
+
+		basePaths = [path]
+		if self.core.useLocalFiles:
+			gPath = path.replace(self.core.localProjectPath, self.core.projectPath)
+			basePaths = [gPath, gPath.replace(self.core.projectPath, self.core.localProjectPath)]
+
+		crawler = AssetCrawler.AssetCrawler(index=self.core.projectIndex)
+		self.scanRunner.start("aItem_" + path, crawler.crawl, args=[basePaths, False], onChunk=lambda x: self.aItemCrawled(path, x))
+
+
+	@err_decorator
+	def aItemCrawled(self, path, node):
+		aName = path.replace(self.aBasePath, "")
+		if self.core.useLocalFiles:
+			aName = aName.replace(self.aBasePath.replace(self.core.projectPath, self.core.localProjectPath), "")
+		aName = aName[1:]
+
+		for item in self.tw_aHierarchy.findItems(path, Qt.MatchExactly | Qt.MatchRecursive, 1):
+			item.takeChildren()
+			self.fillingAItems = True
+			try:
+				self.fillAssetItem(item, node, aName)
+			finally:
+				self.fillingAItems = False
+
 
 	@err_decorator
 	def refreshAItem(self, item, expanded=True):
@@ -1853,15 +1988,14 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		dirContent = []
 		dirContentPaths = []
 
-		if os.path.exists(path):
-			gContent = os.listdir(path)
-			dirContent += gContent
-			dirContentPaths += [os.path.join(path,x) for x in gContent]
+		gDirs, gFiles = self.core.projectIndex.getDirContent(path)
+		dirContent += gDirs + gFiles
+		dirContentPaths += [os.path.join(path,x) for x in gDirs]
 
-		if self.core.useLocalFiles and os.path.exists(lpath):
-			lContent = os.listdir(lpath)
-			dirContent += lContent
-			dirContentPaths += [os.path.join(lpath,x) for x in lContent]
+		if self.core.useLocalFiles:
+			lDirs, lFiles = self.core.projectIndex.getDirContent(lpath)
+			dirContent += lDirs + lFiles
+			dirContentPaths += [os.path.join(lpath,x) for x in lDirs]
 
 		isAsset = False
 		if "Export" in dirContent and "Playblasts" in dirContent and "Rendering" in dirContent and "Scenefiles" in dirContent:
@@ -1871,18 +2005,17 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			item.setText(2, "Folder")
 			childs = []
 			for i in dirContentPaths:
-				if os.path.isdir(i):
-					aName = i.replace(self.aBasePath, "")
-					if self.core.useLocalFiles:
-						aName = aName.replace(self.aBasePath.replace(self.core.projectPath, self.core.localProjectPath), "")
-					aName = aName[1:]
-
-					if os.path.basename(i) not in childs and aName not in self.omittedEntities["Asset"]:
-						child = QTreeWidgetItem([os.path.basename(i), i])
-						item.addChild(child)
-						childs.append(os.path.basename(i))
-						if expanded:
-							self.refreshAItem(child, expanded=False)
+				aName = i.replace(self.aBasePath, "")
+				if self.core.useLocalFiles:
+					aName = aName.replace(self.aBasePath.replace(self.core.projectPath, self.core.localProjectPath), "")
+				aName = aName[1:]
+
+				if os.path.basename(i) not in childs and aName not in self.omittedEntities["Asset"]:
+					child = QTreeWidgetItem([os.path.basename(i), i])
+					item.addChild(child)
+					childs.append(os.path.basename(i))
+					if expanded:
+						self.refreshAItem(child, expanded=False)
 
 		if isAsset:
 			iFont = item.font(0)
@@ -1916,16 +2049,15 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 		dirContent = []
 
-		if os.path.exists(path):
-			dirContent += [os.path.join(path,x) for x in os.listdir(path)]
+		dirContent += [os.path.join(path,x) for x in self.core.projectIndex.getDirs(path)]
 
-		if self.core.useLocalFiles and os.path.exists(lpath):
-			dirContent += [os.path.join(lpath,x) for x in os.listdir(lpath)]
+		if self.core.useLocalFiles:
+			dirContent += [os.path.join(lpath,x) for x in self.core.projectIndex.getDirs(lpath)]
 
 		addedSteps = []
 		for i in sorted(dirContent, key=lambda x: os.path.basename(x)):
 			stepName = os.path.basename(i)
-			if os.path.isdir(i) and stepName not in addedSteps:
+			if stepName not in addedSteps:
 				sItem = QListWidgetItem(stepName)
 				self.lw_aPipeline.addItem(sItem)
 				addedSteps.append(stepName)
@@ -1949,15 +2081,10 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 			dirContent = []
 
-			if os.path.exists(path):
-				for k in os.walk(path):
-					dirContent += [os.path.join(path,x) for x in k[2]]
-					break
+			dirContent += [os.path.join(path,x) for x in self.core.projectIndex.getFiles(path)]
 
-			if self.core.useLocalFiles and os.path.exists(lpath):
-				for k in os.walk(lpath):
-					dirContent += [os.path.join(lpath,x) for x in k[2]]
-					break
+			if self.core.useLocalFiles:
+				dirContent += [os.path.join(lpath,x) for x in self.core.projectIndex.getFiles(lpath)]
 
 			for k in dirContent:
 				if self.core.useLocalFiles and k.replace(self.core.localProjectPath, self.core.projectPath) in scenefiles:
@@ -2064,29 +2191,29 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		self.refreshAStep()
 
 		if self.gb_renderings.isVisible() and self.chb_autoUpdate.isChecked():
-			self.updateTasks()
+			self.updateTasks(background=True)
 
 
 	@err_decorator
 	def getShots(self):
+		self.refreshOmittedEntities()
+		return self.getShotData()
+
+
+	# doesn't access any widgets, so it can be used in a worker thread
+	def getShotData(self):
 		if self.core.useLocalFiles:
 			lBasePath = self.sBasePath.replace(self.core.projectPath, self.core.localProjectPath)
 
-		self.refreshOmittedEntities()
-
 		dirs = []
-		for i in os.walk(self.sBasePath):
-			for k in i[1]:
-				dirs.append(os.path.join(i[0], k))
-			break
+		for k in self.core.projectIndex.getDirs(self.sBasePath):
+			dirs.append(os.path.join(self.sBasePath, k))
 
 		if self.core.useLocalFiles:
-			for i in os.walk(lBasePath):
-				for k in i[1]:
-					ldir = os.path.join(i[0], k)
-					if ldir.replace(self.core.localProjectPath, self.core.projectPath) not in dirs:
-						dirs.append(ldir)
-				break
+			for k in self.core.projectIndex.getDirs(lBasePath):
+				ldir = os.path.join(lBasePath, k)
+				if ldir.replace(self.core.localProjectPath, self.core.projectPath) not in dirs:
+					dirs.append(ldir)
 
 		sequences = []
 		shots = []
@@ -2117,10 +2244,24 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 
 	@err_decorator
-	def refreshShots(self):
+	def refreshShots(self, background=False, callback=None):
+		if background:
+			self.refreshOmittedEntities()
+			self.scanRunner.start("shots", self.getShotData, onChunk=lambda x: self.populateShots(x, callback))
+			return
+
+		self.scanRunner.cancel("shots")
+		self.populateShots(self.getShots(), callback)
+
+
+	@err_decorator
+	def populateShots(self, shotData, callback=None):
 		self.tw_sShot.clear()
 
-		sequences, shots = self.getShots()
+		if shotData is None:
+			sequences, shots = [], []
+		else:
+			sequences, shots = shotData
 
 		for seqName in sequences:
 			seqItem = QTreeWidgetItem([seqName, seqName + "-"])
@@ -2147,6 +2288,9 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			self.refreshsStep()
 			self.refreshShotinfo()
 
+		if callback is not None:
+			callback()
+
 
 	@err_decorator
 	def sItemCollapsed(self, item):
@@ -2166,12 +2310,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		model = QStandardItemModel()
 
 		if self.cursShots is not None:
-			foldercont = ["","",""]
-			for i in os.walk(os.path.join(self.sBasePath, self.cursShots, "Scenefiles")):
-				foldercont = i
-				break
-
-			for i in sorted(foldercont[1]):
+			for i in self.core.projectIndex.getDirs(os.path.join(self.sBasePath, self.cursShots, "Scenefiles")):
 				item = QStandardItem(i)
 				model.appendRow(item)
 
@@ -2193,12 +2332,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		model = QStandardItemModel()
 
 		if self.cursStep is not None:
-			foldercont = ["","",""]
-			for i in os.walk(os.path.join(self.sBasePath, self.cursShots, "Scenefiles", self.cursStep)):
-				foldercont = i
-				break
-				
-			for i in sorted(foldercont[1]):
+			for i in self.core.projectIndex.getDirs(os.path.join(self.sBasePath, self.cursShots, "Scenefiles", self.cursStep)):
 				item = QStandardItem(i)
 				model.appendRow(item)
 
@@ -2234,20 +2368,17 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		#example filename: shot_0010_mod_main_v0002_details-added_rfr_.max
 
 		if self.cursCat is not None:
-			foldercont = ["","",""]
 			scenefiles = []
 			sscenepath = os.path.join(self.sBasePath, self.cursShots, "Scenefiles", self.cursStep, self.cursCat)
-			for i in os.walk(sscenepath):
-				for k in i[2]:
-					scenefiles.append(os.path.join(i[0], k))
-				break
+			for k in self.core.projectIndex.getFiles(sscenepath):
+				scenefiles.append(os.path.join(sscenepath, k))
+
 			if self.core.useLocalFiles:
-				for i in os.walk(sscenepath.replace(self.core.projectPath, self.core.localProjectPath)):
-					for k in i[2]:
-						fpath = os.path.join(i[0], k)
-						if not fpath.replace(self.core.localProjectPath, self.core.projectPath) in scenefiles:
-							scenefiles.append(fpath)
-					break
+				lscenepath = sscenepath.replace(self.core.projectPath, self.core.localProjectPath)
+				for k in self.core.projectIndex.getFiles(lscenepath):
+					fpath = os.path.join(lscenepath, k)
+					if not fpath.replace(self.core.localProjectPath, self.core.projectPath) in scenefiles:
+						scenefiles.append(fpath)
 
 			appfilter = []
 
@@ -2347,7 +2478,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		self.refreshsStep()
 
 		if self.gb_renderings.isVisible() and self.chb_autoUpdate.isChecked():
-			self.updateTasks()
+			self.updateTasks(background=True)
 
 
 	@err_decorator
@@ -2413,19 +2544,29 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			imgPath = os.path.join(os.path.dirname(self.core.prismIni), "Shotinfo", "%s_preview.jpg" % self.cursShots)
 
 			if os.path.exists(imgPath):
-				pm = self.getImgPMap(imgPath)
-				if pm.width() > 0 and pm.height() > 0:
-					if (pm.width()/float(pm.height())) > 1.7778:
-						pmap = pm.scaledToWidth(self.shotPrvXres)
-					else:
-						pmap = pm.scaledToHeight(self.shotPrvYres)
+				self.scanRunner.start("shotPreview", self.core.thumbnailCache.getImage, args=[imgPath, self.shotPrvXres, self.shotPrvYres, self.getImgQImage], onChunk=self.setShotPreview)
+			else:
+				self.scanRunner.cancel("shotPreview")
 		else:
 			rangeText = "No shot selected"
+			self.scanRunner.cancel("shotPreview")
+
+		self.l_framerange.setText(rangeText)
+		self.setShotPreview(None)
+
+
+	@err_decorator
+	def setShotPreview(self, img):
+		pmap = None
+		if img is not None and img.width() > 0 and img.height() > 0:
+			if (img.width()/float(img.height())) > 1.7778:
+				pmap = QPixmap.fromImage(img.scaledToWidth(self.shotPrvXres))
+			else:
+				pmap = QPixmap.fromImage(img.scaledToHeight(self.shotPrvYres))
 
 		if pmap is None:
 			pmap = self.emptypmapPrv
 
-		self.l_framerange.setText(rangeText)
 		self.l_shotPreview.setMinimumSize(pmap.width(), pmap.height())
 		self.l_shotPreview.setPixmap(pmap)
 
@@ -2511,8 +2652,6 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 	@err_decorator
 	def refreshFCat(self):
-
-		model = QStandardItemModel()
 		hpath = ""
 		for i in self.fhierarchy:
 			hpath += i + os.sep
@@ -2521,12 +2660,44 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 		self.fpath = os.path.join(self.core.projectPath, self.core.getConfig('paths', "assets", configPath=self.core.prismIni), hpath)
 
-		foldercont = ["","",""]
-		for i in os.walk(self.fpath):
+		for i in range(len(self.fhierarchy)):
+			self.fhbuttons[i].setHidden(False)
+			self.fhbuttons[i].setText(self.fhierarchy[i])
+
+		for i in range(10, len(self.fhierarchy), -1):
+			self.fhbuttons[i-1].setHidden(True)
+
+		self.scanRunner.start("fCat", self.getFCatData, args=[self.fpath, self.fclickedon if self.fbottom else None], onChunk=self.populateFCat)
+
+
+	# runs in a worker thread. Returns the subfolders of the current category and the files with their mtimes
+	# of the clicked subfolder or of the category itself.
+	def getFCatData(self, fpath, clickedOn):
+		foldercont = ["","",[]]
+		for i in os.walk(fpath):
 			foldercont = i
 			break
 		dirs = foldercont[1]
 
+		if clickedOn is not None:
+			for i in os.walk(os.path.join(fpath, clickedOn)):
+				foldercont = i
+				break
+
+		files = []
+		for i in foldercont[2]:
+			try:
+				files.append([i, os.path.getmtime(os.path.join(foldercont[0], i))])
+			except OSError:
+				continue
+
+		return [dirs, foldercont[0], files]
+
+
+	@err_decorator
+	def populateFCat(self, data):
+		dirs, fileDir, files = data
+		model = QStandardItemModel()
 		for idx, val in enumerate(dirs):
 			item = QStandardItem(val)
 			if self.fbottom and val == self.fclickedon:
@@ -2538,21 +2709,17 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		if self.fbottom:
 			index = model.createIndex(current,0)
 			self.lw_fCategory.setCurrentIndex(index)
-			for i in os.walk(os.path.join(self.fpath, self.fclickedon)):
-				foldercont = i
-				break
 
 		twSorting = [self.tw_fFiles.horizontalHeader().sortIndicatorSection(), self.tw_fFiles.horizontalHeader().sortIndicatorOrder()]
 		model = QStandardItemModel()
 
 		model.setHorizontalHeaderLabels(["Filename", "Date"])
 
-		for i in foldercont[2]:
+		for i, mtime in files:
 			row = []
 			item = QStandardItem(i)
 			row.append(item)
-			filepath = os.path.join(foldercont[0], i)
-			cdate = datetime.datetime.fromtimestamp(os.path.getmtime(filepath))
+			cdate = datetime.datetime.fromtimestamp(mtime)
 			cdate = cdate.replace(microsecond = 0)
 			cdate = cdate.strftime("%d.%m.%y,  %X")
 			item = QStandardItem()
@@ -2560,7 +2727,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			item.setData(QDateTime.fromString( cdate, "dd.MM.yy,  hh:mm:ss").addYears(100), 0)
 		#	item.setToolTip(cdate)
 			row.append(item)
-			item = QStandardItem(os.path.join(foldercont[0], i))
+			item = QStandardItem(os.path.join(fileDir, i))
 			row.append(item)
 
 			model.appendRow(row)
@@ -2572,14 +2739,6 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		self.tw_fFiles.sortByColumn(twSorting[0], twSorting[1])
 
 
-		for i in range(len(self.fhierarchy)):
-			self.fhbuttons[i].setHidden(False)
-			self.fhbuttons[i].setText(self.fhierarchy[i])
-
-		for i in range(10, len(self.fhierarchy), -1):
-			self.fhbuttons[i-1].setHidden(True)
-
-
 	@err_decorator
 	def setRecent(self):
 		model = QStandardItemModel()
@@ -3080,32 +3239,34 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		dstPath = localPath.replace(self.core.localProjectPath, self.core.projectPath)
 
 		if os.path.isdir(localPath):
+			# an existing manifest means, that a previous copy to this folder was interrupted and can be continued.
+			# Only the files, which are listed in it, may exist in the global directory.
+			manifestPath = self.getCopyManifestPath(dstPath)
+			manifest = self.copyEngine.loadManifest(manifestPath)
+			if manifest is None:
+				knownFiles = set()
+			else:
+				knownFiles = set([os.path.normcase(x[1]) for x in manifest.get("files", [])])
+
 			if os.path.exists(dstPath):
-				for i in os.walk(dstPath):
-					if i[2] != []:
+				for root, dirs, fileNames in os.walk(dstPath):
+					if len([x for x in fileNames if os.path.normcase(os.path.join(root, x)) not in knownFiles]) > 0:
 						QMessageBox.information(self.core.messageParent, "Copy to global", "Found existing files in the global directory. Copy to global was canceled.")
 						return
 
-				shutil.rmtree(dstPath)
+				if manifest is None:
+					shutil.rmtree(dstPath)
 
-			shutil.copytree(localPath, dstPath)
-			
-			if "vidPrw" in mediaPlayback and not mediaPlayback["vidPrw"].closed:
-				for i in range(6):
-					mediaPlayback["vidPrw"].close()
-					time.sleep(0.5)
-					if mediaPlayback["vidPrw"].closed:
-						break
+			files = []
+			for root, dirs, fileNames in os.walk(localPath):
+				dstRoot = os.path.join(dstPath, os.path.relpath(root, localPath))
+				if not os.path.exists(dstRoot):
+					os.makedirs(dstRoot)
 
-			try:
-				shutil.rmtree(localPath)
-			except:
-				QMessageBox.warning(self.core.messageParent, "Copy to global", "Could not delete the local file. Probably it is used by another process.")
+				for i in fileNames:
+					files.append([os.path.join(root, i), os.path.join(dstRoot, i)])
 
-			curTab = self.tbw_browser.currentWidget().property("tabType")
-			curData = [curTab, self.cursShots, self.curRTask, self.curRVersion, self.curRLayer]
-			self.updateTasks()
-			self.showRender(curData[0], curData[1], curData[2], curData[3].replace(" (local)", ""), curData[4])
+			self.startCopy(files, "Copy to global", manifestPath=manifestPath, onFinished=lambda x: self.copyToGlobalFinished(localPath, mediaPlayback, x))
 		else:
 			if not os.path.exists(os.path.dirname(dstPath)):
 				os.makedirs(os.path.dirname(dstPath))
@@ -3118,6 +3279,91 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 				self.refreshSFile()
 
 
+	@err_decorator
+	def copyToGlobalFinished(self, localPath, mediaPlayback, result):
+		if result["canceled"] or len(result["failed"]) > 0:
+			return
+
+		if "vidPrw" in mediaPlayback and not mediaPlayback["vidPrw"].closed:
+			for i in range(6):
+				mediaPlayback["vidPrw"].close()
+				time.sleep(0.5)
+				if mediaPlayback["vidPrw"].closed:
+					break
+
+		try:
+			shutil.rmtree(localPath)
+		except:
+			QMessageBox.warning(self.core.messageParent, "Copy to global", "Could not delete the local file. Probably it is used by another process.")
+
+		curTab = self.tbw_browser.currentWidget().property("tabType")
+		curData = [curTab, self.cursShots, self.curRTask, self.curRVersion, self.curRLayer]
+		self.updateTasks()
+		self.showRender(curData[0], curData[1], curData[2], curData[3].replace(" (local)", ""), curData[4])
+
+
+	# the manifests of the copies are kept in the user preferences folder, so that no files are left in the
+	# destination, if a copy is interrupted
+	@err_decorator
+	def getCopyManifestPath(self, dstPath):
+		manifestName = hashlib.md5(os.path.normcase(os.path.normpath(dstPath)).encode("utf-8")).hexdigest() + ".json"
+		return os.path.join(os.path.dirname(self.core.userini), "CopyManifests", manifestName)
+
+
+	# copies the [source, destination] pairs in files in the background and shows the progress
+	@err_decorator
+	def startCopy(self, files, title, manifestPath=None, onFinished=None):
+		if self.copyEngine.isRunning():
+			QMessageBox.warning(self.core.messageParent, title, "Another copy process is still running. Please wait until it is finished.")
+			return False
+
+		self.copyDlg = QProgressDialog("Copying files...", "Cancel", 0, 1000, self)
+		self.copyDlg.setWindowTitle(title)
+		self.copyDlg.setMinimumDuration(0)
+		self.copyDlg.setAutoClose(False)
+		self.copyDlg.setAutoReset(False)
+		self.copyDlg.canceled.connect(self.copyEngine.cancel)
+		self.copyDlg.title = title
+		self.copyDlg.onFinished = onFinished
+		self.copyDlg.show()
+
+		self.copyEngine.start(files, manifestPath=manifestPath)
+		return True
+
+
+	@err_decorator
+	def copyProgress(self, data):
+		if self.copyDlg is None:
+			return
+
+		doneBytes, totalBytes, doneFiles, totalFiles = data
+		if totalBytes > 0:
+			self.copyDlg.setValue(int(1000 * doneBytes / float(totalBytes)))
+
+		self.copyDlg.setLabelText("Copying files... (%s/%s)" % (doneFiles, totalFiles))
+
+
+	@err_decorator
+	def copyFinished(self, result):
+		if self.copyDlg is None:
+			return
+
+		copyDlg = self.copyDlg
+		self.copyDlg = None
+		copyDlg.close()
+
+		if len(result["failed"]) > 0:
+			failedFiles = "\n".join([x[0] for x in result["failed"][:10]])
+			if len(result["failed"]) > 10:
+				failedFiles += "\n..."
+
+			QMessageBox.warning(self.core.messageParent, copyDlg.title, "%s files could not be copied:\n\n%s\n\nStarting the copy again continues with the missing files." % (len(result["failed"]), failedFiles))
+			self.core.writeErrorLog("%s ERROR - ProjectBrowser %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, result["failed"][0][1]))
+
+		if copyDlg.onFinished is not None:
+			copyDlg.onFinished(result)
+
+
 	@err_decorator
 	def omitEntity(self, eType, ePath):
 		msgText = "Are you sure you want to omit %s \"%s\"?\n\nThis will make the %s be ignored by Prism, but all scenefiles and renderings remain on the hard drive." % (eType.lower(), ePath, eType.lower())
@@ -3304,12 +3550,15 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 	@err_decorator
 	def getMediaTasks(self, entityName=None, entityType=None):
-		mediaTasks = {"3d":[], "2d":[], "playblast":[], "external":[]}
+		self.getRenderBasePath(entityName, entityType)
+		return self.getMediaTasksFromPath(self.renderBasePath)
+
 
+	@err_decorator
+	def getRenderBasePath(self, entityName=None, entityType=None):
 		if entityType is None:
 			entityType = self.tbw_browser.currentWidget().property("tabType")
 
-		foldercont = []
 		self.renderBasePath = None
 
 		if entityName is None:
@@ -3324,63 +3573,82 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			elif entityType == "Shots":
 				self.renderBasePath = os.path.join(self.core.projectPath, self.scenes, "Shots", entityName)
 
-		if self.renderBasePath is not None:
-			for i in os.walk(os.path.join(self.renderBasePath, "Rendering", "3dRender")):
-				for k in sorted(i[1]):
-					mediaTasks["3d"].append([k, "3d", os.path.join(i[0], k)])
-				break
+		return self.renderBasePath
 
-			for i in os.walk(os.path.join(self.renderBasePath, "Rendering", "2dRender")):
-				for k in sorted(i[1]):
-					mediaTasks["2d"].append([k +" (2d)", "2d", os.path.join(i[0], k)])
-				break
 
-			for i in os.walk(os.path.join(self.renderBasePath, "Rendering", "external")):
-				for k in sorted(i[1]):
-					mediaTasks["external"].append([k +" (external)", "external", os.path.join(i[0], k)])
-				break
+	# doesn't access any widgets, so it can be used in a worker thread
+	def getMediaTasksFromPath(self, basePath):
+		mediaTasks = {"3d":[], "2d":[], "playblast":[], "external":[]}
 
-			for i in os.walk(os.path.join(self.renderBasePath, "Playblasts")):
-				for k in sorted(i[1]):
-					mediaTasks["playblast"].append([k +" (playblast)", "playblast", os.path.join(i[0], k)])
-				break
+		if basePath is not None:
+			taskPath = os.path.join(basePath, "Rendering", "3dRender")
+			for k in self.core.projectIndex.getDirs(taskPath):
+				mediaTasks["3d"].append([k, "3d", os.path.join(taskPath, k)])
 
-			if self.core.useLocalFiles:
-				for i in os.walk(os.path.join(self.renderBasePath.replace(self.core.projectPath, self.core.localProjectPath), "Rendering", "3dRender")):
-					for k in sorted(i[1]):
-						tname = k + " (local)"
-						taskNames = [x[0] for x in mediaTasks["3d"]]
-						if tname not in taskNames and k not in taskNames:
-							mediaTasks["3d"].append([tname, "3d", os.path.join(i[0], k)])
-					break
+			taskPath = os.path.join(basePath, "Rendering", "2dRender")
+			for k in self.core.projectIndex.getDirs(taskPath):
+				mediaTasks["2d"].append([k +" (2d)", "2d", os.path.join(taskPath, k)])
 
-				for i in os.walk(os.path.join(self.renderBasePath.replace(self.core.projectPath, self.core.localProjectPath), "Rendering", "2dRender")):
-					for k in sorted(i[1]):
-						tname = k + " (2d)"
-						taskNames = [x[0] for x in mediaTasks["2d"]]
-						if tname not in mediaTasks["2d"]:
-							mediaTasks["2d"].append([tname, "2d", os.path.join(i[0], k)])
-					break
+			taskPath = os.path.join(basePath, "Rendering", "external")
+			for k in self.core.projectIndex.getDirs(taskPath):
+				mediaTasks["external"].append([k +" (external)", "external", os.path.join(taskPath, k)])
 
-				for i in os.walk(os.path.join(self.renderBasePath.replace(self.core.projectPath, self.core.localProjectPath), "Playblasts")):
-					for k in sorted(i[1]):
-						tname = k + " (playblast)"
-						taskNames = [x[0] for x in mediaTasks["playblast"]]
-						if tname not in mediaTasks["playblast"]:
-							mediaTasks["playblast"].append([tname, "playblast", os.path.join(i[0], k)])
-					break
+			taskPath = os.path.join(basePath, "Playblasts")
+			for k in self.core.projectIndex.getDirs(taskPath):
+				mediaTasks["playblast"].append([k +" (playblast)", "playblast", os.path.join(taskPath, k)])
+
+			if self.core.useLocalFiles:
+				lBasePath = basePath.replace(self.core.projectPath, self.core.localProjectPath)
+
+				taskPath = os.path.join(lBasePath, "Rendering", "3dRender")
+				for k in self.core.projectIndex.getDirs(taskPath):
+					tname = k + " (local)"
+					taskNames = [x[0] for x in mediaTasks["3d"]]
+					if tname not in taskNames and k not in taskNames:
+						mediaTasks["3d"].append([tname, "3d", os.path.join(taskPath, k)])
+
+				taskPath = os.path.join(lBasePath, "Rendering", "2dRender")
+				for k in self.core.projectIndex.getDirs(taskPath):
+					tname = k + " (2d)"
+					taskNames = [x[0] for x in mediaTasks["2d"]]
+					if tname not in mediaTasks["2d"]:
+						mediaTasks["2d"].append([tname, "2d", os.path.join(taskPath, k)])
+
+				taskPath = os.path.join(lBasePath, "Playblasts")
+				for k in self.core.projectIndex.getDirs(taskPath):
+					tname = k + " (playblast)"
+					taskNames = [x[0] for x in mediaTasks["playblast"]]
+					if tname not in mediaTasks["playblast"]:
+						mediaTasks["playblast"].append([tname, "playblast", os.path.join(taskPath, k)])
 
 		return mediaTasks
 
 
 	@err_decorator
-	def updateTasks(self):
+	def updateTasks(self, background=False):
 		self.renderRefreshEnabled = False
 
 		self.curRTask = ""
 		self.lw_task.clear()
 
-		mediaTasks = self.getMediaTasks()
+		if background:
+			self.curRVersion = ""
+			self.lw_version.clear()
+			self.scanRunner.cancel("versions")
+			self.renderRefreshEnabled = True
+			self.scanRunner.start("tasks", self.getMediaTasksFromPath, args=[self.getRenderBasePath()], onChunk=lambda x: self.populateTasks(x, background=True))
+			return
+
+		self.scanRunner.cancel("tasks")
+		self.populateTasks(self.getMediaTasks())
+
+
+	@err_decorator
+	def populateTasks(self, mediaTasks, background=False):
+		self.renderRefreshEnabled = False
+
+		self.curRTask = ""
+		self.lw_task.clear()
 
 		for i in ["3d", "2d", "playblast", "external"]:
 			for k in mediaTasks[i]:
@@ -3395,48 +3663,80 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 		self.renderRefreshEnabled = True
 
-
-		self.updateVersions()
+		self.updateVersions(background=background)
 
 
 	@err_decorator
-	def updateVersions(self):
+	def updateVersions(self, background=False):
 		if not self.renderRefreshEnabled:
 			return
 
 		self.curRVersion = ""
 		self.lw_version.clear()
 
-		if len(self.lw_task.selectedItems()) == 1:
-			foldercont = self.getRenderVersions(task=self.curRTask)
-			foldercont.sort()
-			for i in reversed(foldercont):
-				item = QListWidgetItem(i)
-				if self.curRTask.endswith(" (playblast)"):
-					versionInfoPath = os.path.join(self.renderBasePath, "Playblasts", self.curRTask.replace(" (playblast)", ""), i, "versioninfo.ini")
-				elif self.curRTask.endswith(" (2d)"):
-					versionInfoPath = os.path.join(self.renderBasePath, "Rendering", "2dRender", self.curRTask.replace(" (2d)", ""), i, "versioninfo.ini")
-				elif self.curRTask.endswith(" (external)"):
-					versionInfoPath = os.path.join(self.renderBasePath, "Rendering", "external", self.curRTask.replace(" (external)", ""), i, "versioninfo.ini")
-				else:
-					versionInfoPath = os.path.join(self.renderBasePath, "Rendering", "3dRender", self.curRTask, i, "versioninfo.ini")
+		if len(self.lw_task.selectedItems()) != 1:
+			self.scanRunner.cancel("versions")
+			self.populateVersions([])
+			return
 
-				if self.core.useLocalFiles and i.endswith(" (local)"):
-					versionInfoPath = versionInfoPath.replace(self.core.projectPath, self.core.localProjectPath)
+		if background:
+			self.scanRunner.start("versions", self.getVersionData, args=[self.curRTask, self.renderBasePath], onChunk=self.populateVersions)
+			return
 
-				if os.path.exists(versionInfoPath):
-					vConfig = ConfigParser()
-					vConfig.read(versionInfoPath)
+		self.scanRunner.cancel("versions")
+		self.populateVersions(self.getVersionData(self.curRTask, self.renderBasePath))
 
-					prjMngNames = [[x, x.lower() + "-url"] for x in self.core.prjManagers]
-					for i in prjMngNames:
-						if vConfig.has_option("information", i[1]):
-							f = item.font()
-							f.setBold(True)
-							item.setFont(f)
-							break
 
-				self.lw_version.addItem(item)
+	# returns [versionName, hasProjectManagerUrl] pairs. Doesn't access any widgets, so it can be used in a worker thread
+	def getVersionData(self, task, basePath):
+		versionData = []
+		if basePath is None:
+			return versionData
+
+		foldercont = self.getRenderVersionsFromPath(self.getRenderTaskPath(task, basePath))
+		foldercont.sort()
+		prjMngNames = [[x, x.lower() + "-url"] for x in self.core.prjManagers]
+		for i in reversed(foldercont):
+			if task.endswith(" (playblast)"):
+				versionInfoPath = os.path.join(basePath, "Playblasts", task.replace(" (playblast)", ""), i, "versioninfo.ini")
+			elif task.endswith(" (2d)"):
+				versionInfoPath = os.path.join(basePath, "Rendering", "2dRender", task.replace(" (2d)", ""), i, "versioninfo.ini")
+			elif task.endswith(" (external)"):
+				versionInfoPath = os.path.join(basePath, "Rendering", "external", task.replace(" (external)", ""), i, "versioninfo.ini")
+			else:
+				versionInfoPath = os.path.join(basePath, "Rendering", "3dRender", task, i, "versioninfo.ini")
+
+			if self.core.useLocalFiles and i.endswith(" (local)"):
+				versionInfoPath = versionInfoPath.replace(self.core.projectPath, self.core.localProjectPath)
+
+			hasUrl = False
+			if os.path.exists(versionInfoPath):
+				vConfig = ConfigParser()
+				vConfig.read(versionInfoPath)
+
+				for k in prjMngNames:
+					if vConfig.has_option("information", k[1]):
+						hasUrl = True
+						break
+
+			versionData.append([i, hasUrl])
+
+		return versionData
+
+
+	@err_decorator
+	def populateVersions(self, versionData):
+		self.curRVersion = ""
+		self.lw_version.clear()
+
+		for i in versionData:
+			item = QListWidgetItem(i[0])
+			if i[1]:
+				f = item.font()
+				f.setBold(True)
+				item.setFont(f)
+
+			self.lw_version.addItem(item)
 
 		self.renderRefreshEnabled = False
 		self.lw_version.setCurrentRow(0)
@@ -3479,30 +3779,34 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 	@err_decorator
 	def getRenderVersions(self, task="", taskPath=None):
-		foldercont = []
-
 		if taskPath is None:
 			if self.renderBasePath is None:
-				return foldercont
+				return []
 
-			if task.endswith(" (playblast)"):
-				taskPath = os.path.join(self.renderBasePath, "Playblasts", task.replace(" (playblast)", ""))
-			elif task.endswith(" (2d)"):
-				taskPath = os.path.join(self.renderBasePath, "Rendering", "2dRender", task.replace(" (2d)", ""))
-			elif task.endswith(" (external)"):
-				taskPath = os.path.join(self.renderBasePath, "Rendering", "external", task.replace(" (external)", ""))
-			else:
-				taskPath = os.path.join(self.renderBasePath, "Rendering", "3dRender", task.replace(" (local)", ""))
+			taskPath = self.getRenderTaskPath(task, self.renderBasePath)
+
+		return self.getRenderVersionsFromPath(taskPath)
+
+
+	def getRenderTaskPath(self, task, basePath):
+		if task.endswith(" (playblast)"):
+			taskPath = os.path.join(basePath, "Playblasts", task.replace(" (playblast)", ""))
+		elif task.endswith(" (2d)"):
+			taskPath = os.path.join(basePath, "Rendering", "2dRender", task.replace(" (2d)", ""))
+		elif task.endswith(" (external)"):
+			taskPath = os.path.join(basePath, "Rendering", "external", task.replace(" (external)", ""))
+		else:
+			taskPath = os.path.join(basePath, "Rendering", "3dRender", task.replace(" (local)", ""))
+
+		return taskPath
 
-		for i in os.walk(taskPath):
-			foldercont = i[1]
-			break
+
+	def getRenderVersionsFromPath(self, taskPath):
+		foldercont = self.core.projectIndex.getDirs(taskPath)
 
 		if self.core.useLocalFiles:
-			for i in os.walk(taskPath.replace(self.core.projectPath, self.core.localProjectPath)):
-				for k in i[1]:
-					foldercont.append(k +" (local)")
-				break
+			for k in self.core.projectIndex.getDirs(taskPath.replace(self.core.projectPath, self.core.localProjectPath)):
+				foldercont.append(k +" (local)")
 
 		return foldercont
 
@@ -3519,9 +3823,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			else:
 				rPath = os.path.join(self.renderBasePath, "Rendering", "3dRender", task, version)
 
-			for i in os.walk(rPath):
-				foldercont = i[1]
-				break
+			foldercont = self.core.projectIndex.getDirs(rPath)
 
 		return foldercont
 
@@ -3606,9 +3908,12 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		mediaPlayback["prevCurImg"] = 0
 		mediaPlayback["curImg"] = 0
 		mediaPlayback["seq"] = []
+		mediaPlayback["seqMTime"] = 0
+		mediaPlayback["droppedKey"] = None
 		mediaPlayback["prvIsSequence"] = False
 
-		QPixmapCache.clear()
+		self.framePrefetcher.cancelPending()
+		self.scanRunner.cancel("firstFrame_" + mediaPlayback["name"])
 
 		mediaBase, mediaFolders, mediaFiles = mediaPlayback["getMediaBase"]()
 
@@ -3650,6 +3955,12 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 				mediaPlayback["pduration"] = len(mediaPlayback["seq"])
 				imgPath = str(os.path.join(mediaBase, base))
+				# frames, which were rendered again in place, get new cache keys through the mtime of the first frame
+				try:
+					mediaPlayback["seqMTime"] = os.path.getmtime(imgPath)
+				except:
+					mediaPlayback["seqMTime"] = 0
+
 				if os.path.exists(imgPath) and mediaPlayback["pduration"] == 1 and os.path.splitext(imgPath)[1] in [".mp4", ".mov"]:
 					if os.stat(imgPath).st_size == 0:
 						mediaPlayback["vidPrw"] = "Error"
@@ -3669,16 +3980,16 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 					mediaPlayback["timeline"].setEasingCurve(QEasingCurve.Linear)
 					mediaPlayback["timeline"].setLoopCount(0)
 					mediaPlayback["timeline"].frameChanged.connect(lambda x: self.changeImg(x, mediaPlayback=mediaPlayback))
-					QPixmapCache.setCacheLimit(2097151)
 					mediaPlayback["curImg"] = 0
 					mediaPlayback["timeline"].start()
+					self.prefetchFrames(mediaPlayback)
 
 
 					if mediaPlayback["tlPaused"]:
 						mediaPlayback["timeline"].setPaused(True)
-						self.changeImg(mediaPlayback=mediaPlayback)
+						self.showFirstFrame(mediaPlayback)
 					elif mediaPlayback["pduration"] < 3:
-						self.changeImg(mediaPlayback=mediaPlayback)
+						self.showFirstFrame(mediaPlayback)
 
 					return True
 			else:
@@ -3806,6 +4117,14 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 	def getImgPMap(self, path):
 		if platform.system() == "Windows":
 			return QPixmap(path)
+		else:
+			return QPixmap.fromImage(self.getImgQImage(path))
+
+
+	# can be used outside of the GUI thread
+	def getImgQImage(self, path):
+		if platform.system() == "Windows":
+			return QImage(path)
 		else:
 			try:
 				im = Image.open(path)
@@ -3816,9 +4135,53 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 
 				qimg = QImage(data, im.size[0], im.size[1], QImage.Format_ARGB32)
 
-				return QPixmap(qimg)
+				return qimg.copy()
 			except:
-				return QPixmap(path)
+				return QImage(path)
+
+
+	def getOiioImage(self, path, resx, resy):
+		imgSrc = oiio.ImageBuf(str(path))
+		rgbImgSrc = oiio.ImageBuf()
+		oiio.ImageBufAlgo.channels(rgbImgSrc, imgSrc, (0,1,2))
+		imgWidth = rgbImgSrc.spec().full_width
+		imgHeight = rgbImgSrc.spec().full_height
+		if (imgWidth/float(imgHeight)) > 1.7778:
+			newImgWidth = resx
+			newImgHeight = resx/float(imgWidth)*imgHeight
+		else:
+			newImgHeight = resy
+			newImgWidth = resy/float(imgHeight)*imgWidth
+
+		newImgWidth = int(newImgWidth)
+		newImgHeight = int(newImgHeight)
+		imgDst = oiio.ImageBuf(oiio.ImageSpec(newImgWidth, newImgHeight, 3, oiio.UINT8))
+		oiio.ImageBufAlgo.resample(imgDst, rgbImgSrc)
+
+		if self.numpyLoaded:
+			# read the whole buffer at once and apply gamma and background as array operations
+			pixels = numpy.asarray(imgDst.get_pixels(oiio.FLOAT), dtype=numpy.float32).reshape(newImgHeight, newImgWidth, 3)
+			pixels = numpy.power(numpy.clip(pixels, 0.0, 1.0), 1.0/2.2)
+			pixels = numpy.where(numpy.isfinite(pixels), pixels, 0.5)
+			imgArr = numpy.ascontiguousarray(pixels * 255, dtype=numpy.uint8)
+
+			# the QImage references the array memory, so a copy is returned, which owns its data
+			qimg = QImage(imgArr.data, newImgWidth, newImgHeight, imgArr.strides[0], QImage.Format_RGB888)
+			return qimg.copy()
+
+		sRGBimg = oiio.ImageBuf()
+		oiio.ImageBufAlgo.pow(sRGBimg, imgDst, (1.0/2.2, 1.0/2.2, 1.0/2.2))
+		bckImg = oiio.ImageBuf(oiio.ImageSpec(newImgWidth, newImgHeight, 3, oiio.UINT8))
+		oiio.ImageBufAlgo.fill (bckImg, (0.5,0.5,0.5))
+		oiio.ImageBufAlgo.paste(bckImg, 0,0,0,0, sRGBimg)
+		qimg = QImage(newImgWidth, newImgHeight, QImage.Format_RGB16)
+		for i in range(newImgWidth):
+			for k in range(newImgHeight):
+				pixel = bckImg.getpixel(i,k)
+				rgb = qRgb(pixel[0]*255, pixel[1]*255, pixel[2]*255)
+				qimg.setPixel(i,k,rgb)
+
+		return qimg
 
 
 	@err_decorator
@@ -3842,77 +4205,136 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 				pmap.save(path, "JPG")
 
 
+	# decodes a frame to a QImage, which is scaled to the preview resolution. Can be used outside of the GUI thread.
+	def getFrameImage(self, path):
+		ext = os.path.splitext(path)[1]
+		fallbackPath = os.path.join(self.core.projectPath, "00_Pipeline", "Fallbacks", "%s.jpg" % ext[1:].lower())
+
+		try:
+			if ext in [".jpg", ".jpeg", ".JPG", ".png", ".tif", ".tiff"]:
+				img = self.getImgQImage(path)
+			elif ext in [".exr", ".dpx"]:
+				if self.oiioLoaded:
+					return self.getOiioImage(path, self.renderResX, self.renderResY)
+
+				elif self.wandLoaded:
+					with wand.image.Image(filename=path) as wimg :
+						imgWidth, imgHeight = [wimg.width, wimg.height]
+						wimg.depth = 8
+						imgArr = numpy.fromstring(wimg.make_blob('RGB'), dtype='uint{}'.format(wimg.depth)).reshape(imgHeight, imgWidth, 3)
+
+					img = QImage(imgArr, imgWidth, imgHeight, QImage.Format_RGB888).copy()
+				else:
+					raise RuntimeError ("no image loader available")
+			else:
+				return None
+
+			if img.width() == 0 or img.height() == 0:
+				return self.getImgQImage(fallbackPath)
+			elif (img.width()/float(img.height())) > 1.7778:
+				return img.scaledToWidth(self.renderResX)
+			else:
+				return img.scaledToHeight(self.renderResY)
+		except:
+			return self.getImgQImage(fallbackPath)
+
+
 	@err_decorator
-	def changeImg(self, frame=0, mediaPlayback=None):
+	def getFrameKey(self, mediaPlayback, frame):
+		if len(mediaPlayback["seq"]) == 1 and os.path.splitext(mediaPlayback["seq"][0])[1] in [".mp4", ".mov"]:
+			curFile = mediaPlayback["seq"][0]
+			imgNum = frame
+		else:
+			curFile = mediaPlayback["seq"][frame]
+			imgNum = 0
+
+		fileName = os.path.join(mediaPlayback["basePath"], curFile)
+		return (fileName, mediaPlayback.get("seqMTime", 0), imgNum)
+
+
+	# shows a prefetched frame, if it was dropped during the playback and no other frame was shown since then
+	@err_decorator
+	def prefetchedFrameReady(self, frameKey):
+		for mediaPlayback in self.mediaPlaybacks.values():
+			if mediaPlayback.get("droppedKey") != frameKey:
+				continue
+
+			mediaPlayback["droppedKey"] = None
+			img = self.frameCache.get(frameKey)
+			if img is not None:
+				mediaPlayback["l_preview"].setPixmap(QPixmap.fromImage(img))
+
+
+	# starts decoding the frames ahead of the current frame in the background
+	@err_decorator
+	def prefetchFrames(self, mediaPlayback=None):
 		if mediaPlayback is None:
 			mediaPlayback = self.mediaPlaybacks["shots"]
 
-		pmsmall = QPixmap()
-		if not QPixmapCache.find(("Frame" + str(mediaPlayback["curImg"])), pmsmall):
-			if len(mediaPlayback["seq"]) == 1 and os.path.splitext(mediaPlayback["seq"][0])[1] in [".mp4", ".mov"]:
-				curFile = mediaPlayback["seq"][0]
-			else:
-				curFile = mediaPlayback["seq"][mediaPlayback["curImg"]]
-			fileName = os.path.join(mediaPlayback["basePath"], curFile)
+		if len(mediaPlayback["seq"]) == 0 or os.path.splitext(mediaPlayback["seq"][0])[1] in [".mp4", ".mov"]:
+			return
 
-			if os.path.splitext(curFile)[1] in [".jpg", ".jpeg", ".JPG", ".png", ".tif", ".tiff"]:
-				pm = self.getImgPMap(fileName)
+		duration = len(mediaPlayback["seq"])
+		for i in range(min(self.prefetchFrameCount, duration)):
+			frame = (mediaPlayback["curImg"] + i) % duration
+			frameKey = self.getFrameKey(mediaPlayback, frame)
+			if os.path.splitext(frameKey[0])[1] in [".jpg", ".jpeg", ".JPG", ".png", ".tif", ".tiff", ".exr", ".dpx"]:
+				self.framePrefetcher.request(frameKey, self.getFrameImage, frameKey[0])
 
-				if pm.width() == 0 or pm.height() == 0:
-					pmsmall = self.getImgPMap(os.path.join(self.core.projectPath, "00_Pipeline", "Fallbacks", "%s.jpg" % os.path.splitext(curFile)[1][1:].lower()))
-				elif (pm.width()/float(pm.height())) > 1.7778:
-					pmsmall = pm.scaledToWidth(self.renderResX)
-				else:
-					pmsmall = pm.scaledToHeight(self.renderResY)
-			elif os.path.splitext(curFile)[1] in [".exr", ".dpx"]:
-				try:
-					qimg = QImage(self.renderResX, self.renderResY, QImage.Format_RGB16)
-
-					if self.oiioLoaded:
-						imgSrc = oiio.ImageBuf(str(fileName))
-						rgbImgSrc = oiio.ImageBuf()
-						oiio.ImageBufAlgo.channels(rgbImgSrc, imgSrc, (0,1,2))
-						imgWidth = rgbImgSrc.spec().full_width
-						imgHeight = rgbImgSrc.spec().full_height
-						xOffset = 0
-						yOffset = 0
-						if (imgWidth/float(imgHeight)) > 1.7778:
-							newImgWidth = self.renderResX
-							newImgHeight = self.renderResX/float(imgWidth)*imgHeight
-						else:
-							newImgHeight = self.renderResY
-							newImgWidth = self.renderResY/float(imgHeight)*imgWidth
-						imgDst = oiio.ImageBuf(oiio.ImageSpec(int(newImgWidth),int(newImgHeight),3, oiio.UINT8))
-						oiio.ImageBufAlgo.resample(imgDst, rgbImgSrc)
-						sRGBimg = oiio.ImageBuf()
-						oiio.ImageBufAlgo.pow(sRGBimg, imgDst, (1.0/2.2, 1.0/2.2, 1.0/2.2))
-						bckImg = oiio.ImageBuf(oiio.ImageSpec(int(newImgWidth), int(newImgHeight), 3, oiio.UINT8))
-						oiio.ImageBufAlgo.fill (bckImg, (0.5,0.5,0.5))
-						oiio.ImageBufAlgo.paste(bckImg, xOffset,yOffset,0,0, sRGBimg)
-						qimg = QImage(int(newImgWidth), int(newImgHeight), QImage.Format_RGB16)
-						for i in range(int(newImgWidth)):
-							for k in range(int(newImgHeight)):
-								rgb = qRgb(bckImg.getpixel(i,k)[0]*255, bckImg.getpixel(i,k)[1]*255, bckImg.getpixel(i,k)[2]*255)
-								qimg.setPixel(i,k,rgb)
-						pmsmall = QPixmap.fromImage(qimg)
-
-					elif self.wandLoaded:
-						with wand.image.Image(filename=fileName) as img :
-							imgWidth, imgHeight = [img.width, img.height]
-							img.depth = 8
-							imgArr = numpy.fromstring(img.make_blob('RGB'), dtype='uint{}'.format(img.depth)).reshape(imgHeight, imgWidth, 3)
-
-						qimg = QImage(imgArr,imgWidth, imgHeight, QImage.Format_RGB888)
-						pm = QPixmap.fromImage(qimg)
-						if (pm.width()/float(pm.height())) > 1.7778:
-							pmsmall = pm.scaledToWidth(self.renderResX)
-						else:
-							pmsmall = pm.scaledToHeight(self.renderResY)
 
-					else:
-						raise RuntimeError ("no image loader available")
-				except:
-					pmsmall = self.getImgPMap(os.path.join(self.core.projectPath, "00_Pipeline", "Fallbacks", "%s.jpg" % os.path.splitext(curFile)[1][1:].lower()))
+	# shows the first frame from the thumbnail cache. The thumbnail gets loaded or created in the background.
+	@err_decorator
+	def showFirstFrame(self, mediaPlayback):
+		frameKey = self.getFrameKey(mediaPlayback, 0)
+		if self.frameCache.contains(frameKey) or os.path.splitext(frameKey[0])[1] not in [".jpg", ".jpeg", ".JPG", ".png", ".tif", ".tiff", ".exr", ".dpx"]:
+			self.changeImg(mediaPlayback=mediaPlayback)
+			return
+
+		mediaPlayback["l_preview"].setPixmap(self.emptypmap)
+		self.scanRunner.start("firstFrame_" + mediaPlayback["name"], self.core.thumbnailCache.getImage, args=[frameKey[0], self.renderResX, self.renderResY, self.getFrameImage], onChunk=lambda x: self.firstFrameLoaded(mediaPlayback, frameKey, x))
+
+
+	# the thumbnail isn't stored in the frame cache, because it is a compressed jpg and the full frame would never
+	# be decoded for the key
+	@err_decorator
+	def firstFrameLoaded(self, mediaPlayback, frameKey, img):
+		if mediaPlayback["curImg"] != 0 or len(mediaPlayback["seq"]) == 0 or self.getFrameKey(mediaPlayback, 0) != frameKey:
+			return
+
+		if self.frameCache.contains(frameKey) or img is None or img.width() == 0 or img.height() == 0:
+			self.changeImg(mediaPlayback=mediaPlayback)
+			return
+
+		if (img.width()/float(img.height())) > 1.7778:
+			img = img.scaledToWidth(self.renderResX)
+		else:
+			img = img.scaledToHeight(self.renderResY)
+
+		mediaPlayback["l_preview"].setPixmap(QPixmap.fromImage(img))
+
+
+	@err_decorator
+	def changeImg(self, frame=0, mediaPlayback=None):
+		if mediaPlayback is None:
+			mediaPlayback = self.mediaPlaybacks["shots"]
+
+		isPlaying = mediaPlayback["timeline"].state() == QTimeLine.Running
+		frameKey = self.getFrameKey(mediaPlayback, mediaPlayback["curImg"])
+		fileName = frameKey[0]
+		curFile = os.path.basename(fileName)
+
+		pmsmall = None
+		cachedImg = self.frameCache.get(frameKey)
+		if cachedImg is not None:
+			pmsmall = QPixmap.fromImage(cachedImg)
+		else:
+			if os.path.splitext(curFile)[1] in [".jpg", ".jpeg", ".JPG", ".png", ".tif", ".tiff", ".exr", ".dpx"]:
+				# during playback the frame gets decoded in the background and is dropped until it is available
+				if not isPlaying or mediaPlayback["pduration"] < 3:
+					img = self.getFrameImage(fileName)
+					if img is not None:
+						self.frameCache.insert(frameKey, img)
+						pmsmall = QPixmap.fromImage(img)
 			elif os.path.splitext(curFile)[1] in [".mp4", ".mov"]:
 				try:
 					if len(mediaPlayback["seq"]) > 1:
@@ -3934,15 +4356,24 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 			else:
 				return False
 
-			QPixmapCache.insert(("Frame" + str(mediaPlayback["curImg"])), pmsmall)
+			if pmsmall is not None and os.path.splitext(curFile)[1] in [".mp4", ".mov"]:
+				self.frameCache.insert(frameKey, pmsmall.toImage())
+
+		if isPlaying:
+			self.prefetchFrames(mediaPlayback)
 
 		if not mediaPlayback["prvIsSequence"] and len(mediaPlayback["seq"]) > 1:
 			curFile = mediaPlayback["seq"][mediaPlayback["curImg"]]
 			fileName = os.path.join(mediaPlayback["basePath"], curFile)
 			self.updatePrvInfo(fileName, mediaPlayback=mediaPlayback)
 
-		mediaPlayback["l_preview"].setPixmap(pmsmall)
-		if mediaPlayback["timeline"].state() == QTimeLine.Running:
+		if pmsmall is not None:
+			mediaPlayback["l_preview"].setPixmap(pmsmall)
+			mediaPlayback["droppedKey"] = None
+		else:
+			mediaPlayback["droppedKey"] = frameKey
+
+		if isPlaying:
 			mediaPlayback["sl_preview"].setValue(int(100 * (mediaPlayback["curImg"]/float(mediaPlayback["pduration"]))))
 		mediaPlayback["curImg"] += 1
 		if mediaPlayback["curImg"] == mediaPlayback["pduration"]:
@@ -3957,7 +4388,7 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		else:
 			self.curRTask = ""
 		
-		self.updateVersions()
+		self.updateVersions(background=True)
 
 
 	@err_decorator
@@ -4373,10 +4804,9 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		QMessageBox.information(self.core.messageParent, "Dailies", "The version was sent to the current dailies folder. (path in clipboard)")
 
 	@err_decorator
-	def copyFiles(self, seq, basepath, outFolder):
-		for frameName in seq:
-			sourcePath = os.path.join(basepath, frameName)
-			shutil.copy(sourcePath, outFolder)
+	def copyFiles(self, seq, basepath, outFolder, onFinished=None):
+		files = [[os.path.join(basepath, x), os.path.join(outFolder, x)] for x in seq]
+		return self.startCopy(files, "Delivery", manifestPath=self.getCopyManifestPath(outFolder), onFinished=onFinished)
 
 	@err_decorator
 	def sendTo(self, mediaPlayback, outFolderName=None):
@@ -4410,10 +4840,17 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		if not os.path.exists(outFolder):
 			os.makedirs(outFolder)
 
-		spinnerWin = WaitingWindow(self)
-		spinnerWin.forceUpdate()
-		self.copyFiles(mediaPlayback["seq"], sourcePath, outFolder)
-		spinnerWin.close()
+		self.copyFiles(mediaPlayback["seq"], sourcePath, outFolder, onFinished=lambda x: self.sendToFinished(outFolder, x))
+
+
+	@err_decorator
+	def sendToFinished(self, outFolder, result):
+		if result["canceled"]:
+			QMessageBox.information(self.core.messageParent, "Delivery", "The delivery was canceled. Sending the version again continues with the missing files.")
+			return
+
+		if len(result["failed"]) > 0:
+			return
 
 		self.core.copyToClipboard(outFolder)
 
@@ -5080,6 +5517,14 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		except:
 			pass
 
+		if self.oiioLoaded:
+			global numpy
+			try:
+				import numpy
+				self.numpyLoaded = True
+			except:
+				pass
+
 
 	@err_decorator
 	def getRVpath(self):
@@ -5234,10 +5679,53 @@ class ProjectBrowser(QMainWindow, ProjectBrowser_ui.Ui_mw_ProjectBrowser):
 		else:
 			startNum = 0
 
-		result = self.core.convertMedia(inputpath, startNum, outputpath)
+		if mediaPlayback["prvIsSequence"]:
+			frameCount = mediaPlayback["pduration"]
+		else:
+			frameCount = None
 
+		checkPath = outputpath
 		if mediaPlayback["prvIsSequence"] or videoInput:
-			outputpath = outputpath.replace("%04d", "%04d" % int(startNum))
+			checkPath = outputpath.replace("%04d", "%04d" % int(startNum))
+
+		# the callbacks are only called after this function returned, so the job id is known by then
+		job = {}
+		jobId = self.core.convertMedia(inputpath, startNum, outputpath, background=True, onFinished=lambda x: self.convertImgsFinished(job["id"], checkPath, x), onProgress=lambda x, y: self.transcodeProgress(job["id"], x, y), frameCount=frameCount)
+		if jobId is None or jobId in self.transcodeDlgs:
+			return
+
+		job["id"] = jobId
+
+		dlg = QProgressDialog("Converting %s..." % os.path.basename(outputpath), "Cancel", 0, 100 if frameCount else 0, self)
+		dlg.setWindowTitle("Image conversion")
+		dlg.setWindowModality(Qt.NonModal)
+		dlg.setMinimumDuration(0)
+		dlg.setAutoClose(False)
+		dlg.setAutoReset(False)
+		dlg.canceled.connect(lambda: self.core.getTranscodeQueue().cancel(jobId))
+		dlg.show()
+		self.transcodeDlgs[jobId] = dlg
+
+
+	@err_decorator
+	def transcodeProgress(self, jobId, frame, frameCount):
+		dlg = self.transcodeDlgs.get(jobId)
+		if dlg is None or not frameCount:
+			return
+
+		dlg.setValue(min(100, int(100 * frame / float(frameCount))))
+
+
+	@err_decorator
+	def convertImgsFinished(self, jobId, outputpath, result):
+		dlg = self.transcodeDlgs.pop(jobId, None)
+		if dlg is None:
+			return
+
+		canceled = dlg.wasCanceled()
+		dlg.close()
+		if canceled:
+			return
 
 		curTab = self.tbw_browser.currentWidget().property("tabType")
 		curData = [curTab, self.cursShots, self.curRTask, self.curRVersion, self.curRLayer]
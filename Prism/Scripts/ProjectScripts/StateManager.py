@@ -42,7 +42,7 @@ except:
 	from PySide.QtGui import *
 	psVersion = 1
 
-import sys, os, traceback, time, imp
+import sys, os, traceback, time, imp, json
 from functools import wraps
 
 if sys.version[0] == "3":
@@ -56,6 +56,8 @@ else:
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "UserInterfaces"))
 
+from PrismUtils import PublishScheduler
+
 for i in ["StateManager_ui", "StateManager_ui_ps2", "CreateItem"]:
 	try:
 		del sys.modules[i]
@@ -134,8 +136,21 @@ class StateManager(QMainWindow, StateManager_ui.Ui_mw_StateManager):
 
 		self.saveEnabled = True
 		self.loading = False
+		self.importVersions = {}
 		self.shotcamFileType = ".abc"
+
+		# the states are written to the scene delayed, so that multiple changes are saved at once
+		self.saveTimer = QTimer()
+		self.saveTimer.setSingleShot(True)
+		self.saveTimer.setInterval(250)
+		self.saveTimer.timeout.connect(self.flushStates)
+		self.stateBlocks = {}
+		self.savedStateText = None
+		self.dirtyStates = set()
+		self.allStatesDirty = True
 		self.publishPaused = False
+		self.farmJobs = None
+		self.publishScheduler = None
 
 		files = []
 		pluginUiPath = os.path.join(self.core.pluginPathApp, self.core.appPlugin.pluginName, "Scripts", "StateManagerNodes", "StateUserInterfaces")
@@ -342,7 +357,28 @@ class %s(QWidget, %s.%s, %s.%sClass):
 			stateText = self.core.appPlugin.sm_readStates(self)
 
 		stateData = None
-		if stateText is not None:
+		if stateText is not None and stateText.lstrip().startswith("{"):
+			try:
+				stateDict = json.loads(stateText)
+			except ValueError:
+				QMessageBox.warning(self.core.messageParent,"Load states", "Loading states failed.")
+			else:
+				publishProps = stateDict.get("publish", {})
+				if "startframe" in publishProps:
+					self.sp_rangeStart.setValue(int(publishProps["startframe"]))
+				if "endframe" in publishProps:
+					self.sp_rangeEnd.setValue(int(publishProps["endframe"]))
+				if "comment" in publishProps:
+					self.e_comment.setText(publishProps["comment"])
+				if "description" in publishProps:
+					self.description = publishProps["description"]
+					if self.description == "":
+						self.b_description.setStyleSheet(self.styleMissing)
+					else:
+						self.b_description.setStyleSheet(self.styleExists)
+
+				stateData = stateDict.get("states", [])
+		elif stateText is not None:
 			buf = StringIO(stateText)
 
 			stateData = []
@@ -384,6 +420,10 @@ class %s(QWidget, %s.%s, %s.%sClass):
 		self.collapsedFolders = []
 
 		if stateData is not None and len(stateData) != 0:
+			# the versions of all imports get resolved in one batch before the states are created
+			importPaths = [x["filepath"] for x in stateData if x.get("stateclass") == "ImportFile" and "filepath" in x]
+			self.setImportVersions(importPaths)
+
 			loadedStates = []
 			for i in stateData:
 				stateParent = None
@@ -392,8 +432,11 @@ class %s(QWidget, %s.%s, %s.%sClass):
 				state = self.createState(i["stateclass"], parent=stateParent, stateData=i)
 				loadedStates.append(state)
 
+			self.importVersions = {}
+
 		self.loading = False
 		self.saveEnabled = True
+		self.allStatesDirty = True
 		self.saveStatesToScene()
 
 
@@ -541,7 +584,7 @@ class %s(QWidget, %s.%s, %s.%sClass):
 		self.tw_export.customContextMenuRequested.connect(lambda x: self.rclTree(x, self.tw_export))
 		self.tw_export.currentItemChanged.connect(lambda x,y: self.stateChanged(x, y, self.tw_export))
 		self.tw_export.itemClicked.connect(lambda x, y: self.updateForeground(x, y, self.tw_export))
-		self.tw_export.itemChanged.connect(lambda x,y: self.saveStatesToScene())
+		self.tw_export.itemChanged.connect(lambda x,y: self.saveStatesToScene(x))
 		self.tw_export.itemDoubleClicked.connect(self.focusRename)
 		self.tw_export.focusOutEvent = self.checkFocusOut
 		self.tw_export.keyPressEvent = self.checkKeyPressed
@@ -583,6 +626,7 @@ class %s(QWidget, %s.%s, %s.%sClass):
 
 	@err_decorator
 	def closeEvent(self, event):
+		self.flushStates()
 		self.core.callback(name="onStateManagerClose", types=["custom"], args=[self])
 		event.accept()
 
@@ -687,6 +731,9 @@ class %s(QWidget, %s.%s, %s.%sClass):
 		actDel = QAction("Delete", self)
 		actDel.triggered.connect(self.deleteState)
 
+		actRefreshVersions = QAction("Refresh versions", self)
+		actRefreshVersions.triggered.connect(self.updateImportStates)
+
 		if state is None:
 			actCopy.setEnabled(False)
 			actDel.setEnabled(False)
@@ -731,6 +778,8 @@ class %s(QWidget, %s.%s, %s.%sClass):
 		if self.activeList == self.tw_export:
 			rcmenu.addAction(actExecute)
 			rcmenu.addMenu(menuExecuteV)
+		else:
+			rcmenu.addAction(actRefreshVersions)
 		rcmenu.addAction(actCopy)
 		rcmenu.addAction(actPaste)
 		rcmenu.addAction(actDel)
@@ -810,6 +859,7 @@ class %s(QWidget, %s.%s, %s.%sClass):
 
 	@err_decorator
 	def copyAllStates(self):
+		self.flushStates()
 		stateData = self.core.appPlugin.sm_readStates(self)
 
 		cb = QClipboard()
@@ -1048,14 +1098,36 @@ class %s(QWidget, %s.%s, %s.%sClass):
 			pass
 
 
+	# marks the state, which changed, so that only its properties are read again on the next flush. The states pass
+	# themselves and the tree signals pass their item. Otherwise all states are read again.
 	@err_decorator
-	def saveStatesToScene(self, param=None):
+	def saveStatesToScene(self, param=None, state=None):
 		if not self.saveEnabled:
 			return False
 
-		getattr(self.core.appPlugin, "sm_preSaveToScene", lambda x: None)(self)
+		if state is None and isinstance(param, QTreeWidgetItem):
+			state = getattr(param, "ui", None)
+
+		if state is None:
+			self.allStatesDirty = True
+		else:
+			self.dirtyStates.add(state)
+
+		if not self.core.uiAvailable:
+			return self.flushStates()
+
+		self.saveTimer.start()
 
-	#	print "save to scene"
+
+	# writes the states to the scene. Only the properties of the changed states are read again and the scene is only
+	# modified, when the data differs from the last save.
+	@err_decorator
+	def flushStates(self):
+		self.saveTimer.stop()
+		if not self.saveEnabled:
+			return False
+
+		getattr(self.core.appPlugin, "sm_preSaveToScene", lambda x: None)(self)
 
 		self.stateData = []
 		for i in range(self.tw_import.topLevelItemCount()):
@@ -1066,26 +1138,35 @@ class %s(QWidget, %s.%s, %s.%sClass):
 			self.stateData.append([self.tw_export.topLevelItem(i), None])
 			self.appendChildStates(self.stateData[len(self.stateData)-1][0], self.stateData)
 
-		stateConfig = ConfigParser()
+		publishProps = {"startframe": str(self.sp_rangeStart.value()), "endframe": str(self.sp_rangeEnd.value()), "comment": str(self.e_comment.text()), "description": self.description}
 
-		stateConfig.add_section("publish")
-		stateConfig.set("publish", "startframe", str(self.sp_rangeStart.value()))
-		stateConfig.set("publish", "endframe", str(self.sp_rangeEnd.value()))
-		stateConfig.set("publish", "comment", str(self.e_comment.text()))
-		stateConfig.set("publish", "description", self.description)
+		stateBlocks = {}
+		blocks = []
+		for i in self.stateData:
+			parent = str(i[1])
+			cached = self.stateBlocks.get(i[0].ui)
+			if cached is not None and cached[0] == parent and not self.allStatesDirty and i[0].ui not in self.dirtyStates:
+				block = cached[1]
+			else:
+				stateProps = {"stateparent": parent, "stateclass": i[0].ui.className}
+				for k, v in i[0].ui.getStateProps().items():
+					stateProps[k.lower()] = str(v)
 
-		for idx, i in enumerate(self.stateData):
-			stateConfig.add_section(str(idx))
-			stateConfig.set(str(idx), "stateparent", str(i[1]))
-			stateConfig.set(str(idx), "stateclass", i[0].ui.className)
-			stateProps = i[0].ui.getStateProps()
-			for k in stateProps:
-				stateConfig.set(str(idx), k, str(stateProps[k]))
+				block = json.dumps(stateProps, sort_keys=True)
 
-		buf = StringIO()
-		stateConfig.write(buf)
+			stateBlocks[i[0].ui] = [parent, block]
+			blocks.append(block)
+
+		self.stateBlocks = stateBlocks
+		self.dirtyStates = set()
+		self.allStatesDirty = False
 
-		self.core.appPlugin.sm_saveStates(self, buf.getvalue())
+		stateText = '{"version": 1, "publish": %s, "states": [%s]}' % (json.dumps(publishProps, sort_keys=True), ", ".join(blocks))
+		if stateText == self.savedStateText:
+			return
+
+		self.core.appPlugin.sm_saveStates(self, stateText)
+		self.savedStateText = stateText
 
 
 	@err_decorator
@@ -1094,6 +1175,38 @@ class %s(QWidget, %s.%s, %s.%sClass):
 		self.core.appPlugin.sm_saveImports(self, importPaths)
 
 
+	@err_decorator
+	def setImportVersions(self, filepaths):
+		versions = self.core.getImportVersions(filepaths, unitFolders=["meter", "centimeter"])
+		self.importVersions = dict(zip(filepaths, versions))
+
+
+	# returns [currentVersion, latestVersion, latestVersionPath] of an imported file
+	@err_decorator
+	def getImportVersion(self, filepath):
+		if filepath in self.importVersions:
+			return self.importVersions[filepath]
+
+		return self.core.getImportVersions([filepath], unitFolders=["meter", "centimeter"])[0]
+
+
+	# refreshes all import states from one batch resolution of their versions
+	@err_decorator
+	def updateImportStates(self):
+		filepaths = [x[0] for x in self.getFilePaths(self.tw_import.invisibleRootItem(), [])]
+		self.setImportVersions(filepaths)
+		self.updateImportStateUis(self.tw_import.invisibleRootItem())
+		self.importVersions = {}
+
+
+	@err_decorator
+	def updateImportStateUis(self, item):
+		if hasattr(item, "ui") and item.ui.className == "ImportFile":
+			item.ui.updateUi()
+		for i in range(item.childCount()):
+			self.updateImportStateUis(item.child(i))
+
+
 	@err_decorator
 	def getFilePaths(self, item, paths=[]):
 		if hasattr(item, "ui") and item.ui.className == "ImportFile":
@@ -1231,6 +1344,14 @@ class %s(QWidget, %s.%s, %s.%sClass):
 	def getImgPMap(self, path):
 		if platform.system() == "Windows":
 			return QPixmap(path)
+		else:
+			return QPixmap.fromImage(self.getImgQImage(path))
+
+
+	# can be used outside of the GUI thread
+	def getImgQImage(self, path):
+		if platform.system() == "Windows":
+			return QImage(path)
 		else:
 			try:
 				im = Image.open(path)
@@ -1241,9 +1362,9 @@ class %s(QWidget, %s.%s, %s.%sClass):
 
 				qimg = QImage(data, im.size[0], im.size[1], QImage.Format_ARGB32)
 
-				return QPixmap(qimg)
+				return qimg.copy()
 			except:
-				return QPixmap(path)
+				return QImage(path)
 
 
 	@err_decorator
@@ -1306,8 +1427,19 @@ class %s(QWidget, %s.%s, %s.%sClass):
 		return states
 
 
+	# the publish tasks, the farm jobs and the snapshot of the scene references are only valid during the publish,
+	# so they get finished and removed even if the publish fails
 	@err_decorator
 	def publish(self, executeState=False, continuePublish=False, useVersion="next"):
+		try:
+			self.executePublish(executeState=executeState, continuePublish=continuePublish, useVersion=useVersion)
+		finally:
+			self.finishPublishTasks()
+			self.core.sceneReferences = None
+
+
+	@err_decorator
+	def executePublish(self, executeState=False, continuePublish=False, useVersion="next"):
 		if self.publishPaused and not continuePublish:
 			return
 
@@ -1329,6 +1461,7 @@ class %s(QWidget, %s.%s, %s.%sClass):
 			skipStates = [x["state"].state for x in self.publishResult if "publish paused" not in x["result"][0]]
 			self.execStates = [x for x in self.execStates if x not in set(skipStates)]
 			self.publishPaused = False
+			self.core.sceneReferences = self.core.getSceneReferences(self)
 		else:
 			if useVersion != "next":
 				msg = QMessageBox(QMessageBox.Information, actionString, "Are you sure you want to execute this state as version \"%s\"?\nThis may overwrite existing files." % useVersion, QMessageBox.Cancel)
@@ -1340,12 +1473,12 @@ class %s(QWidget, %s.%s, %s.%sClass):
 					return
 
 			result = []
-			extResult = self.core.appPlugin.sm_getExternalFiles(self)
-			if extResult is not None:
-				extFiles, extFilesSource = extResult
-			else:
-				extFiles = []
-				extFilesSource = []
+			# the scene is scanned once per publish. The snapshot is used by the validation, the render managers and saveVersionInfo.
+			self.core.sceneReferences = None
+			sceneRefs = self.core.getSceneReferences(self)
+			self.core.sceneReferences = sceneRefs
+			extFiles = sceneRefs.externalFiles
+			extFilesSource = sceneRefs.externalFilesSource
 
 			invalidFiles = []
 			nonExistend = []
@@ -1353,10 +1486,10 @@ class %s(QWidget, %s.%s, %s.%sClass):
 				i = self.core.fixPath(i)
 
 				if not (i.startswith(self.core.projectPath) or (self.core.useLocalFiles and i.startswith(self.core.localProjectPath))):
-					if os.path.exists(i) and not i in invalidFiles:
+					if sceneRefs.exists(i) and not i in invalidFiles:
 						invalidFiles.append(i)
 				
-				if not os.path.exists(i) and not i in nonExistend and i != self.core.getCurrentFileName():
+				if not sceneRefs.exists(i) and not i in nonExistend and i != self.core.getCurrentFileName():
 					exists = getattr(self.core.appPlugin, "sm_existExternalAsset", lambda x,y:False)(self, i)
 					if exists:
 						continue
@@ -1487,6 +1620,14 @@ class %s(QWidget, %s.%s, %s.%sClass):
 			getattr(self.core.appPlugin, "sm_preExecute", lambda x:None)(self)
 			self.core.callback(name="onPublish", types=["custom"], args=[self])
 
+		# the render managers add their jobs to farmJobs and they get submitted together after the states were executed
+		if not executeState and self.core.getConfig("globals", "batchfarmsubmission", ptype="bool") != False:
+			self.farmJobs = []
+		else:
+			self.farmJobs = None
+
+		self.publishScheduler = PublishScheduler.PublishScheduler()
+
 		if executeState:
 			if self.execStates[0].ui.className in ["ImageRender", "Export", "Playblast", "Folder"]:
 				result = self.execStates[0].ui.executeState(parent=self, useVersion=useVersion)
@@ -1498,15 +1639,19 @@ class %s(QWidget, %s.%s, %s.%sClass):
 
 				for k in result:
 					if "publish paused" in k["result"][0]:
+						self.finishPublishTasks()
 						self.publishPaused = True
 						return
 			else:
 				self.publishResult.append({"state": self.execStates[0].ui, "result":result})
 
 				if "publish paused" in result[0]:
+					self.finishPublishTasks()
 					self.publishPaused = True
 					return
 
+			self.finishPublishTasks()
+
 		else:
 			for i in range(self.tw_export.topLevelItemCount()):
 				curUi = self.tw_export.topLevelItem(i).ui
@@ -1517,15 +1662,19 @@ class %s(QWidget, %s.%s, %s.%sClass):
 
 						for k in exResult:
 							if "publish paused" in k["result"][0]:
+								self.finishPublishTasks()
 								self.publishPaused = True
 								return
 					else:
 						self.publishResult.append({"state": curUi, "result":exResult})
 
 						if "publish paused" in exResult[0]:
+							self.finishPublishTasks()
 							self.publishPaused = True
 							return
 
+			self.finishPublishTasks()
+
 		getattr(self.core.appPlugin, "sm_postExecute", lambda x:None)(self)
 
 		self.publishInfos = { "updatedExports": {}, "backgroundRender": None}
@@ -1563,6 +1712,115 @@ class %s(QWidget, %s.%s, %s.%sClass):
 			self.core.appPlugin.openScene(self, self.core.getCurrentFileName())
 
 
+	# runs func on a worker thread, while the next states of the publish are executed. func must not use the UI or
+	# the scene and returns None or an error string. onDone is called with the error on the main thread, when the
+	# publish finishes, and its return value replaces the result of the state. Outside of a publish both are called
+	# immediately and the result of onDone is returned.
+	# not decorated, so that the states notice, when the task couldn't be added, and clean up themselves
+	def addPublishTask(self, state, func, onDone=None):
+		if self.publishScheduler is None:
+			try:
+				error = func()
+			except Exception as e:
+				erStr = ("%s ERROR - StateManager %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, traceback.format_exc()))
+				self.core.writeErrorLog(erStr)
+				error = "unknown error (view console for more information)"
+
+			if onDone is not None:
+				return onDone(error)
+			elif error is not None:
+				return [state.state.text(0) + " - error - " + error]
+
+			return None
+
+		self.publishScheduler.addTask(state, func, dependsOn=self.getTaskDependencies(state), onDone=onDone)
+
+
+	# The tasks of a state depend on the tasks of all states, which are before a Dependency state in the same folder
+	# or in one of the parent folders.
+	@err_decorator
+	def getTaskDependencies(self, state):
+		deps = []
+		item = state.state
+		while item is not None:
+			parent = item.parent()
+			if parent is None:
+				tree = item.treeWidget()
+				siblings = [tree.topLevelItem(x) for x in range(tree.topLevelItemCount())]
+			else:
+				siblings = [parent.child(x) for x in range(parent.childCount())]
+
+			depStates = [x for x in range(siblings.index(item)) if siblings[x].ui.className == "Dependency"]
+			if len(depStates) > 0:
+				prevStates = siblings[:depStates[-1]]
+				for task in self.publishScheduler.tasks:
+					taskItem = task.state.state
+					while taskItem is not None and taskItem not in prevStates:
+						taskItem = taskItem.parent()
+
+					if taskItem is not None and task.id not in deps:
+						deps.append(task.id)
+
+			item = parent
+
+		return deps
+
+
+	# submits the farm jobs and waits for the tasks of the states. Failed tasks update the result of their state.
+	@err_decorator
+	def finishPublishTasks(self):
+		self.submitFarmJobs()
+
+		scheduler = self.publishScheduler
+		self.publishScheduler = None
+		if scheduler is None:
+			return
+
+		for task in scheduler.getResults():
+			if task.traceback is not None:
+				erStr = ("%s ERROR - StateManager %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, task.traceback))
+				self.core.writeErrorLog(erStr)
+
+			result = task.result
+			if result is None and task.error is not None:
+				result = [task.state.state.text(0) + " - error - " + task.error]
+
+			if result is None:
+				continue
+
+			for k in self.publishResult:
+				if k["state"] == task.state:
+					k["result"] = result
+
+
+	# updates the results of the states, whose jobs couldn't be submitted
+	@err_decorator
+	def submitFarmJobs(self):
+		farmJobs = self.farmJobs
+		self.farmJobs = None
+		if not farmJobs:
+			return
+
+		managers = []
+		for i in farmJobs:
+			if i["manager"] not in managers:
+				managers.append(i["manager"])
+
+		for manager in managers:
+			jobs = [x for x in farmJobs if x["manager"] == manager]
+			results = manager.submitJobBatch(jobs)
+			if results is None:
+				results = ["unknown error (view console for more information)"] * len(jobs)
+
+			for job, result in zip(jobs, results):
+				if "Result=Success" in result:
+					continue
+
+				for k in self.publishResult:
+					if k["state"] == job["state"]:
+						k["result"] = [job["state"].state.text(0) + " - error - " + result]
+
+
 	@err_decorator
 	def validateComment(self):
 		origComment = self.e_comment.text()
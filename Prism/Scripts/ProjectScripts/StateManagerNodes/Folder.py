@@ -79,7 +79,7 @@ class FolderClass(object):
 
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 
 	def nameChanged(self, text):
 		self.state.setText(0, text)
@@ -182,21 +182,21 @@ class ExportClass(object):
 	@err_decorator
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_changeTask.clicked.connect(self.changeTask)
 		self.chb_globalRange.stateChanged.connect(self.rangeTypeChanged)
 		self.sp_rangeStart.editingFinished.connect(self.startChanged)
 		self.sp_rangeEnd.editingFinished.connect(self.endChanged)
 		self.cb_outType.activated[str].connect(self.typeChanged)
 		self.chb_wholeScene.stateChanged.connect(self.wholeSceneChanged)
-		self.chb_localOutput.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_convertExport.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_additionalOptions.stateChanged.connect(self.stateManager.saveStatesToScene)
+		self.chb_localOutput.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_convertExport.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_additionalOptions.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.lw_objects.itemSelectionChanged.connect(lambda: self.core.appPlugin.selectNodes(self))
 		self.lw_objects.customContextMenuRequested.connect(self.rcObjects)
 		self.b_add.clicked.connect(lambda: self.core.appPlugin.sm_export_addObjects(self))
 		self.cb_cam.activated.connect(self.setCam)
-		self.cb_sCamShot.activated.connect(self.stateManager.saveStatesToScene)
+		self.cb_sCamShot.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_selectCam.clicked.connect(lambda: self.core.appPlugin.selectCam(self))
 		self.b_openLast.clicked.connect(lambda: self.core.openFolder(os.path.dirname(self.l_pathLast.text())))
 		self.b_copyLast.clicked.connect(lambda: self.core.copyToClipboard(self.l_pathLast.text()))
@@ -209,14 +209,14 @@ class ExportClass(object):
 		self.l_rangeEnd.setEnabled(not checked)
 		self.sp_rangeStart.setEnabled(not checked)
 		self.sp_rangeEnd.setEnabled(not checked)
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def wholeSceneChanged(self, state):
 		self.gb_objects.setEnabled(not state == Qt.Checked)
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -251,7 +251,7 @@ class ExportClass(object):
 			self.core.appPlugin.sm_export_setTaskText(self, prevTaskName)
 			self.b_changeTask.setPalette(self.oldPalette)
 			self.nameChanged(self.e_name.text())
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -287,7 +287,7 @@ class ExportClass(object):
 			self.lw_objects.takeItem(rowNum)
 
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -297,7 +297,7 @@ class ExportClass(object):
 		self.core.appPlugin.sm_export_clearSet(self)
 
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -313,7 +313,7 @@ class ExportClass(object):
 				self.curCam = self.camlist[0]
 			else:
 				self.curCam = None
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 		curShot = self.cb_sCamShot.currentText()
 		self.cb_sCamShot.clear()
@@ -336,7 +336,7 @@ class ExportClass(object):
 			self.cb_sCamShot.setCurrentIndex(shotNames.index(curShot))
 		else:
 			self.cb_sCamShot.setCurrentIndex(0)
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 		self.lw_objects.clear()
 
@@ -375,28 +375,28 @@ class ExportClass(object):
 		self.gb_objects.setVisible(not isSCam)
 
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def setCam(self, index):
 		self.curCam = self.camlist[index]
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def startChanged(self):
 		if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
 			self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def endChanged(self):
 		if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
 			self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -554,7 +554,7 @@ class ExportClass(object):
 
 			self.core.callHook("postExport", args={"prismCore":self.core, "scenefile":fileName, "startFrame":startFrame, "endFrame":endFrame, "outputName":outputName})
 
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 			if os.path.exists(outputName + ".abc"): # and os.path.exists(outputName + ".fbx"):
 				return [self.state.text(0) + " - success"]
@@ -598,7 +598,7 @@ class ExportClass(object):
 				self.b_openLast.setEnabled(True)
 				self.b_copyLast.setEnabled(True)
 
-				self.stateManager.saveStatesToScene()
+				self.stateManager.saveStatesToScene(state=self)
 
 			except Exception as e:
 				exc_type, exc_obj, exc_tb = sys.exc_info()
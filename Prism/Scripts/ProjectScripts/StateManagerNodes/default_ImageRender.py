@@ -142,7 +142,7 @@ class ImageRenderClass(object):
 			if idx != -1:
 				self.curCam = self.camlist[idx]
 				self.cb_cam.setCurrentIndex(idx)
-				self.stateManager.saveStatesToScene()
+				self.stateManager.saveStatesToScene(state=self)
 		if "resoverride" in data:
 			res = eval(data["resoverride"])
 			self.chb_resOverride.setChecked(res[0])
@@ -154,7 +154,7 @@ class ImageRenderClass(object):
 			idx = self.cb_renderLayer.findText(data["renderlayer"])
 			if idx != -1:
 				self.cb_renderLayer.setCurrentIndex(idx)
-				self.stateManager.saveStatesToScene()
+				self.stateManager.saveStatesToScene(state=self)
 		if "vrayoverride" in data:
 			self.chb_override.setChecked(eval(data["vrayoverride"]))
 		if "vrayminsubdivs" in data:
@@ -216,39 +216,39 @@ class ImageRenderClass(object):
 	@err_decorator
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_changeTask.clicked.connect(self.changeTask)
 		self.chb_globalRange.stateChanged.connect(self.rangeTypeChanged)
 		self.sp_rangeStart.editingFinished.connect(self.startChanged)
 		self.sp_rangeEnd.editingFinished.connect(self.endChanged)
 		self.cb_cam.activated.connect(self.setCam)
 		self.chb_resOverride.stateChanged.connect(self.resOverrideChanged)
-		self.sp_resWidth.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_resHeight.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.sp_resWidth.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_resHeight.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_resPresets.clicked.connect(self.showResPresets)
-		self.chb_localOutput.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.cb_renderLayer.activated.connect(self.stateManager.saveStatesToScene)
+		self.chb_localOutput.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.cb_renderLayer.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.chb_override.stateChanged.connect(self.overrideChanged)
-		self.sp_minSubdivs.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_maxSubdivs.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_cThres.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_nThres.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.sp_minSubdivs.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_maxSubdivs.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_cThres.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_nThres.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.gb_submit.toggled.connect(self.rjToggled)
 		self.cb_manager.activated.connect(self.managerChanged)
-		self.sp_rjPrio.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_rjFramesPerTask.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_rjTimeout.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.chb_rjSuspended.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_osDependencies.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_osUpload.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.chb_osPAssets.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.e_osSlaves.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.sp_rjPrio.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_rjFramesPerTask.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_rjTimeout.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_rjSuspended.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_osDependencies.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_osUpload.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.chb_osPAssets.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.e_osSlaves.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_osSlaves.clicked.connect(self.openSlaves)
-		self.cb_dlGroup.activated.connect(self.stateManager.saveStatesToScene)
-		self.sp_dlConcurrentTasks.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.cb_dlGroup.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_dlConcurrentTasks.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.sp_dlGPUpt.editingFinished.connect(self.gpuPtChanged)
 		self.le_dlGPUdevices.editingFinished.connect(self.gpuDevicesChanged)
-		self.gb_passes.toggled.connect(self.stateManager.saveStatesToScene)
+		self.gb_passes.toggled.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_addPasses.clicked.connect(self.showPasses)
 		self.lw_passes.customContextMenuRequested.connect(self.rclickPasses)
 		self.b_openLast.clicked.connect(lambda: self.core.openFolder(os.path.dirname(self.l_pathLast.text())))
@@ -269,7 +269,7 @@ class ImageRenderClass(object):
 			self.sp_rangeStart.setEnabled(True)
 			self.sp_rangeEnd.setEnabled(True)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -277,7 +277,7 @@ class ImageRenderClass(object):
 		if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
 			self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -285,13 +285,13 @@ class ImageRenderClass(object):
 		if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
 			self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def setCam(self, index):
 		self.curCam = self.camlist[index]
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -322,7 +322,7 @@ class ImageRenderClass(object):
 			self.l_taskName.setText(self.nameWin.e_item.text())
 			self.core.appPlugin.sm_render_setTaskWarn(self, False)
 			self.nameChanged(self.e_name.text())
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -331,7 +331,7 @@ class ImageRenderClass(object):
 		self.sp_resHeight.setEnabled(checked)
 		self.b_resPresets.setEnabled(checked)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -344,7 +344,7 @@ class ImageRenderClass(object):
 			pheight = int(i.split("x")[1])
 			pAct.triggered.connect(lambda x=None, v=pwidth: self.sp_resWidth.setValue(v))
 			pAct.triggered.connect(lambda x=None, v=pheight: self.sp_resHeight.setValue(v))
-			pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene())
+			pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene(state=self))
 			pmenu.addAction(pAct)
 
 		pmenu.exec_(QCursor.pos())
@@ -369,7 +369,7 @@ class ImageRenderClass(object):
 			self.l_nThres.setEnabled(False)
 			self.sp_nThres.setEnabled(False)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -391,7 +391,7 @@ class ImageRenderClass(object):
 			else:
 				self.curCam = None
 
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 		#update Render Layer
 		curLayer = self.cb_renderLayer.currentText()
@@ -405,7 +405,7 @@ class ImageRenderClass(object):
 			self.cb_renderLayer.setCurrentIndex(layerList.index(curLayer))
 		else:
 			self.cb_renderLayer.setCurrentIndex(0)
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 		if self.l_taskName.text() != "":
@@ -455,19 +455,19 @@ class ImageRenderClass(object):
 					selSlaves = selSlaves[:-2]
 
 			self.e_osSlaves.setText(selSlaves)
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def gpuPtChanged(self):
 		self.w_dlGPUdevices.setEnabled(self.sp_dlGPUpt.value() == 0)
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def gpuDevicesChanged(self):
 		self.w_dlGPUpt.setEnabled(self.le_dlGPUdevices.text() == "")
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -508,7 +508,7 @@ class ImageRenderClass(object):
 				self.core.appPlugin.sm_render_addRenderPass(self, passName=i.text(), steps=steps)
 
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -531,7 +531,7 @@ class ImageRenderClass(object):
 	def rjToggled(self,checked):
 		self.f_localOutput.setEnabled(self.gb_submit.isHidden() or not checked or (checked and self.core.rfManagers[self.cb_manager.currentText()].canOutputLocal))
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -541,7 +541,7 @@ class ImageRenderClass(object):
 		if self.cb_manager.currentText() in self.core.rfManagers:
 			self.core.rfManagers[self.cb_manager.currentText()].sm_render_managerChanged(self)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -650,7 +650,7 @@ class ImageRenderClass(object):
 			self.b_openLast.setEnabled(True)
 			self.b_copyLast.setEnabled(True)
 
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 			rSettings = {"outputName": outputName}
 
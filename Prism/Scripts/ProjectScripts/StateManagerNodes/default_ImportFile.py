@@ -157,7 +157,7 @@ class ImportFileClass(object):
 	@err_decorator
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.e_file.editingFinished.connect(self.pathChanged)
 		self.b_browse.clicked.connect(self.browse)
 		self.b_browse.customContextMenuRequested.connect(self.openFolder)
@@ -165,12 +165,12 @@ class ImportFileClass(object):
 		self.b_importLatest.clicked.connect(self.importLatest)
 		self.b_nameSpaces.clicked.connect(lambda: self.core.appPlugin.sm_import_removeNameSpaces(self))
 		self.b_unitConversion.clicked.connect(lambda: self.core.appPlugin.sm_import_unitConvert(self))
-		self.chb_keepRefEdits.stateChanged.connect(self.stateManager.saveStatesToScene)
+		self.chb_keepRefEdits.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.chb_autoNameSpaces.stateChanged.connect(self.autoNameSpaceChanged)
-		self.chb_abcPath.stateChanged.connect(self.stateManager.saveStatesToScene)
+		self.chb_abcPath.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.chb_trackObjects.toggled.connect(self.updateTrackObjects)
 		self.chb_preferUnit.stateChanged.connect(lambda x: self.updatePrefUnits())
-		self.chb_preferUnit.stateChanged.connect(self.stateManager.saveStatesToScene)
+		self.chb_preferUnit.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.lw_objects.itemSelectionChanged.connect(lambda: self.core.appPlugin.selectNodes(self))
 
 
@@ -213,14 +213,14 @@ class ImportFileClass(object):
 	def pathChanged(self):
 		self.stateManager.saveImports()
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
 	def autoNameSpaceChanged(self, checked):
 		self.b_nameSpaces.setEnabled(not checked)
 		self.core.appPlugin.sm_import_removeNameSpaces(self)
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -310,7 +310,7 @@ class ImportFileClass(object):
 
 		self.stateManager.saveImports()
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 		return result
 
@@ -351,12 +351,6 @@ class ImportFileClass(object):
 	@err_decorator
 	def updateUi(self):
 		if os.path.exists(self.e_file.text()):
-			parDir = os.path.dirname(self.e_file.text())
-			if os.path.basename(parDir) in ["centimeter", "meter"]:
-				versionData = os.path.basename(os.path.dirname(parDir)).split(self.core.filenameSeperator)
-			else:
-				versionData = os.path.basename(parDir).split(self.core.filenameSeperator)
-
 			fversionData = os.path.basename(self.e_file.text()).split(self.core.filenameSeperator)
 			fversion = None
 			for i in fversionData:
@@ -372,25 +366,13 @@ class ImportFileClass(object):
 					except:
 						pass
 						
-			if len(versionData) == 3 and self.core.getConfig('paths', "scenes", configPath=self.core.prismIni) in self.e_file.text():
-				self.l_curVersion.setText(versionData[0] + self.core.filenameSeperator + versionData[1] + self.core.filenameSeperator + versionData[2])
-				self.l_latestVersion.setText("-")
-				vPath = os.path.dirname(self.e_file.text())
-				if os.path.basename(vPath) in ["centimeter", "meter"]:
-					vPath = os.path.dirname(vPath)
-
-				taskPath = os.path.dirname(vPath)
-				for i in os.walk(taskPath):
-					folders = i[1]
-					folders.sort()
-					for k in reversed(folders):
-						meterDir = os.path.join(i[0], k, "meter")
-						cmeterDir = os.path.join(i[0], k, "centimeter")
-						if len(k.split(self.core.filenameSeperator)) == 3 and k[0] == "v" and len(k.split(self.core.filenameSeperator)[0]) == 5 and ((os.path.exists(meterDir) and len(os.listdir(meterDir)) > 0) or (os.path.exists(cmeterDir) and len(os.listdir(cmeterDir)) > 0)):
-							self.l_latestVersion.setText(k)
-							break
-					break
-
+			versions = self.stateManager.getImportVersion(self.e_file.text())
+			if versions[0] is not None:
+				self.l_curVersion.setText(versions[0])
+				if versions[1] is None:
+					self.l_latestVersion.setText("-")
+				else:
+					self.l_latestVersion.setText(versions[1])
 			else:
 				self.l_curVersion.setText("-")
 				self.l_latestVersion.setText("-")
@@ -434,26 +416,12 @@ class ImportFileClass(object):
 
 	@err_decorator
 	def getLatestVersion(self):
-		parDir = os.path.dirname(self.e_file.text())
-		if os.path.basename(parDir) in ["centimeter", "meter"]:
-			versionData = os.path.basename(os.path.dirname(parDir)).split(self.core.filenameSeperator)
-			taskPath = os.path.dirname(os.path.dirname(parDir))
-		else:
-			versionData = os.path.basename(parDir).split(self.core.filenameSeperator)
-			taskPath = os.path.dirname(parDir)
-
-		if len(versionData) == 3 and self.core.getConfig('paths', "scenes", configPath=self.core.prismIni) in self.e_file.text():
-			self.l_curVersion.setText(versionData[0] + self.core.filenameSeperator + versionData[1] + self.core.filenameSeperator + versionData[2])
+		versions = self.stateManager.getImportVersion(self.e_file.text())
+		if versions[0] is not None:
+			self.l_curVersion.setText(versions[0])
 			self.l_latestVersion.setText("-")
-			for i in os.walk(taskPath):
-				folders = i[1]
-				folders.sort()
-				for k in reversed(folders):
-					meterDir = os.path.join(i[0], k, "meter")
-					cmeterDir = os.path.join(i[0], k, "centimeter")
-					if len(k.split(self.core.filenameSeperator)) == 3 and k[0] == "v" and len(k.split(self.core.filenameSeperator)[0]) == 5 and ((os.path.exists(meterDir) and len(os.listdir(meterDir)) > 0) or (os.path.exists(cmeterDir) and len(os.listdir(cmeterDir)) > 0)):
-						return os.path.join(i[0], k).replace("\\", "/")
-				break
+			if versions[2] is not None:
+				return versions[2]
 
 		return ""
 		
@@ -492,7 +460,7 @@ class ImportFileClass(object):
 			getattr(self.core.appPlugin, "sm_import_disableObjectTracking", lambda x: None)(self)
 
 		self.updateUi()
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 		
 
 	@err_decorator
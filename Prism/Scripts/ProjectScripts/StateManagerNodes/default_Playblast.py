@@ -42,7 +42,7 @@ except:
 	from PySide.QtGui import *
 	psVersion = 1
 	
-import sys, os, shutil, time, traceback, platform
+import sys, os, shutil, time, traceback, platform, tempfile
 from functools import wraps
 
 if sys.version[0] == "3":
@@ -126,7 +126,7 @@ class PlayblastClass(object):
 			if idx > 0:
 				self.curCam = self.camlist[idx-1]
 				self.cb_cams.setCurrentIndex(idx)
-				self.stateManager.saveStatesToScene()
+				self.stateManager.saveStatesToScene(state=self)
 		if "resoverride" in data:
 			res = eval(data["resoverride"])
 			self.chb_resOverride.setChecked(res[0])
@@ -152,18 +152,18 @@ class PlayblastClass(object):
 	@err_decorator
 	def connectEvents(self):
 		self.e_name.textChanged.connect(self.nameChanged)
-		self.e_name.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.e_name.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_changeTask.clicked.connect(self.changeTask)
 		self.chb_globalRange.stateChanged.connect(self.rangeTypeChanged)
 		self.sp_rangeStart.editingFinished.connect(self.startChanged)
 		self.sp_rangeEnd.editingFinished.connect(self.endChanged)
 		self.cb_cams.activated.connect(self.setCam)
 		self.chb_resOverride.stateChanged.connect(self.resOverrideChanged)
-		self.sp_resWidth.editingFinished.connect(self.stateManager.saveStatesToScene)
-		self.sp_resHeight.editingFinished.connect(self.stateManager.saveStatesToScene)
+		self.sp_resWidth.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.sp_resHeight.editingFinished.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_resPresets.clicked.connect(self.showResPresets)
-		self.chb_localOutput.stateChanged.connect(self.stateManager.saveStatesToScene)
-		self.cb_formats.activated.connect(self.stateManager.saveStatesToScene)
+		self.chb_localOutput.stateChanged.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
+		self.cb_formats.activated.connect(lambda x=None: self.stateManager.saveStatesToScene(state=self))
 		self.b_openLast.clicked.connect(lambda: self.core.openFolder(os.path.dirname(self.l_pathLast.text())))
 		self.b_copyLast.clicked.connect(lambda: self.core.copyToClipboard(self.l_pathLast.text()))
 
@@ -174,7 +174,7 @@ class PlayblastClass(object):
 		self.sp_rangeStart.setEnabled(not state)
 		self.sp_rangeEnd.setEnabled(not state)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -182,7 +182,7 @@ class PlayblastClass(object):
 		if self.sp_rangeStart.value() > self.sp_rangeEnd.value():
 			self.sp_rangeEnd.setValue(self.sp_rangeStart.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -190,7 +190,7 @@ class PlayblastClass(object):
 		if self.sp_rangeEnd.value() < self.sp_rangeStart.value():
 			self.sp_rangeStart.setValue(self.sp_rangeEnd.value())
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -200,7 +200,7 @@ class PlayblastClass(object):
 		else:
 			self.curCam = self.camlist[index-1]
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -232,7 +232,7 @@ class PlayblastClass(object):
 
 			self.setTaskWarn(False)
 
-			self.stateManager.saveStatesToScene()
+			self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -241,7 +241,7 @@ class PlayblastClass(object):
 		self.sp_resHeight.setEnabled(checked)
 		self.b_resPresets.setEnabled(checked)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 
 	@err_decorator
@@ -254,7 +254,7 @@ class PlayblastClass(object):
 			pheight = int(i.split("x")[1])
 			pAct.triggered.connect(lambda x=None, v=pwidth: self.sp_resWidth.setValue(v))
 			pAct.triggered.connect(lambda x=None, v=pheight: self.sp_resHeight.setValue(v))
-			pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene())
+			pAct.triggered.connect(lambda: self.stateManager.saveStatesToScene(state=self))
 			pmenu.addAction(pAct)
 
 		pmenu.exec_(QCursor.pos())
@@ -373,7 +373,7 @@ class PlayblastClass(object):
 		self.b_openLast.setEnabled(True)
 		self.b_copyLast.setEnabled(True)
 
-		self.stateManager.saveStatesToScene()
+		self.stateManager.saveStatesToScene(state=self)
 
 		self.core.saveScene(versionUp=False, prismReq=False)
 
@@ -391,42 +391,65 @@ class PlayblastClass(object):
 
 		self.core.callHook("prePlayblast", args={"prismCore":self.core, "scenefile":fileName, "startFrame":jobFrames[0], "endFrame":jobFrames[1], "outputName":outputName})
 
+		# mp4 playblasts are rendered to a local scratch folder, so that only the video gets written to the project
+		if self.cb_formats.currentText() == "mp4":
+			scratchPath = tempfile.mkdtemp(prefix="PrismPlayblast_")
+			renderName = os.path.join(scratchPath, os.path.basename(outputName))
+		else:
+			scratchPath = None
+			renderName = outputName
+
 		try:
-			self.core.appPlugin.sm_playblast_createPlayblast(self, jobFrames=jobFrames, outputName=outputName)
+			self.core.appPlugin.sm_playblast_createPlayblast(self, jobFrames=jobFrames, outputName=renderName)
 
 			getattr(self.core.appPlugin, "sm_playblast_postExecute", lambda x: None)(self)
 
-			if self.cb_formats.currentText() == "mp4":
-				mediaBaseName = os.path.splitext(outputName)[0]
-				videoOutput = mediaBaseName + "mp4"
-				inputpath = os.path.splitext(outputName)[0] + "%04d" + os.path.splitext(outputName)[1]
-				result = self.core.convertMedia(inputpath, jobFrames[0], videoOutput)
+			def finishPlayblast(error):
+				if error is not None:
+					return [self.state.text(0) + " - " + error]
 
-				if not os.path.exists(videoOutput):
-					return [self.state.text(0) + " - error occurred during conversion of jpg files to mp4"]
+				self.core.callHook("postPlayblast", args={"prismCore":self.core, "scenefile":fileName, "startFrame":jobFrames[0], "endFrame":jobFrames[1], "outputName":outputName})
 
-				delFiles = []
-				for i in os.listdir(os.path.dirname(outputName)):
-					if i.startswith(os.path.basename(mediaBaseName)) and i.endswith(".jpg"):
-						delFiles.append(os.path.join(os.path.dirname(outputName), i))
+				if len(os.listdir(outputPath)) > 1:
+					return [self.state.text(0) + " - success"]
+				else:
+					return [self.state.text(0) + " - unknown error (files do not exist)"]
 
-				for i in delFiles:
-					try:
-						os.remove(i)
-					except:
-						pass
+			if scratchPath is None:
+				return finishPlayblast(None)
 
-			self.core.callHook("postPlayblast", args={"prismCore":self.core, "scenefile":fileName, "startFrame":jobFrames[0], "endFrame":jobFrames[1], "outputName":outputName})
+			# the conversion continues in the background while the next states of the publish are executed
+			videoOutput = os.path.splitext(outputName)[0] + "mp4"
+			inputpath = os.path.splitext(renderName)[0] + "%04d" + os.path.splitext(renderName)[1]
+			jobId = self.core.convertMedia(inputpath, jobFrames[0], videoOutput, background=True, priority=1, frameCount=jobFrames[1] - jobFrames[0] + 1)
+			if jobId is None:
+				return [self.state.text(0) + " - error occurred during conversion of jpg files to mp4"]
 
-			if len(os.listdir(outputPath)) > 1:
-				return [self.state.text(0) + " - success"]
-			else:
-				return [self.state.text(0) + " - unknown error (files do not exist)"]
+			tmpPath = scratchPath
+
+			def convertPlayblast():
+				try:
+					self.core.getTranscodeQueue().wait([jobId])
+					if not os.path.exists(videoOutput):
+						return "error occurred during conversion of jpg files to mp4"
+				finally:
+					shutil.rmtree(tmpPath, ignore_errors=True)
+
+			result = self.stateManager.addPublishTask(self, convertPlayblast, onDone=finishPlayblast)
+			# the task removes the scratch folder from now on
+			scratchPath = None
+			if result is not None:
+				return result
+
+			return [self.state.text(0) + " - success"]
 		except Exception as e:
 			exc_type, exc_obj, exc_tb = sys.exc_info()
 			erStr = ("%s ERROR - sm_default_playblast %s:\n%s" % (time.strftime("%d/%m/%y %X"), self.core.version, traceback.format_exc()))
 			self.core.writeErrorLog(erStr)
 			return [self.state.text(0) + " - unknown error (view console for more information)"]
+		finally:
+			if scratchPath is not None:
+				shutil.rmtree(scratchPath, ignore_errors=True)
 
 
 	@err_decorator
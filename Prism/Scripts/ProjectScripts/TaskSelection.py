@@ -381,81 +381,49 @@ class TaskSelection(QDialog, TaskSelection_ui.Ui_dlg_TaskSelection):
 			if oconfig.has_section("Asset"):
 				omittedAssets = [x[1] for x in oconfig.items("Asset")]
 
-		if self.core.useLocalFiles:
-			lBasePath = aBasePath.replace(self.core.projectPath, self.core.localProjectPath)
+		for i in self.core.getAssetTree()["children"]:
+			item = self.createAssetItem(i, aBasePath, omittedAssets)
+			if item is not None:
+				self.tw_assets.addTopLevelItem(item)
 
-		assetPaths = self.core.getAssetPaths()
+		if self.tw_assets.topLevelItemCount() > 0:
+			self.tw_assets.setCurrentItem(self.tw_assets.topLevelItem(0))
 
-		for i in assetPaths:
-			if i != aBasePath and i.replace(aBasePath + os.sep, "") in omittedAssets:
-				continue
+		self.updateTasks()
 
-			taskPath = os.path.join(i, "Export")
-			tasks = []
-			for k in os.walk(taskPath):
-				tasks += k[1]
-				break
 
-			if self.core.useLocalFiles:
-				ltaskPath = taskPath.replace(self.core.projectPath, self.core.localProjectPath)
-				for k in os.walk(ltaskPath):
-					tasks += k[1]
-					break
+	# creates the item of a node of the crawled asset tree. Assets without exported tasks and folders without
+	# such assets are skipped.
+	@err_decorator
+	def createAssetItem(self, node, aBasePath, omittedAssets):
+		item = QTreeWidgetItem([node["name"], os.path.join(aBasePath, node["relPath"])])
+		if node["type"] == "Asset":
+			if node["relPath"] in omittedAssets:
+				return None
+
+			tasks = []
+			for i in node["paths"]:
+				tasks += self.core.projectIndex.getDirs(os.path.join(i, "Export"))
 
 			if len(tasks) == 0:
-				continue
+				return None
 
-			relPath = i
-
-			if aBasePath in relPath:
-				relPath = relPath.replace(aBasePath, "")
-			elif self.core.useLocalFiles and lBasePath in relPath:
-				relPath = relPath.replace(lBasePath, "")
-
-			pathData = relPath.split(os.sep)[1:]
-
-			lastItem = None
-			for idx, val in enumerate(pathData):
-				if lastItem is None:
-					for k in range(self.tw_assets.topLevelItemCount()):
-						curItem = self.tw_assets.topLevelItem(k)
-						if curItem.text(0) == val:
-							lastItem = curItem
-
-					if lastItem is None:
-						curPath = i.replace(relPath, "")
-						for k in range(idx+1):
-							curPath = os.path.join(curPath, pathData[k])
-						lastItem = QTreeWidgetItem([val, curPath])
-						self.tw_assets.addTopLevelItem(lastItem)
-				else:
-					newItem = None
-					for k in range(lastItem.childCount()):
-						curItem = lastItem.child(k)
-						if curItem.text(0) == val:
-							newItem = curItem
-
-					if newItem is None:
-						curPath = i.replace(relPath, "")
-						for k in range(idx+1):
-							curPath = os.path.join(curPath, pathData[k])
-						newItem = QTreeWidgetItem([val, curPath])
-						lastItem.addChild(newItem)
-
-					lastItem = newItem
-
-				if idx == (len(pathData)-1):
-					lastItem.setText(2, "Asset")
-					iFont = lastItem.font(0)
-					iFont.setBold(True)
-					lastItem.setFont(0, iFont)
-				else:
-					lastItem.setText(2, "Folder")
+			item.setText(2, "Asset")
+			iFont = item.font(0)
+			iFont.setBold(True)
+			item.setFont(0, iFont)
+		else:
+			for i in node["children"]:
+				child = self.createAssetItem(i, aBasePath, omittedAssets)
+				if child is not None:
+					item.addChild(child)
 
-		if self.tw_assets.topLevelItemCount() > 0:
-			self.tw_assets.setCurrentItem(self.tw_assets.topLevelItem(0))
+			if item.childCount() == 0:
+				return None
 
-		self.updateTasks()
+			item.setText(2, "Folder")
+
+		return item
 
 
 	@err_decorator